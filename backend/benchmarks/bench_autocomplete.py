@@ -0,0 +1,69 @@
+"""
+Benchmark: query latency of the autocomplete PrefixIndex.
+
+Usage:
+    python -m backend.benchmarks.bench_autocomplete [--stations 2000 50000] [--queries 5000]
+
+Builds the index from synthetic station documents with generated street, provider and
+station names and reports build time and median/p99 latency for query prefixes of
+increasing length, taken from indexed values. No database is needed.
+"""
+import argparse
+import time
+import numpy as np
+from backend.src.charging_station_search.autocomplete_index import PrefixIndex
+
+SYLLABLES = ["ber", "lin", "karl", "marx", "al", "lee", "fried", "rich", "stra", "ße", "wed", "ding", "pan", "kow",
+             "span", "dau", "kreuz", "berg", "neu", "kölln", "mo", "abit", "schö", "ne", "tem", "pel", "hof", "platz"]
+SUFFIXES = ["straße", "allee", "damm", "weg", "platz", "ufer", "chaussee"]
+PROVIDER_SUFFIXES = ["GmbH", "AG", "Energie GmbH", "Mobility GmbH & Co. KG", "Stadtwerke"]
+
+
+def make_word(rng, syllables=(2, 4)):
+    return "".join(rng.choice(SYLLABLES, rng.integers(*syllables))).capitalize()
+
+
+def make_documents(count, seed=0):
+    """Creates synthetic station documents with register-like names."""
+    rng = np.random.default_rng(seed)
+    streets = [f"{make_word(rng)}{rng.choice(SUFFIXES)}" for _ in range(max(count // 4, 10))]
+    providers = [f"{make_word(rng)} {rng.choice(PROVIDER_SUFFIXES)}" for _ in range(max(count // 50, 5))]
+    documents = []
+    for i in range(count):
+        street, provider = rng.choice(streets), rng.choice(providers)
+        documents.append({
+            "postal_code": str(rng.integers(10115, 14200)),
+            "name": f"{provider} - {street} {i % 200}",
+            "metadata": {"provider": provider, "street": street},
+        })
+    return documents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, nargs="+", default=[2000, 50000])
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'stations':>9} {'build s':>8} {'prefix':>7} {'p50 us':>9} {'p99 us':>9}")
+    for count in args.stations:
+        documents = make_documents(count)
+        start = time.perf_counter()
+        index = PrefixIndex.from_documents(documents)
+        build = time.perf_counter() - start
+
+        rng = np.random.default_rng(1)
+        values = [suggestion["value"] for suggestion in index._suggestions]
+        for length in (1, 2, 3, 5, 8):
+            queries = [values[i][:length] for i in rng.integers(0, len(values), args.queries)]
+            samples = []
+            for query in queries:
+                start = time.perf_counter()
+                index.complete(query)
+                samples.append(time.perf_counter() - start)
+            p50, p99 = np.percentile(np.array(samples) * 1e6, [50, 99])
+            print(f"{count:>9} {build:>8.2f} {length:>7} {p50:>9.1f} {p99:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: throughput of the bulk availability ingest endpoint.
+
+Usage:
+    python -m backend.benchmarks.bench_availability_ingest [--stations 20000] [--batch 1000] [--batches 50]
+                                                           [--format json|ndjson] [--without-mongo]
+
+Seeds a throw-away collection in the MongoDB at MONGO_URL with synthetic stations and posts
+batches of random "free"/"occupied" reports to POST /stations/availability/bulk through the
+ASGI app in-process, reporting updates per second and the latency per batch. With
+--without-mongo the collection is replaced by a stub that answers instantly, which measures
+the parsing, validation and response work of the endpoint alone.
+"""
+import argparse
+import asyncio
+import json
+import time
+import httpx
+import numpy as np
+from bson import ObjectId
+from pymongo.results import BulkWriteResult
+from backend.db.mongo_client import client
+from backend.src.charging_station_search import charging_station_search_service as search_service
+import backend.main as api
+
+
+class StubCollection:
+    """Answers the two queries of a bulk update instantly, as if every station existed and was occupied."""
+    class _Cursor:
+        def __init__(self, documents):
+            self.documents = documents
+
+        async def to_list(self, length):
+            return self.documents
+
+    def find(self, query, projection=None):
+        return self._Cursor([{"_id": object_id, "postal_code": "10115", "availability_status": False}
+                             for object_id in query["_id"]["$in"]])
+
+    async def bulk_write(self, operations, ordered=True):
+        return BulkWriteResult({"nModified": len(operations)}, acknowledged=True)
+
+
+def make_batches(station_ids, batch_size, batches, output_format, seed=0):
+    """Creates request bodies with random reports for random stations."""
+    rng = np.random.default_rng(seed)
+    bodies = []
+    for _ in range(batches):
+        items = [{"station_id": station_ids[i], "state": "free" if free else "occupied"}
+                 for i, free in zip(rng.integers(0, len(station_ids), batch_size), rng.random(batch_size) < 0.5)]
+        if output_format == "ndjson":
+            bodies.append("\n".join(json.dumps(item) for item in items).encode())
+        else:
+            bodies.append(json.dumps(items).encode())
+    return bodies
+
+
+async def run(args):
+    collection = None
+    if args.without_mongo:
+        station_ids = [str(ObjectId()) for _ in range(args.stations)]
+        search_service.station_collection = StubCollection()
+    else:
+        collection = client["bench_charging_stations"]["charging_stations"]
+        await collection.drop()
+        documents = [{"postal_code": "10115", "availability_status": True, "name": f"Station {i}"}
+                     for i in range(args.stations)]
+        result = await collection.insert_many(documents, ordered=False)
+        station_ids = [str(object_id) for object_id in result.inserted_ids]
+        search_service.station_collection = collection
+
+    api.app.dependency_overrides[api.user_repository.get_user_by_id] = lambda: {"_id": "benchmark"}
+    content_type = "application/x-ndjson" if args.format == "ndjson" else "application/json"
+    bodies = make_batches(station_ids, args.batch, args.batches, args.format)
+    samples, updated = [], 0
+    try:
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for body in bodies:
+                start = time.perf_counter()
+                response = await http.post("/stations/availability/bulk", content=body,
+                                            headers={"Content-Type": content_type})
+                samples.append(time.perf_counter() - start)
+                updated += response.json()["updated"]
+    finally:
+        api.app.dependency_overrides.clear()
+        if collection is not None:
+            await collection.drop()
+
+    total = sum(samples)
+    p50, p99 = np.percentile(np.array(samples) * 1000, [50, 99])
+    backend = "stub" if args.without_mongo else "mongodb"
+    print(f"{args.batches} batches of {args.batch} {args.format} reports, {args.stations} stations, {backend}")
+    print(f"{'updates/s':>10} {'applied':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    print(f"{args.batch * args.batches / total:>10.0f} {updated:>8} {p50:>8.2f} {p99:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--batches", type=int, default=50)
+    parser.add_argument("--format", choices=["json", "ndjson"], default="json")
+    parser.add_argument("--without-mongo", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
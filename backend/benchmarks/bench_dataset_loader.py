@@ -0,0 +1,84 @@
+"""
+Benchmark: cold Excel parsing vs. warm columnar loading of the Ladesaeulenregister.
+
+Usage:
+    python -m backend.benchmarks.bench_dataset_loader [--path FILE] [--rows N] [--repeat R]
+
+Without --path (or when the file does not exist) a synthetic register with the
+same layout (10 preamble rows, German decimal commas) is generated in a
+temporary folder.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from backend.config import DATA_PATHS
+from backend.utilities.dataset_loader import (
+    REGISTER_HEADER_ROW, columnar_cache_path, load_ladesaeulenregister, read_ladesaeulenregister
+)
+
+
+def make_synthetic_register(path, rows, seed=0):
+    """Writes a register-shaped Excel file with the given number of rows."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Betreiber": rng.choice(["Allego GmbH", "Vattenfall", "Berliner Stadtwerke"], rows),
+        "Art der Ladeeinrichung": rng.choice(["Normalladeeinrichtung", "Schnellladeeinrichtung"], rows),
+        "Anzahl Ladepunkte": rng.integers(1, 5, rows),
+        "Nennleistung Ladeeinrichtung [kW]": rng.choice([11, 22, 50, 150], rows),
+        "Straße": rng.choice(["Alexanderplatz", "Unter den Linden", "Karl-Marx-Allee"], rows),
+        "Hausnummer": rng.integers(1, 200, rows).astype(str),
+        "Postleitzahl": rng.integers(10115, 14200, rows),
+        "Ort": "Berlin",
+        "Bundesland": "Berlin",
+        "Breitengrad": [f"{v:.6f}".replace(".", ",") for v in rng.uniform(52.35, 52.65, rows)],
+        "Längengrad": [f"{v:.6f}".replace(".", ",") for v in rng.uniform(13.1, 13.7, rows)],
+    })
+    df.to_excel(path, index=False, startrow=REGISTER_HEADER_ROW)
+
+
+def measure(func, repeat):
+    """Returns the best wall-clock time of `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=DATA_PATHS['ladesaeulenregister'])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_register_")
+    try:
+        path = os.path.join(workdir, "Ladesaeulenregister_SEP.xlsx")
+        if os.path.exists(args.path):
+            shutil.copy(args.path, path)
+        else:
+            print(f"{args.path} not found, generating a synthetic register with {args.rows} rows")
+            make_synthetic_register(path, args.rows)
+
+        cold = measure(lambda: read_ladesaeulenregister(path), args.repeat)
+        load_ladesaeulenregister(path)
+        warm = measure(lambda: load_ladesaeulenregister(path), args.repeat)
+        rows = len(load_ladesaeulenregister(path))
+
+        print(f"rows:                 {rows}")
+        print(f"cold Excel parse:     {cold * 1000:10.1f} ms")
+        print(f"warm columnar load:   {warm * 1000:10.1f} ms")
+        print(f"columnar file size:   {os.path.getsize(columnar_cache_path(path)) / 1e6:10.2f} MB")
+        print(f"speedup:              {cold / warm:10.1f}x")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
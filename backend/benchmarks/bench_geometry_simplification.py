@@ -0,0 +1,58 @@
+"""
+Benchmark: payload size and map render time per geometry simplification level.
+
+Usage:
+    python -m backend.benchmarks.bench_geometry_simplification [--repeat R]
+
+For every precomputed tolerance the postal code layer is encoded as GeoJSON
+(raw and gzip size, as served by /data?format=geojson) and the residents
+heatmap is built and rendered to HTML with build_folium_map.
+"""
+import argparse
+import gzip
+import time
+import shapely
+from backend.config import DATA_PATHS, pdict
+from backend.utilities.dataset_loader import load_geodata_plz, load_residents, load_simplified_geodata_plz
+from backend.utilities.geojson_stream import encode_features, iter_feature_collection
+from backend.utilities.geometry_utils import (
+    SIMPLIFICATION_TOLERANCES, simplified_geometry_lookup, apply_simplified_geometry
+)
+from backend.utilities.methods import preprocess_resid, build_folium_map
+
+
+def measure(func, repeat):
+    """Returns the result of the last call and the best wall-clock time of `repeat` calls."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df_geodat_plz = load_geodata_plz(DATA_PATHS['geodata_berlin_plz'])
+    gdf_residents = preprocess_resid(load_residents(DATA_PATHS['plz_einwohner']), df_geodat_plz, pdict)
+    simplified = load_simplified_geodata_plz(DATA_PATHS['geodata_berlin_plz'])
+
+    print(f"{'tolerance':>10} {'vertices':>9} {'geojson KB':>11} {'gzip KB':>8} {'render ms':>10} {'html KB':>8}")
+    for tolerance in SIMPLIFICATION_TOLERANCES:
+        lookup = simplified_geometry_lookup(simplified, tolerance)
+        residents = apply_simplified_geometry(gdf_residents, lookup)
+        vertices = int(shapely.get_num_coordinates(list(lookup.values())).sum())
+
+        body = b"".join(iter_feature_collection(encode_features(residents)))
+        render = lambda: build_folium_map(None, residents, "Residents").get_root().render()
+        html, seconds = measure(render, args.repeat)
+
+        print(f"{tolerance:>10} {vertices:>9} {len(body) / 1024:>11.1f} {len(gzip.compress(body)) / 1024:>8.1f}"
+              f" {seconds * 1000:>10.1f} {len(html) / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: per-row folium.GeoJson layers vs. one FeatureCollection per layer.
+
+Usage:
+    python -m backend.benchmarks.bench_heatmap_rendering [--rows N] [--repeat R]
+
+Measures map build time, HTML render time and HTML size of the three heatmap
+modes. The charging station layers are built from the Ladesaeulenregister in
+DATA_PATHS or, if it is missing, from a synthetic register with N rows.
+"""
+import argparse
+import os
+import tempfile
+import time
+import folium
+from branca.colormap import LinearColormap
+from backend.config import DATA_PATHS, pdict
+from backend.benchmarks.bench_dataset_loader import make_synthetic_register
+from backend.utilities.dataset_loader import load_geodata_plz, load_ladesaeulenregister, load_residents
+from backend.utilities.methods import preprocess_lstat, count_plz_occurrences, preprocess_resid, build_folium_map
+
+STYLE = {'color': 'black', 'weight': 1, 'fillOpacity': 0.7}
+
+
+def build_folium_map_per_row(df1, df2, layer_selection, by_kw=False):
+    """Previous implementation: one folium.GeoJson with its own style closure and tooltip per row."""
+    m = folium.Map(location=[52.52, 13.40], zoom_start=10)
+    if layer_selection == "Residents":
+        color_map = LinearColormap(['yellow', 'red'], vmin=df2['Einwohner'].min(), vmax=df2['Einwohner'].max())
+        for _, row in df2.iterrows():
+            folium.GeoJson(row['geometry'],
+                           style_function=lambda x, color=color_map(row['Einwohner']): {'fillColor': color, **STYLE},
+                           tooltip=f"PLZ: {row['PLZ']}, Einwohner: {row['Einwohner']}").add_to(m)
+    elif by_kw:
+        for kw in df1['KW'].unique():
+            kw_data = df1[df1['KW'] == kw]
+            if not kw_data.empty:
+                feature_group = folium.FeatureGroup(name=f'KW {kw}')
+                color_map = LinearColormap(['yellow', 'red'], vmin=kw_data['Number'].min(), vmax=kw_data['Number'].max())
+                for _, row in kw_data.iterrows():
+                    folium.GeoJson(row['geometry'],
+                                   style_function=lambda x, color=color_map(row['Number']): {'fillColor': color, **STYLE},
+                                   tooltip=f"PLZ: {row['PLZ']}, KW: {kw}, Number: {row['Number']}").add_to(feature_group)
+                feature_group.add_to(m)
+    else:
+        color_map = LinearColormap(['yellow', 'red'], vmin=df1['Number'].min(), vmax=df1['Number'].max())
+        for _, row in df1.iterrows():
+            folium.GeoJson(row['geometry'],
+                           style_function=lambda x, color=color_map(row['Number']): {'fillColor': color, **STYLE},
+                           tooltip=f"PLZ: {row['PLZ']}, Number: {row['Number']}").add_to(m)
+    folium.LayerControl().add_to(m)
+    color_map.add_to(m)
+    return m
+
+
+def measure(builder, repeat):
+    """Returns the best build time, best render time and HTML size of a map builder."""
+    build_best, render_best, size = float("inf"), float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        m = builder()
+        build_best = min(build_best, time.perf_counter() - start)
+        start = time.perf_counter()
+        html = m.get_root().render()
+        render_best = min(render_best, time.perf_counter() - start)
+        size = len(html)
+    return build_best, render_best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df_geodat_plz = load_geodata_plz(DATA_PATHS['geodata_berlin_plz'])
+    register_path = DATA_PATHS['ladesaeulenregister']
+    if not os.path.exists(register_path):
+        register_path = os.path.join(tempfile.mkdtemp(prefix="bench_heatmap_"), "Ladesaeulenregister.xlsx")
+        print(f"{DATA_PATHS['ladesaeulenregister']} not found, generating a synthetic register with {args.rows} rows")
+        make_synthetic_register(register_path, args.rows)
+
+    gdf_lstat3 = count_plz_occurrences(preprocess_lstat(load_ladesaeulenregister(register_path), df_geodat_plz, pdict))
+    gdf_residents2 = preprocess_resid(load_residents(DATA_PATHS['plz_einwohner']), df_geodat_plz, pdict)
+
+    modes = [("Residents", False), ("Charging Stations", False), ("Charging Stations by KW", True)]
+    print(f"{'mode':>24} {'builder':>15} {'build ms':>9} {'render ms':>10} {'html KB':>8}")
+    for layer_selection, by_kw in modes:
+        for name, builder in (("per-row", build_folium_map_per_row), ("featurecollection", build_folium_map)):
+            build, render, size = measure(lambda: builder(gdf_lstat3, gdf_residents2, layer_selection, by_kw), args.repeat)
+            print(f"{layer_selection:>24} {name:>15} {build * 1000:>9.1f} {render * 1000:>10.1f} {size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
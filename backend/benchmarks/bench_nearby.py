@@ -0,0 +1,106 @@
+"""
+Benchmark: /stations/nearby query latency with a 2dsphere index vs. a client-side scan.
+
+Usage:
+    python -m backend.benchmarks.bench_nearby [--stations 50000] [--queries 500] [--radius 1000] [--limit 20]
+
+Seeds a throw-away collection in the MongoDB at MONGO_URL with synthetic stations
+spread over Berlin, then measures p50/p95/p99 latency of StationRepository.find_nearby
+(`$geoNear` on the `geo` index) and, for comparison, of loading all coordinates and
+computing haversine distances in NumPy. The collection is dropped afterwards.
+"""
+import argparse
+import asyncio
+import time
+import numpy as np
+from pymongo import GEOSPHERE
+from backend.db.mongo_client import client
+from backend.src.charging_station_search import charging_station_search_service as search_service
+from backend.src.charging_station_search.charging_station_search_service import Coordinates, StationRepository
+from backend.utilities.tiles import BERLIN_BOUNDS
+
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def make_stations(count, seed=0):
+    """Creates synthetic station documents spread uniformly over Berlin."""
+    rng = np.random.default_rng(seed)
+    min_lon, min_lat, max_lon, max_lat = BERLIN_BOUNDS
+    lats = rng.uniform(min_lat, max_lat, count)
+    lons = rng.uniform(min_lon, max_lon, count)
+    return [
+        {
+            "postal_code": "10115",
+            "availability_status": True,
+            "location": {"latitude": lat, "longitude": lon, "description": ""},
+            "geo": {"type": "Point", "coordinates": [lon, lat]},
+            "name": f"Station {i}",
+        }
+        for i, (lat, lon) in enumerate(zip(lats.tolist(), lons.tolist()))
+    ]
+
+
+def percentiles(samples):
+    p50, p95, p99 = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return f"{p50:>8.2f} {p95:>8.2f} {p99:>8.2f}"
+
+
+async def scan_nearby(collection, coordinates, radius, limit):
+    """Baseline without an index: loads every position and filters by haversine distance."""
+    docs = await collection.find({}, {"location": 1}).to_list(None)
+    lat = np.radians([doc["location"]["latitude"] for doc in docs])
+    lon = np.radians([doc["location"]["longitude"] for doc in docs])
+    lat0, lon0 = np.radians(coordinates.latitude), np.radians(coordinates.longitude)
+    a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lat) * np.sin((lon - lon0) / 2) ** 2
+    distance = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+    order = np.argsort(distance)
+    return [docs[i] for i in order[:limit] if distance[i] <= radius]
+
+
+async def run(args):
+    collection = client["bench_charging_stations"]["charging_stations"]
+    await collection.drop()
+    for i in range(0, args.stations, 10_000):
+        await collection.insert_many(make_stations(min(10_000, args.stations - i), seed=i), ordered=False)
+    await collection.create_index([("geo", GEOSPHERE)])
+    search_service.station_collection = collection
+
+    rng = np.random.default_rng(1)
+    min_lon, min_lat, max_lon, max_lat = BERLIN_BOUNDS
+    points = [Coordinates(lat, lon) for lat, lon in zip(rng.uniform(min_lat, max_lat, args.queries).tolist(),
+                                                        rng.uniform(min_lon, max_lon, args.queries).tolist())]
+    repository = StationRepository()
+    try:
+        geo_near, found = [], []
+        for point in points:
+            start = time.perf_counter()
+            stations = await repository.find_nearby(point, args.radius, args.limit)
+            geo_near.append(time.perf_counter() - start)
+            found.append(len(stations))
+
+        scan = []
+        for point in points[:args.scan_queries]:
+            start = time.perf_counter()
+            await scan_nearby(collection, point, args.radius, args.limit)
+            scan.append(time.perf_counter() - start)
+    finally:
+        await collection.drop()
+
+    print(f"{args.stations} stations, radius {args.radius} m, limit {args.limit}, avg {np.mean(found):.1f} results")
+    print(f"{'method':>10} {'queries':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    print(f"{'$geoNear':>10} {len(geo_near):>8} {percentiles(geo_near)}")
+    print(f"{'scan':>10} {len(scan):>8} {percentiles(scan)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--scan-queries", type=int, default=20)
+    parser.add_argument("--radius", type=float, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: per-request CPU of the postal code search response, full documents vs. lean rows.
+
+Usage:
+    python -m backend.benchmarks.bench_search_serialization [--sizes 20 100 500] [--repeat 200]
+
+Both paths start from BSON as it arrives from MongoDB:
+- full: whole station documents are decoded, converted into ChargingStation and
+  PostalCode dataclasses with a "lat, lon" location string, and serialized through
+  FastAPI's default JSONResponse (jsonable_encoder + json).
+- lean: projected documents are decoded, converted into rows in place and serialized
+  with FastJSONResponse (orjson if installed).
+"""
+import argparse
+import time
+import bson
+from bson import ObjectId
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from backend.src.charging_station_search.charging_station_search_service import (
+    ChargingStation, PostalCode, StationRepository, STATION_PROJECTION
+)
+from backend.utilities import fast_json
+from backend.utilities.fast_json import FastJSONResponse
+
+
+def make_document(i):
+    """Creates a station document as written by the register import."""
+    return {
+        "_id": ObjectId(),
+        "station_key": f"{i:016x}-0",
+        "postal_code": "10115",
+        "availability_status": True,
+        "location": {"latitude": 52.53 + i * 1e-5, "longitude": 13.38 + i * 1e-5,
+                     "description": "Stromnetz Berlin GmbH, Invalidenstraße 112, Berlin"},
+        "geo": {"type": "Point", "coordinates": [13.38 + i * 1e-5, 52.53 + i * 1e-5]},
+        "power_kw": 22.0,
+        "name": f"Stromnetz Berlin GmbH - Invalidenstraße {i}",
+        "metadata": {"provider": "Stromnetz Berlin GmbH", "street": "Invalidenstraße", "house_number": str(i),
+                     "city": "Berlin", "postal_code": "10115"},
+        "content_hash": "0123456789abcdef",
+    }
+
+
+def project(document):
+    """Applies STATION_PROJECTION the way MongoDB would."""
+    projected = {"_id": document["_id"]}
+    for field in STATION_PROJECTION:
+        if "." in field:
+            parent, child = field.split(".")
+            projected.setdefault(parent, {})[child] = document[parent][child]
+        elif field in document:
+            projected[field] = document[field]
+    return projected
+
+
+def full_response(payload):
+    stations = [
+        ChargingStation(
+            id=str(station["_id"]),
+            postal_code=PostalCode(station["postal_code"]),
+            availability_status=station["availability_status"],
+            location=f"{station['location']['latitude']}, {station['location']['longitude']}",
+            name=station.get("name", "Unknown Name"),
+        )
+        for station in bson.decode_all(payload)
+    ]
+    return JSONResponse(jsonable_encoder({
+        "stations": [
+            {"id": station.id, "postal_code": station.postal_code.value,
+             "availability_status": station.availability_status, "location": station.location, "name": station.name}
+            for station in stations
+        ],
+        "stations_found": len(stations),
+        "timestamp": datetime.now().isoformat(),
+    })).body
+
+
+def lean_response(payload):
+    rows = [StationRepository._to_station_row(station) for station in bson.decode_all(payload)]
+    return FastJSONResponse({
+        "stations": rows,
+        "stations_found": len(rows),
+        "timestamp": datetime.now().isoformat(),
+        "next_cursor": None,
+    }).body
+
+
+def cpu_per_request(func, payload, repeat):
+    start = time.process_time()
+    for _ in range(repeat):
+        func(payload)
+    return (time.process_time() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if fast_json.orjson is not None else 'json'}")
+    print(f"{'stations':>9} {'full KB in':>11} {'lean KB in':>11} {'full us':>9} {'lean us':>9} {'speedup':>8}")
+    for size in args.sizes:
+        documents = [make_document(i) for i in range(size)]
+        full_payload = b"".join(bson.encode(document) for document in documents)
+        lean_payload = b"".join(bson.encode(project(document)) for document in documents)
+        full = cpu_per_request(full_response, full_payload, args.repeat)
+        lean = cpu_per_request(lean_response, lean_payload, args.repeat)
+        print(f"{size:>9} {len(full_payload) / 1024:>11.1f} {len(lean_payload) / 1024:>11.1f}"
+              f" {full * 1e6:>9.0f} {lean * 1e6:>9.0f} {full / lean:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
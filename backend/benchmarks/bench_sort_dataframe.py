@@ -0,0 +1,64 @@
+"""
+Benchmark: quadratic pop-and-concat sort vs. vectorized sort_dataframe and its top-k mode.
+
+Usage:
+    python -m backend.benchmarks.bench_sort_dataframe [--sizes 1000 10000 100000] [--top-k 100] [--legacy-max 10000]
+
+The previous implementation is O(n^2); it is only run up to --legacy-max rows.
+"""
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from backend.utilities.dataframe_utils import pop_row_from_dataframe, sort_dataframe
+
+
+def sort_dataframe_legacy(df, column, ascending=True):
+    """Previous implementation: repeatedly pops the minimum row and concatenates it to the result."""
+    sorted_df = pd.DataFrame(columns=df.columns)
+    while not df.empty:
+        min_or_max_value = df[column].min() if ascending else df[column].max()
+        index_values = df.index[df[column] == min_or_max_value].tolist()
+        popped_row, df = pop_row_from_dataframe(df, index_values[0])
+        sorted_df = pd.concat([sorted_df, pd.DataFrame([dict(zip(df.columns, popped_row))])], ignore_index=True)
+    return sorted_df
+
+
+def make_register_like(rows, seed=0):
+    """Creates a DataFrame shaped like the processed charging station register."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "PLZ": rng.integers(10115, 14200, rows),
+        "KW": rng.choice([3.7, 11.0, 22.0, 50.0, 150.0, 300.0], rows),
+        "Breitengrad": rng.uniform(52.35, 52.65, rows),
+        "Längengrad": rng.uniform(13.1, 13.7, rows),
+    })
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--top-k", type=int, default=100)
+    parser.add_argument("--legacy-max", type=int, default=10000)
+    args = parser.parse_args()
+    logging.getLogger("backend.utilities.timer_utils").setLevel(logging.WARNING)
+
+    print(f"{'rows':>8} {'legacy ms':>11} {'sort ms':>9} {'multi-key ms':>13} {'top-k ms':>9}")
+    for rows in args.sizes:
+        df = make_register_like(rows)
+        legacy = measure(lambda: sort_dataframe_legacy(df, "KW")) if rows <= args.legacy_max else float("nan")
+        full = measure(lambda: sort_dataframe(df, "KW"))
+        multi = measure(lambda: sort_dataframe(df, ["PLZ", "KW"], ascending=[True, False]))
+        top_k = measure(lambda: sort_dataframe(df, "KW", ascending=False, top_k=args.top_k))
+        print(f"{rows:>8} {legacy * 1000:>11.1f} {full * 1000:>9.2f} {multi * 1000:>13.2f} {top_k * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
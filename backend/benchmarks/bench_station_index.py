@@ -0,0 +1,74 @@
+"""
+Benchmark: query latency of the in-memory StationIndex.
+
+Usage:
+    python -m backend.benchmarks.bench_station_index [--stations 2000 50000] [--queries 2000]
+
+Builds the index from synthetic station documents spread over Berlin and reports
+build time and median/p99 latency of postal code, bounding box, radius and
+k-nearest queries. No database is needed.
+"""
+import argparse
+import time
+import numpy as np
+from bson import ObjectId
+from backend.src.charging_station_search.station_index import StationIndex
+from backend.utilities.tiles import BERLIN_BOUNDS
+
+
+def make_documents(count, seed=0):
+    """Creates synthetic station documents spread uniformly over Berlin."""
+    rng = np.random.default_rng(seed)
+    min_lon, min_lat, max_lon, max_lat = BERLIN_BOUNDS
+    postal_codes = rng.integers(10115, 14200, count)
+    return [
+        {
+            "_id": ObjectId(),
+            "postal_code": str(plz),
+            "availability_status": True,
+            "location": {"latitude": lat, "longitude": lon},
+            "name": f"Station {i}",
+        }
+        for i, (plz, lat, lon) in enumerate(zip(postal_codes.tolist(), rng.uniform(min_lat, max_lat, count).tolist(),
+                                                rng.uniform(min_lon, max_lon, count).tolist()))
+    ]
+
+
+def latency(func, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    p50, p99 = np.percentile(np.array(samples) * 1e6, [50, 99])
+    return f"{p50:>9.1f} {p99:>9.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stations", type=int, nargs="+", default=[2000, 50000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    min_lon, min_lat, max_lon, max_lat = BERLIN_BOUNDS
+    points = list(zip(rng.uniform(min_lat, max_lat, args.queries).tolist(),
+                      rng.uniform(min_lon, max_lon, args.queries).tolist()))
+    codes = [(str(plz),) for plz in rng.integers(10115, 14200, args.queries).tolist()]
+    boxes = [(lon - 0.01, lat - 0.005, lon + 0.01, lat + 0.005) for lat, lon in points]
+
+    print(f"{'stations':>9} {'query':>16} {'p50 us':>9} {'p99 us':>9}")
+    for count in args.stations:
+        documents = make_documents(count)
+        start = time.perf_counter()
+        index = StationIndex.from_documents(documents)
+        index.in_bbox(*BERLIN_BOUNDS)
+        print(f"{count:>9} {'build (ms)':>16} {(time.perf_counter() - start) * 1e3:>9.1f}")
+        print(f"{count:>9} {'postal code':>16} {latency(index.by_postal_code, codes)}")
+        print(f"{count:>9} {'bbox ~1.4x1.1km':>16} {latency(index.in_bbox, boxes)}")
+        print(f"{count:>9} {'radius 1 km':>16} {latency(lambda lat, lon: index.nearby(lat, lon, 1000, 20), points)}")
+        print(f"{count:>9} {'10 nearest':>16} {latency(lambda lat, lon: index.k_nearest(lat, lon, 10), points)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark: cold (generated) and warm (LRU cached) tile latency per zoom level.
+
+Usage:
+    python -m backend.benchmarks.bench_tiles [--zooms 9 10 11 12 13 14]
+
+Runs against the /data snapshot built from DATA_PATHS, so the datasets
+(including the Ladesaeulenregister) must be present.
+"""
+import argparse
+import statistics
+import time
+from backend.config import DATA_PATHS, pdict
+from backend.utilities.geometry_utils import resolve_tolerance
+from backend.utilities.methods import build_processed_data, DATA_LAYERS
+from backend.utilities.tiles import TileCache, BERLIN_BOUNDS, build_tile, tiles_covering
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zooms", type=int, nargs="+", default=list(range(9, 15)))
+    args = parser.parse_args()
+
+    snapshot = build_processed_data(DATA_PATHS, pdict)
+    cache = TileCache(maxsize=100000)
+
+    print(f"{'layer':>11} {'zoom':>5} {'tiles':>6} {'cold p50 ms':>12} {'cold max ms':>12} {'warm p50 us':>12} {'avg KB':>7}")
+    for layer in DATA_LAYERS:
+        for z in args.zooms:
+            gdf = snapshot.level(resolve_tolerance(zoom=z))[layer]
+            cold, warm, sizes = [], [], []
+            for x, y in tiles_covering(BERLIN_BOUNDS, z):
+                start = time.perf_counter()
+                tile = cache.get((layer, z, x, y), lambda: build_tile(gdf, z, x, y))
+                cold.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                cache.get((layer, z, x, y), None)
+                warm.append(time.perf_counter() - start)
+                sizes.append(len(tile))
+            print(f"{layer:>11} {z:>5} {len(cold):>6} {statistics.median(cold) * 1e3:>12.2f}"
+                  f" {max(cold) * 1e3:>12.2f} {statistics.median(warm) * 1e6:>12.2f}"
+                  f" {statistics.mean(sizes) / 1024:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,40 @@ DATA_PATHS = {
     'plz_einwohner': 'datasets/plz_einwohner.csv'
 }
 
+# Not part of DATA_PATHS: the district geometries are only used to resolve district searches.
+DISTRICTS_PATH = 'datasets/geodata_berlin_dis.csv'
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "pickles")
+SNAPSHOT_USE_CONTENT_HASH = os.getenv("SNAPSHOT_USE_CONTENT_HASH", "false").lower() == "true"
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+
+STATION_INDEX_ENABLED = os.getenv("STATION_INDEX_ENABLED", "false").lower() == "true"
+STATION_INDEX_REFRESH_SECONDS = float(os.getenv("STATION_INDEX_REFRESH_SECONDS", "300"))
+
+# Marker clusters are maintained for zoom levels 0 to CLUSTER_MAX_ZOOM; beyond it maps show single stations.
+CLUSTER_MAX_ZOOM = int(os.getenv("CLUSTER_MAX_ZOOM", "16"))
+
+# How often the API checks for a completed import to rebuild the autocomplete index.
+AUTOCOMPLETE_REFRESH_SECONDS = float(os.getenv("AUTOCOMPLETE_REFRESH_SECONDS", "60"))
+
+TEXT_SEARCH_CACHE_SIZE = int(os.getenv("TEXT_SEARCH_CACHE_SIZE", "1024"))
+TEXT_SEARCH_CACHE_TTL = float(os.getenv("TEXT_SEARCH_CACHE_TTL", "60"))
+
+# Availability stream: changes queued per subscriber, seconds between keep-alive comments and
+# between attempts to open the MongoDB change stream.
+AVAILABILITY_STREAM_QUEUE_SIZE = int(os.getenv("AVAILABILITY_STREAM_QUEUE_SIZE", "100"))
+AVAILABILITY_STREAM_KEEPALIVE_SECONDS = float(os.getenv("AVAILABILITY_STREAM_KEEPALIVE_SECONDS", "15"))
+AVAILABILITY_STREAM_RETRY_SECONDS = float(os.getenv("AVAILABILITY_STREAM_RETRY_SECONDS", "60"))
+
+# Availability events are written to MongoDB every AVAILABILITY_LOG_FLUSH_SECONDS, or as soon as
+# AVAILABILITY_LOG_BATCH_SIZE events are waiting.
+AVAILABILITY_LOG_FLUSH_SECONDS = float(os.getenv("AVAILABILITY_LOG_FLUSH_SECONDS", "5"))
+AVAILABILITY_LOG_BATCH_SIZE = int(os.getenv("AVAILABILITY_LOG_BATCH_SIZE", "500"))
+
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "8192"))
+TILE_SEED_ON_STARTUP = os.getenv("TILE_SEED_ON_STARTUP", "false").lower() == "true"
+
 p                           = dict()
 p['picklefolder']           = 'pickles'
 # -----------------------------------
@@ -1,9 +1,39 @@
+import argparse
+import hashlib
+import json
+import re
+import time
+from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
-from backend.db.mongo_client import station_collection  
+from pymongo import ASCENDING, DeleteMany, GEOSPHERE, TEXT, UpdateOne
+from backend.db.mongo_client import station_collection, station_cluster_collection, import_collection
 from backend.utilities.methods import preprocess_lstat
-from backend.config import pdict, DATA_PATHS
+from backend.utilities.dataset_loader import load_ladesaeulenregister, load_geodata_plz
+from backend.utilities.clustering import cluster_deltas
+from backend.config import pdict, DATA_PATHS, IMPORT_BATCH_SIZE, CLUSTER_MAX_ZOOM
 import asyncio
 
+# Register columns carried through preprocess_lstat for the station documents.
+REGISTER_COLUMNS = ("Betreiber", "Straße", "Hausnummer", "Ort", "Anzeigename (Karte)", "Art der Ladeeinrichung")
+
+# Numeric register column with the number of charge points of a station.
+CHARGE_POINT_COLUMN = "Anzahl Ladepunkte"
+
+# Register columns listing the plug types of each charge point, e.g. "AC Steckdose Typ 2, AC Schuko".
+CONNECTOR_COLUMNS = ("Steckertypen1", "Steckertypen2", "Steckertypen3", "Steckertypen4")
+
+# Register columns identifying a charging station across imports. Attributes that change over a
+# station's life (power, operator) are left out, so such changes update the station in place.
+STATION_KEY_COLUMNS = ("PLZ", "Breitengrad", "Längengrad", "Straße", "Hausnummer")
+
+# Columns matching stored stations whose key is unknown to the register (imported before station
+# keys existed, or under an earlier key definition) to register rows.
+POSITION_KEY_COLUMNS = ("PLZ", "Breitengrad", "Längengrad")
+
+# Fields not covered by the content hash because they are owned by the application, not the register.
+UNHASHED_FIELDS = ("availability_status", "content_hash")
+
 
 def sanitize_value(value):
     """
@@ -25,17 +55,522 @@ def sanitize_value(value):
     return str(value)  
 
 
-async def index_charging_stations():
+def sanitize_column(series):
+    """
+    Vectorized counterpart of `sanitize_value` for a whole column.
+
+    Args:
+        series (pd.Series | None): The column to be sanitized, or None if the column is missing.
+
+    Returns:
+        pd.Series | None: An object column of stripped strings where NaN, None and empty or
+                          whitespace-only values are None. None if the column is missing.
+    """
+    if series is None:
+        return None
+    missing = series.isna().to_numpy()
+    values = series.astype(object).where(~missing, "").astype(str).str.strip()
+    return values.astype(object).where((values != "") & ~missing, None)
+
+
+def _with_default(series, default, index):
+    """Fills missing values of a sanitized column with a default value."""
+    if series is None:
+        return pd.Series(default, index=index, dtype=object)
+    return series.where(series.notna(), default)
+
+
+def connector_lists(processed_data):
+    """
+    Collect the distinct plug types of every row from the `CONNECTOR_COLUMNS`.
+
+    Returns:
+        list[list[str]]: The sorted plug types per row; empty if the register has no plug type columns.
+    """
+    columns = [sanitize_column(processed_data[col]) for col in CONNECTOR_COLUMNS if col in processed_data]
+    if not columns:
+        return [[] for _ in range(len(processed_data))]
+    joined = pd.concat(columns, axis=1).fillna("").agg(",".join, axis=1)
+    return [sorted({part.strip() for part in re.split(r"[,;]", value) if part.strip()}) for value in joined]
+
+
+def assign_station_keys(processed_data, columns=STATION_KEY_COLUMNS):
+    """
+    Derive a stable natural key for every row of the register.
+
+    The key hashes the identifying register columns. Rows that are identical in those
+    columns are numbered in order of appearance, so duplicates keep distinct keys.
+
+    Args:
+        processed_data (pd.DataFrame): Output of `preprocess_lstat` including `REGISTER_COLUMNS`.
+        columns (tuple): The identifying columns; missing columns are skipped.
+
+    Returns:
+        pd.Series: The station key of every row, aligned with `processed_data`.
+    """
+    parts = []
+    for col in columns:
+        if col not in processed_data:
+            continue
+        column = processed_data[col]
+        if col in ("Breitengrad", "Längengrad"):
+            column = pd.to_numeric(column, errors="coerce").round(6)
+        parts.append(sanitize_column(column).fillna("").astype(str))
+    identity = pd.concat(parts, axis=1).agg("|".join, axis=1)
+    occurrence = identity.groupby(identity, sort=False).cumcount()
+    return pd.Series(
+        [f"{hashlib.sha1(value.encode()).hexdigest()[:16]}-{n}" for value, n in zip(identity, occurrence)],
+        index=processed_data.index,
+    )
+
+
+def document_content_hash(document):
+    """Hashes the register-owned content of a station document."""
+    content = {key: value for key, value in document.items() if key not in UNHASHED_FIELDS}
+    return hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def build_station_documents(processed_data):
+    """
+    Build MongoDB documents for charging stations column by column.
+
+    All string handling is done on whole columns; the per-row work is reduced to
+    assembling dictionaries from the prepared columns.
+
+    Args:
+        processed_data (pd.DataFrame): Output of `preprocess_lstat` including `REGISTER_COLUMNS`.
+
+    Returns:
+        list[dict]: One document per row with a postal code; rows without one are skipped.
+                    Documents carry a `station_key` if `processed_data` has that column, and
+                    always a `content_hash`. Rows with valid coordinates get a GeoJSON `geo` point.
+                    The charging type, number of charge points and plug types are typed fields
+                    (None or an empty list if the register lacks them) that searches filter on.
+    """
+    index = processed_data.index
+    columns = {col: sanitize_column(processed_data[col]) if col in processed_data else None
+               for col in REGISTER_COLUMNS}
+    provider = _with_default(columns["Betreiber"], "Unknown Provider", index)
+    street = _with_default(columns["Straße"], "Unknown Street", index)
+    house_number = _with_default(columns["Hausnummer"], "", index)
+    city = _with_default(columns["Ort"], "Unknown City", index)
+    postal_code = _with_default(sanitize_column(processed_data["PLZ"]), None, index)
+
+    fallback_name = (provider + " - " + street + " " + house_number).str.strip()
+    station_name = _with_default(columns["Anzeigename (Karte)"], None, index)
+    station_name = station_name.where(station_name.notna(), fallback_name)
+    description = (provider + ", " + street + " " + house_number + ", " + city).str.strip(", ")
+
+    power_kw = pd.to_numeric(processed_data["KW"], errors="coerce").astype(float)
+    power_kw = power_kw.astype(object).where(power_kw.notna(), None)
+    charging_type = _with_default(columns["Art der Ladeeinrichung"], None, index)
+    if CHARGE_POINT_COLUMN in processed_data:
+        charge_points = pd.to_numeric(processed_data[CHARGE_POINT_COLUMN], errors="coerce").round().astype("Int64")
+        charge_points = charge_points.astype(object).where(charge_points.notna(), None)
+    else:
+        charge_points = pd.Series(None, index=index, dtype=object)
+    connectors = connector_lists(processed_data)
+
+    skipped = int(postal_code.isna().sum())
+    if skipped:
+        print(f"Skipping {skipped} rows with missing postal code.")
+
+    station_key = _with_default(processed_data.get("station_key"), None, index)
+
+    latitude = processed_data["Breitengrad"].astype(float).to_numpy()
+    longitude = processed_data["Längengrad"].astype(float).to_numpy()
+    has_geo = np.isfinite(latitude) & np.isfinite(longitude)
+
+    rows = zip(station_key, postal_code, latitude.tolist(), longitude.tolist(), has_geo, description,
+               power_kw, charging_type, charge_points, connectors, station_name, provider, street, house_number, city)
+    documents = [
+        {
+            **({"station_key": key} if key is not None else {}),
+            "postal_code": plz,
+            "availability_status": True,
+            "location": {
+                "latitude": lat,
+                "longitude": lon,
+                "description": desc,
+            },
+            **({"geo": {"type": "Point", "coordinates": [lon, lat]}} if geo else {}),
+            "power_kw": kw,
+            "charging_type": kind,
+            "charge_points": points,
+            "connectors": plugs,
+            "name": name,
+            "metadata": {
+                "provider": prov,
+                "street": st,
+                "house_number": number,
+                "city": ct,
+                "postal_code": plz,
+            },
+        }
+        for key, plz, lat, lon, geo, desc, kw, kind, points, plugs, name, prov, st, number, ct in rows
+        if plz is not None
+    ]
+    for document in documents:
+        document["content_hash"] = document_content_hash(document)
+    return documents
+
+
+def iter_document_batches(processed_data, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Yield station documents in batches of at most `batch_size` rows of `processed_data`.
+
+    Only one batch of documents is materialized at a time, which keeps memory flat
+    regardless of the register size.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    for start in range(0, len(processed_data), batch_size):
+        documents = build_station_documents(processed_data.iloc[start:start + batch_size])
+        if documents:
+            yield documents
+
+
+async def insert_station_documents(processed_data, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Insert the station documents built from `processed_data` in unordered batches.
+
+    Args:
+        processed_data (pd.DataFrame): Output of `preprocess_lstat` including `REGISTER_COLUMNS`.
+        batch_size (int): Number of rows per `insert_many` call.
+
+    Returns:
+        int: Number of inserted documents.
+    """
+    inserted = 0
+    start = time.perf_counter()
+    for batch in iter_document_batches(processed_data, batch_size):
+        result = await station_collection.insert_many(batch, ordered=False)
+        inserted += len(result.inserted_ids)
+    elapsed = time.perf_counter() - start
+    rate = inserted / elapsed if elapsed > 0 else float("inf")
+    print(f"Inserted {inserted} charging stations into MongoDB in {elapsed:.2f}s ({rate:.0f} rows/s, batch size {batch_size}).")
+    return inserted
+
+
+async def ensure_station_indexes():
+    """Creates the indexes the import and the station queries rely on."""
+    await station_collection.create_index("station_key", unique=True, sparse=True)
+    await station_collection.create_index([("geo", GEOSPHERE)])
+    await station_collection.create_index([("postal_code", ASCENDING), ("_id", ASCENDING)])
+    await station_collection.create_index([("charging_type", ASCENDING), ("power_kw", ASCENDING)])
+    await station_collection.create_index([("connectors", ASCENDING), ("power_kw", ASCENDING)])
+    await station_collection.create_index([("power_kw", ASCENDING), ("charge_points", ASCENDING)])
+    await station_collection.create_index(
+        [("name", TEXT), ("metadata.provider", TEXT), ("location.description", TEXT)],
+        name="station_text",
+        weights={"name": 10, "metadata.provider": 5, "location.description": 2},
+        default_language="german",
+    )
+    await station_cluster_collection.create_index(
+        [("zoom", ASCENDING), ("x", ASCENDING), ("y", ASCENDING)], unique=True
+    )
+
+
+def load_processed_register():
+    """
+    Load and preprocess the charging station register and assign its station keys.
+
+    Returns:
+        pd.DataFrame | None: The processed register with a `station_key` column, or None if
+                             there is no valid data.
+    """
+    df_lstat = load_ladesaeulenregister(DATA_PATHS['ladesaeulenregister'])
+    df_geodata = load_geodata_plz(DATA_PATHS['geodata_berlin_plz'])
+
+    processed_data = preprocess_lstat(
+        df_lstat, df_geodata, pdict, extra_columns=(*REGISTER_COLUMNS, CHARGE_POINT_COLUMN, *CONNECTOR_COLUMNS)
+    )
+    if processed_data is None or processed_data.empty:
+        return None
+    processed_data["station_key"] = assign_station_keys(processed_data)
+    return processed_data
+
+
+async def fetch_station_hashes():
+    """
+    Fetch the content hash of every keyed station in MongoDB.
+
+    Returns:
+        dict: Mapping of station key to content hash.
+    """
+    hashes = {}
+    cursor = station_collection.find({"station_key": {"$exists": True}}, {"_id": 0, "station_key": 1, "content_hash": 1})
+    async for station in cursor:
+        hashes[station["station_key"]] = station.get("content_hash")
+    return hashes
+
+
+async def fetch_station_positions(query):
+    """
+    Fetch the positions of the stations in MongoDB matching `query`.
+
+    Returns:
+        list[tuple]: (latitude, longitude) per station; stations without a position are skipped.
+    """
+    positions = []
+    async for station in station_collection.find(query, {"_id": 0, "location.latitude": 1, "location.longitude": 1}):
+        location = station.get("location") or {}
+        if location.get("latitude") is not None and location.get("longitude") is not None:
+            positions.append((location["latitude"], location["longitude"]))
+    return positions
+
+
+def document_position(document):
+    """The (latitude, longitude) of a station document, with NaN for a missing coordinate."""
+    location = document["location"]
+    return (location["latitude"] if location["latitude"] is not None else np.nan,
+            location["longitude"] if location["longitude"] is not None else np.nan)
+
+
+async def apply_cluster_deltas(added, removed, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Update the marker clusters of every zoom level for added and removed station positions.
+
+    Each affected cluster cell is changed with an `$inc` upsert, so only the cells containing
+    the changed stations are written; cells left without stations are deleted.
+
+    Args:
+        added (list[tuple]): (latitude, longitude) of the added stations.
+        removed (list[tuple]): (latitude, longitude) of the removed stations.
+        batch_size (int): Number of operations per `bulk_write` call.
+
+    Returns:
+        int: Number of changed cluster cells.
+    """
+    deltas = cluster_deltas(added, removed, 0, CLUSTER_MAX_ZOOM)
+    operations = [
+        UpdateOne({"zoom": delta["zoom"], "x": delta["x"], "y": delta["y"]},
+                  {"$inc": {"count": delta["count"], "lat_sum": delta["lat_sum"], "lon_sum": delta["lon_sum"]}},
+                  upsert=True)
+        for delta in deltas
+    ]
+    for start in range(0, len(operations), batch_size):
+        await station_cluster_collection.bulk_write(operations[start:start + batch_size], ordered=False)
+    if removed:
+        await station_cluster_collection.delete_many({"count": {"$lte": 0}})
+    return len(deltas)
+
+
+async def rebuild_station_clusters(batch_size=IMPORT_BATCH_SIZE):
+    """
+    Rebuild the marker clusters of every zoom level from the stations in MongoDB.
+
+    Returns:
+        int: Number of cluster cells.
+    """
+    await station_cluster_collection.delete_many({})
+    cells = await apply_cluster_deltas(await fetch_station_positions({}), [], batch_size)
+    print(f"Built {cells} marker cluster cells for zoom levels 0-{CLUSTER_MAX_ZOOM}.")
+    return cells
+
+
+async def rekey_legacy_stations(processed_data, new_keys, stale_keys, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Give stored stations with a key unknown to the register the key of their register row.
+
+    Stations imported before station keys existed, or under an earlier key definition, are
+    matched to the register rows that would otherwise be inserted by postal code and position
+    (numbered in order of appearance, like station keys). Matched stations get the register
+    key in place, so their `_id`, ratings and availability history are kept; their content
+    hash is cleared so the sync then updates them with the register fields.
+
+    Args:
+        processed_data (pd.DataFrame): Output of `load_processed_register`.
+        new_keys (set): Register keys not yet in MongoDB.
+        stale_keys (list): Stored keys not in the register.
+        batch_size (int): Number of operations per `bulk_write` call.
+
+    Returns:
+        dict: Mapping of the previous key (None for unkeyed stations) to the number of
+              stations re-keyed from it, and the assigned register keys under "assigned".
+    """
+    query = {"$or": [{"station_key": {"$in": stale_keys}}, {"station_key": {"$exists": False}}]}
+    projection = {"station_key": 1, "postal_code": 1, "location.latitude": 1, "location.longitude": 1}
+    stations = await station_collection.find(query, projection).sort("_id", ASCENDING).to_list(None)
+    if not stations:
+        return {"assigned": []}
+
+    stored = pd.DataFrame({
+        "PLZ": [station.get("postal_code") for station in stations],
+        "Breitengrad": [(station.get("location") or {}).get("latitude") for station in stations],
+        "Längengrad": [(station.get("location") or {}).get("longitude") for station in stations],
+    })
+    register = processed_data[processed_data["station_key"].isin(new_keys)]
+    register_keys = dict(zip(assign_station_keys(register, POSITION_KEY_COLUMNS), register["station_key"]))
+
+    operations, rekeyed = [], {"assigned": []}
+    for station, position_key in zip(stations, assign_station_keys(stored, POSITION_KEY_COLUMNS)):
+        key = register_keys.get(position_key)
+        if key is None:
+            continue
+        operations.append(UpdateOne({"_id": station["_id"]}, {"$set": {"station_key": key, "content_hash": None}}))
+        previous = station.get("station_key")
+        rekeyed[previous] = rekeyed.get(previous, 0) + 1
+        rekeyed["assigned"].append(key)
+    for start in range(0, len(operations), batch_size):
+        await station_collection.bulk_write(operations[start:start + batch_size], ordered=False)
+    return rekeyed
+
+
+def station_upsert(document):
+    """
+    Build the upsert for a station document.
+
+    Register fields are overwritten; the availability status is only set when the station
+    is inserted, so a re-import keeps the current state and the document's `_id`.
+    """
+    fields = {key: value for key, value in document.items() if key != "availability_status"}
+    return UpdateOne(
+        {"station_key": document["station_key"]},
+        {"$set": fields, "$setOnInsert": {"availability_status": document["availability_status"]}},
+        upsert=True,
+    )
+
+
+async def record_import(mode, report=None):
+    """
+    Record a completed import, which tells the API to rebuild the indexes derived from the stations.
+
+    Args:
+        mode (str): "sync" or "full".
+        report (dict, optional): The sync report.
+    """
+    await import_collection.update_one(
+        {"_id": "charging_stations"},
+        {"$set": {"completed_at": datetime.now(timezone.utc), "mode": mode, "report": report}},
+        upsert=True,
+    )
+
+
+async def sync_station_documents(processed_data, batch_size=IMPORT_BATCH_SIZE, update_clusters=True):
+    """
+    Apply the difference between the register and MongoDB with unordered `bulk_write` calls.
+
+    Stored stations whose key the register does not know (imported before station keys
+    existed, or under an earlier key definition) are first re-keyed in place where their
+    postal code and position match a new register row. Then new stations are inserted,
+    stations whose content hash changed are updated, and stations no longer in the register
+    are deleted. The positions are part of the station key, so only inserted and deleted
+    stations change the marker clusters, which are updated for them unless `update_clusters`
+    is False.
+
+    Args:
+        processed_data (pd.DataFrame): Output of `load_processed_register`.
+        batch_size (int): Number of operations per `bulk_write` call.
+        update_clusters (bool): Whether to apply the changes to the marker clusters.
+
+    Returns:
+        dict: Number of re-keyed, inserted, updated, deleted and unchanged stations.
+    """
+    existing = await fetch_station_hashes()
+    report = {"rekeyed": 0, "inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    seen = set()
+    added = []
+    start = time.perf_counter()
+
+    register_keys = set(processed_data.loc[processed_data["PLZ"].notna(), "station_key"])
+    removed = [key for key in existing if key not in register_keys]
+    new_keys = register_keys - set(existing)
+    if new_keys:
+        rekeyed = await rekey_legacy_stations(processed_data, new_keys, removed, batch_size)
+        for key in rekeyed.pop("assigned"):
+            existing[key] = None
+        report["rekeyed"] = sum(rekeyed.values())
+        removed = [key for key in removed if key not in rekeyed]
+        if report["rekeyed"]:
+            print(f"Re-keyed {report['rekeyed']} stations from earlier imports, keeping their ids.")
+
+    for batch in iter_document_batches(processed_data, batch_size):
+        operations = []
+        for document in batch:
+            key = document["station_key"]
+            seen.add(key)
+            if key not in existing:
+                report["inserted"] += 1
+                added.append(document_position(document))
+            elif existing[key] != document["content_hash"]:
+                report["updated"] += 1
+            else:
+                report["unchanged"] += 1
+                continue
+            operations.append(station_upsert(document))
+        if operations:
+            await station_collection.bulk_write(operations, ordered=False)
+
+    removed_positions = []
+    if update_clusters:
+        removed_positions = await fetch_station_positions(
+            {"$or": [{"station_key": {"$in": removed}}, {"station_key": {"$exists": False}}]}
+        )
+    operations = [DeleteMany({"station_key": {"$in": removed[i:i + batch_size]}})
+                  for i in range(0, len(removed), batch_size)]
+    operations.append(DeleteMany({"station_key": {"$exists": False}}))
+    result = await station_collection.bulk_write(operations, ordered=False)
+    report["deleted"] = result.deleted_count
+    if update_clusters:
+        await apply_cluster_deltas(added, removed_positions, batch_size)
+
+    elapsed = time.perf_counter() - start
+    print(f"Synced {len(seen)} charging stations in {elapsed:.2f}s: {report['rekeyed']} re-keyed, "
+          f"{report['inserted']} inserted, {report['updated']} updated, {report['deleted']} deleted, "
+          f"{report['unchanged']} unchanged.")
+    return report
+
+
+async def sync_charging_stations(batch_size=IMPORT_BATCH_SIZE):
+    """
+    Incrementally synchronize the charging stations in MongoDB with the register.
+
+    Unlike `index_charging_stations` the collection is never dropped: station ids, and with
+    them the ratings referencing them, as well as availability states survive the import and
+    the search keeps serving results while it runs. The marker clusters are updated for the
+    inserted and deleted stations, or built from scratch if there are none yet.
+
+    Args:
+        batch_size (int): Number of operations per `bulk_write` call.
+
+    Returns:
+        dict | None: The sync report, or None if there was no valid data or an error occurred.
+    """
+    try:
+        await ensure_station_indexes()
+        processed_data = load_processed_register()
+        if processed_data is None:
+            print("No valid data to process.")
+            return None
+        clusters_missing = await station_cluster_collection.estimated_document_count() == 0
+        report = await sync_station_documents(processed_data, batch_size, update_clusters=not clusters_missing)
+        if clusters_missing:
+            await rebuild_station_clusters(batch_size)
+        await record_import("sync", report)
+        return report
+
+    except Exception as e:
+        print(f"Error during sync: {e}")
+        return None
+
+
+async def index_charging_stations(batch_size=IMPORT_BATCH_SIZE):
     """
     Manually index charging stations from a dataset into MongoDB.
 
     This function performs the following steps:
     1. Drops the existing `charging_stations` collection in MongoDB to prevent duplicates.
-    2. Loads the charging station dataset from an Excel file.
+    2. Loads the charging station dataset (parsed from Excel once, then from its columnar cache).
     3. Loads geographic data (e.g., postal code mappings) from a CSV file.
-    4. Preprocesses and cleans the dataset.
-    5. Iterates over processed data to construct valid MongoDB documents.
-    6. Inserts the constructed documents into MongoDB.
+    4. Preprocesses and cleans the dataset, keeping the register columns needed for the documents,
+       and assigns each station its natural key.
+    5. Builds the MongoDB documents column-wise, one batch at a time.
+    6. Inserts each batch with an unordered `insert_many` and reports the throughput.
+    7. Rebuilds the marker clusters of every zoom level and records the completed import.
+
+    Args:
+        batch_size (int): Number of rows per `insert_many` call.
 
     Raises:
         Exception: If any unexpected error occurs during the indexing process.
@@ -46,66 +581,29 @@ async def index_charging_stations():
     try:
         await station_collection.drop()
         print("Dropped existing charging_stations collection.")
+        await ensure_station_indexes()
 
-        file_path = DATA_PATHS['ladesaeulenregister']
-        df_lstat = pd.read_excel(file_path, header=10)
-
-        df_geodata = pd.read_csv(DATA_PATHS['geodata_berlin_plz'], sep=';')
-
-        processed_data = preprocess_lstat(df_lstat, df_geodata, pdict)
-        if processed_data is None or processed_data.empty:
+        processed_data = load_processed_register()
+        if processed_data is None:
             print("No valid data to process.")
             return
 
-        documents = []
-        for idx, row in processed_data.iterrows():
-            raw_row = df_lstat.iloc[idx]
-
-            provider = sanitize_value(raw_row.get("Betreiber")) or "Unknown Provider"
-            street = sanitize_value(raw_row.get("Straße")) or "Unknown Street"
-            house_number = sanitize_value(raw_row.get("Hausnummer")) or ""
-            city = sanitize_value(raw_row.get("Ort")) or "Unknown City"
-            postal_code = sanitize_value(row.get("PLZ"))
-
-            if not postal_code:
-                print(f"Skipping row with missing postal code: {row}")
-                continue
-
-            station_name = sanitize_value(raw_row.get("Anzeigename (Karte)"))
-            if not station_name:
-                station_name = f"{provider} - {street} {house_number}".strip()
-
-            location_description = f"{provider}, {street} {house_number}, {city}".strip(", ")
-
-            document = {
-                "postal_code": postal_code,
-                "availability_status": True,
-                "location": {
-                    "latitude": row["Breitengrad"],
-                    "longitude": row["Längengrad"],
-                    "description": location_description,
-                },
-                "power_kw": row.get("KW", 0),
-                "name": station_name,
-                "metadata": {
-                    "provider": provider,
-                    "street": street,
-                    "house_number": house_number,
-                    "city": city,
-                    "postal_code": postal_code,
-                },
-            }
-            documents.append(document)
-
-        if documents:
-            result = await station_collection.insert_many(documents)
-            print(f"Inserted {len(result.inserted_ids)} charging stations into MongoDB.")
-        else:
+        if not await insert_station_documents(processed_data, batch_size):
             print("No documents to insert.")
+        await rebuild_station_clusters(batch_size)
+        await record_import("full")
 
     except Exception as e:
         print(f"Error during indexing: {e}")
 
 
 if __name__ == "__main__":
-    asyncio.run(index_charging_stations())
+    parser = argparse.ArgumentParser(description="Synchronize the charging station register with MongoDB.")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--full", action="store_true", help="drop the collection and reload it instead of syncing")
+    parser.add_argument("--clusters", action="store_true", help="only rebuild the marker clusters from MongoDB")
+    args = parser.parse_args()
+    if args.clusters:
+        asyncio.run(rebuild_station_clusters(args.batch_size))
+    else:
+        asyncio.run((index_charging_stations if args.full else sync_charging_stations)(args.batch_size))
@@ -12,3 +12,7 @@ db = client["berlin_bezirke_db"]
 user_collection = db.get_collection("users")
 station_collection = db.get_collection("charging_stations")
 rating_collection = db.get_collection("ratings")
+station_cluster_collection = db.get_collection("station_clusters")
+import_collection = db.get_collection("imports")
+availability_event_collection = db.get_collection("availability_events")
+availability_rollup_collection = db.get_collection("availability_rollups")
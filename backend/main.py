@@ -1,14 +1,43 @@
-from fastapi import FastAPI, HTTPException, Depends, Body
-from typing import Optional
+from fastapi import FastAPI, HTTPException, Depends, Body, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, Response
+from typing import List, Optional
+from datetime import datetime
 from backend.utilities import methods as m1
-from backend.config import pdict, DATA_PATHS
+from backend.utilities.snapshot_cache import SnapshotCache
+from backend.utilities.geometry_utils import resolve_tolerance
+from backend.utilities.tiles import TileCache, build_tile, is_valid_tile, seed_tiles
+from backend.utilities.fast_json import FastJSONResponse, loads, loads_lines
+from backend.utilities.geojson_stream import (
+    iter_feature_collection, iter_layer_collections, negotiate_encoding, compress_chunks
+)
+from backend.config import (
+    pdict, DATA_PATHS, SNAPSHOT_DIR, SNAPSHOT_USE_CONTENT_HASH, TILE_CACHE_SIZE, TILE_SEED_ON_STARTUP,
+    STATION_INDEX_ENABLED, STATION_INDEX_REFRESH_SECONDS, CLUSTER_MAX_ZOOM, AUTOCOMPLETE_REFRESH_SECONDS,
+    AVAILABILITY_STREAM_QUEUE_SIZE, AVAILABILITY_STREAM_KEEPALIVE_SECONDS, AVAILABILITY_STREAM_RETRY_SECONDS,
+    AVAILABILITY_LOG_FLUSH_SECONDS, AVAILABILITY_LOG_BATCH_SIZE
+)
 from backend.src.user_profile.user_profile_service import router as auth_router
 from backend.src.user_profile.user_profile_repositories import UserRepository
+import asyncio
 import pandas as pd
-from backend.src.charging_station_search.charging_station_search_service import StationSearchService, StationRepository,InvalidPostalCodeException
+from backend.src.charging_station_search.charging_station_search_service import (
+    StationSearchService, StationRepository, InvalidPostalCodeException, InvalidCoordinatesException,
+    InvalidPageException, MAX_NEARBY_RADIUS, MAX_NEARBY_LIMIT, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, station_to_row,
+    DEFAULT_VIEWPORT_LIMIT, MAX_VIEWPORT_LIMIT, MAX_CLUSTER_GRID, InvalidSearchQueryException,
+    DEFAULT_TEXT_SEARCH_LIMIT, MAX_TEXT_SEARCH_LIMIT, MAX_TEXT_QUERY_LENGTH, StationFilter, PostalCode
+)
 from backend.src.charging_station_rating.charging_station_rating_service import RatingService, RatingRepository
 from backend.src.charging_station_rating.charging_station_rating_management import Rating, RatingManagement
 from backend.src.charging_station_search.charging_station_search_management import StationSearchManagement
+from backend.src.charging_station_search.station_index import InMemoryStationRepository
+from backend.src.charging_station_search.autocomplete_index import StationAutocomplete, MAX_SUGGESTIONS
+from backend.src.charging_station_search.availability_broadcaster import AvailabilityBroadcaster, MAX_STREAM_SUBSCRIPTIONS
+from backend.src.charging_station_search.availability_history import (
+    AvailabilityEventLog, OccupancyRepository, InvalidOccupancyQueryException
+)
+from backend.src.charging_station_search.availability_forecast import OccupancyForecast, MAX_FORECAST_HOURS
+from backend.src.charging_station_search.district_repository import UnknownDistrictException
 from backend.db.mongo_client import user_collection
 
 app = FastAPI()
@@ -16,13 +45,105 @@ app = FastAPI()
 
 user_repository = UserRepository(user_collection)
 station_repository = StationRepository()
-station_management = StationSearchManagement()
+station_index = InMemoryStationRepository(station_repository) if STATION_INDEX_ENABLED else None
+station_management = StationSearchManagement(repository=station_index or station_repository)
+station_autocomplete = StationAutocomplete()
+availability_broadcaster = AvailabilityBroadcaster(queue_size=AVAILABILITY_STREAM_QUEUE_SIZE)
+availability_log = AvailabilityEventLog(batch_size=AVAILABILITY_LOG_BATCH_SIZE)
+occupancy_repository = OccupancyRepository()
+occupancy_forecast = OccupancyForecast()
+availability_log.rollup_listeners.append(occupancy_forecast.apply_increments)
 rating_repository = RatingRepository()
+data_snapshot = SnapshotCache(
+    name="processed_data",
+    source_paths=DATA_PATHS.values(),
+    builder=lambda: m1.build_processed_data(DATA_PATHS, pdict),
+    cache_dir=SNAPSHOT_DIR,
+    use_content_hash=SNAPSHOT_USE_CONTENT_HASH,
+    schema_version=5,
+)
+tile_cache = TileCache(maxsize=TILE_CACHE_SIZE)
 
 
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 
 
+def seed_tile_cache():
+    """Pre-generates the tiles of all data layers over Berlin for zoom levels 9-14."""
+    snapshot = data_snapshot.get()
+    return seed_tiles(
+        tile_cache,
+        lambda z: snapshot.level(resolve_tolerance(zoom=z)),
+        data_snapshot.version,
+    )
+
+
+def report_tile_seeding(future):
+    """Reports the outcome of the background tile seeding."""
+    if future.cancelled():
+        return
+    if future.exception() is not None:
+        print(f"Error seeding tile cache: {future.exception()!r}")
+    else:
+        print(f"Seeded {future.result()} tiles")
+
+
+@app.on_event("startup")
+async def startup_seed_tiles():
+    """
+    Optionally pre-seed the tile cache in the background (TILE_SEED_ON_STARTUP=true).
+    """
+    if TILE_SEED_ON_STARTUP:
+        app.state.tile_seed_task = asyncio.get_running_loop().run_in_executor(None, seed_tile_cache)
+        app.state.tile_seed_task.add_done_callback(report_tile_seeding)
+
+
+@app.on_event("startup")
+async def startup_station_index():
+    """
+    Load the in-memory station index and keep it current (STATION_INDEX_ENABLED=true).
+    """
+    if station_index is not None:
+        await station_index.load()
+        app.state.station_index_task = asyncio.create_task(station_index.keep_current(STATION_INDEX_REFRESH_SECONDS))
+
+
+@app.on_event("startup")
+async def startup_station_autocomplete():
+    """
+    Build the autocomplete index and rebuild it after each register import.
+    """
+    app.state.autocomplete_task = asyncio.create_task(station_autocomplete.keep_current(AUTOCOMPLETE_REFRESH_SECONDS))
+
+
+@app.on_event("startup")
+async def startup_availability_broadcaster():
+    """
+    Push availability changes from the MongoDB change stream to the `/stations/stream` subscribers.
+    """
+    app.state.availability_task = asyncio.create_task(
+        availability_broadcaster.follow_changes(AVAILABILITY_STREAM_RETRY_SECONDS)
+    )
+
+
+@app.on_event("startup")
+async def startup_availability_log():
+    """
+    Write the logged availability changes to MongoDB in batches, off the request path, after
+    building the occupancy forecast profiles the batches then keep current.
+    """
+    await occupancy_forecast.load()
+    app.state.availability_log_task = asyncio.create_task(availability_log.run(AVAILABILITY_LOG_FLUSH_SECONDS))
+
+
+@app.on_event("shutdown")
+async def shutdown_availability_log():
+    """
+    Write the availability changes still queued before the worker exits.
+    """
+    await availability_log.flush()
+
+
 @app.get("/")
 async def root():
     """
@@ -32,81 +153,520 @@ async def root():
     return {"message": "Welcome to the Charging Station Backend API"}
 
 @app.get("/data", tags=["Data"])
-async def get_processed_data():
+async def get_processed_data(
+    request: Request,
+    output_format: str = Query("json", alias="format", pattern="^(json|geojson)$"),
+    layer: Optional[str] = Query(None, description="One of: " + ", ".join(m1.DATA_LAYERS)),
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    tolerance: Optional[float] = Query(None, ge=0),
+):
     """
     Fetch preprocessed data from backend.
     
-    This endpoint loads data from predefined paths, processes it,
-    and returns structured data for frontend compatibility.
+    The processed result is built once per version of the source files and
+    served from an in-memory (and on-disk) snapshot afterwards. It is rebuilt
+    automatically when one of the dataset files changes.
+
+    With `format=geojson` the layers are streamed feature by feature as GeoJSON
+    FeatureCollections, compressed with brotli or gzip if the client accepts it.
+
+    Postal code polygons are served at full resolution unless a map `zoom` or a
+    simplification `tolerance` (degrees) is given; the closest precomputed,
+    topology-preserving simplification level is used then.
+
+    Args:
+        request (Request): The incoming request, used for Accept-Encoding negotiation.
+        output_format (str): "json" for WKT records (default) or "geojson".
+        layer (Optional[str]): Return only this layer instead of all three.
+        zoom (Optional[int]): Map zoom level the geometries are rendered at.
+        tolerance (Optional[float]): Maximum simplification tolerance in degrees.
     
     Returns:
-        dict: A dictionary containing processed geolocation, charging station,
+        dict | StreamingResponse: Processed geolocation, charging station,
               and resident population data.
     """
+    if layer is not None and layer not in m1.DATA_LAYERS:
+        raise HTTPException(status_code=400, detail=f"Unknown layer: {layer}")
 
     try:
-        
-        df_geodat_plz = pd.read_csv(DATA_PATHS['geodata_berlin_plz'], sep=';')
-        df_lstat = pd.read_excel(DATA_PATHS['ladesaeulenregister'], header=10)
-        df_residents = pd.read_csv(DATA_PATHS['plz_einwohner'])
-
-        
-        gdf_lstat = m1.preprocess_lstat(df_lstat, df_geodat_plz, pdict)
-        gdf_lstat3 = m1.count_plz_occurrences(gdf_lstat)
-        gdf_residents2 = m1.preprocess_resid(df_residents, df_geodat_plz, pdict)
-
-        
-        gdf_lstat3.rename(columns={"PLZ": "Postleitzahl"}, inplace=True)
-        gdf_residents2.rename(columns={"PLZ": "Postleitzahl"}, inplace=True)
-
-        
-        gdf_lstat3["geometry"] = gdf_lstat3["geometry"].apply(lambda geom: geom.wkt if geom else None)
-        gdf_residents2["geometry"] = gdf_residents2["geometry"].apply(lambda geom: geom.wkt if geom else None)
-
-        return {
-            "geodat_plz": df_geodat_plz.to_dict(orient="records"),
-            "lstat": gdf_lstat3.to_dict(orient="records"),
-            "residents": gdf_residents2.to_dict(orient="records")
-        }
+        snapshot = await run_in_threadpool(data_snapshot.get)
     except FileNotFoundError as e:
         raise HTTPException(status_code=500, detail=f"File not found: {e.filename}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    level = resolve_tolerance(tolerance, zoom)
+    if output_format == "json":
+        records = await run_in_threadpool(snapshot.records, level)
+        if layer is not None:
+            return {layer: records[layer]}
+        return records
+
+    features = await run_in_threadpool(snapshot.features, level)
+    if layer is not None:
+        chunks = iter_feature_collection(features[layer])
+    else:
+        chunks = iter_layer_collections(features)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return StreamingResponse(
+        compress_chunks(chunks, encoding),
+        media_type="application/geo+json" if layer is not None else "application/json",
+        headers=headers,
+    )
+
+@app.get("/data/snapshot", tags=["Data"])
+async def get_data_snapshot_stats():
+    """
+    Report the state of the /data snapshot.
+
+    Returns:
+        dict: The snapshot version, build time and hit/miss counters.
+    """
+    return data_snapshot.stats()
+
+@app.get("/tiles/{layer}/{z}/{x}/{y}", tags=["Data"])
+async def get_tile(layer: str, z: int, x: int, y: int, request: Request):
+    """
+    Fetch one map tile of a data layer as compact GeoJSON.
+
+    Tiles follow the XYZ (slippy map) scheme. They are cut from the processed
+    layers of the /data snapshot at the simplification level matching the zoom,
+    clipped to the tile and kept in an LRU cache keyed by data version, layer
+    and tile coordinates.
+
+    Args:
+        layer (str): One of geodat_plz, lstat or residents.
+        z (int): Zoom level.
+        x (int): Tile column.
+        y (int): Tile row.
+        request (Request): The incoming request, used for Accept-Encoding negotiation.
+
+    Returns:
+        Response: A GeoJSON FeatureCollection with the features inside the tile.
+    """
+    if layer not in m1.DATA_LAYERS:
+        raise HTTPException(status_code=404, detail=f"Unknown layer: {layer}")
+    if not is_valid_tile(z, x, y) or z > 22:
+        raise HTTPException(status_code=400, detail="Invalid tile coordinates")
+
+    try:
+        snapshot = await run_in_threadpool(data_snapshot.get)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=500, detail=f"File not found: {e.filename}")
+
+    key = (data_snapshot.version, layer, z, x, y)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    tile = tile_cache.lookup(key, encoding)
+    if tile is None:
+        def build():
+            return build_tile(snapshot.level(resolve_tolerance(zoom=z))[layer], z, x, y)
+        tile = await run_in_threadpool(tile_cache.get, key, build, encoding)
+
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "public, max-age=3600"}
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=tile, media_type="application/geo+json", headers=headers)
+
+@app.get("/tiles/stats", tags=["Data"])
+async def get_tile_stats():
+    """
+    Report the state of the tile cache.
+
+    Returns:
+        dict: The number of cached tiles and hit/miss counters.
+    """
+    return tile_cache.stats()
+
+def station_filter(
+    min_kw: Optional[float] = Query(None, ge=0),
+    max_kw: Optional[float] = Query(None, ge=0),
+    charging_type: Optional[str] = Query(None, alias="type"),
+    connector: Optional[str] = None,
+    min_points: Optional[int] = Query(None, ge=1),
+) -> Optional[StationFilter]:
+    """
+    Builds the station filter shared by the search endpoints from its query parameters.
+
+    Args:
+        min_kw (Optional[float]): Only return stations with at least this power.
+        max_kw (Optional[float]): Only return stations with at most this power.
+        charging_type (Optional[str]): Only return stations of this type, e.g. "Schnellladeeinrichtung".
+        connector (Optional[str]): Only return stations offering this plug type, e.g. "DC Kupplung Combo".
+        min_points (Optional[int]): Only return stations with at least this many charge points.
+
+    Returns:
+        Optional[StationFilter]: The filter, or None if no parameter is set.
+    """
+    try:
+        filters = StationFilter(min_kw, max_kw, charging_type, connector, min_points)
+    except InvalidSearchQueryException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return filters or None
+
+@app.get("/stations/search", tags=["Charging Stations"])
+async def search_stations_by_text(
+    q: str = Query(..., min_length=1, max_length=MAX_TEXT_QUERY_LENGTH),
+    postal_code: Optional[str] = None,
+    limit: int = Query(DEFAULT_TEXT_SEARCH_LIMIT, ge=1, le=MAX_TEXT_SEARCH_LIMIT),
+    filters: Optional[StationFilter] = Depends(station_filter),
+):
+    """
+    Search for charging stations by free text across name, provider and location description.
+
+    Args:
+        q (str): Words to search for, e.g. "schnelllader alexanderplatz".
+        postal_code (Optional[str]): Only return stations with this postal code.
+        limit (int): The maximum number of stations to return (default: 20).
+        filters (Optional[StationFilter]): The `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
+
+    Returns:
+        dict: The stations ordered by relevance, each with its text `score` and `power_kw`.
+    """
+    try:
+        result = await station_management.search_text(q, postal_code, filters, limit)
+        return FastJSONResponse({
+            "query": q,
+            "stations": result.stations,
+            "stations_found": len(result.stations),
+            "cached": result.cached,
+        })
+    except (InvalidSearchQueryException, InvalidPostalCodeException) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @app.get("/stations/search/{postal_code}", tags=["Charging Stations"])
-async def search_stations(postal_code: str):
+async def search_stations(
+    postal_code: str,
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    filters: Optional[StationFilter] = Depends(station_filter),
+):
     """
-    Search for charging stations by postal code.
+    Search for charging stations by postal code, one page at a time.
     
     Args:
         postal_code (str): The postal code to search for charging stations.
+        page_size (int): The maximum number of stations per page (default: 100).
+        cursor (Optional[str]): The `next_cursor` of the previous page.
+        filters (Optional[StationFilter]): The `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
+    
+    Returns:
+        dict: A dictionary containing a list of charging stations (with numeric `location`
+              coordinates) and metadata. `next_cursor` is set if more stations follow.
+    """
+    try:
+        result = await station_management.search_rows_by_postal_code(postal_code, page_size, cursor, filters)
+        return FastJSONResponse({
+            "stations": result.rows,
+            "stations_found": result.event.stations_found,
+            "timestamp": result.event.timestamp.isoformat(),
+            "next_cursor": result.next_cursor,
+        })
+    except (InvalidPostalCodeException, InvalidPageException) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.post("/stations/search/batch", tags=["Charging Stations"])
+async def search_stations_batch(
+    postal_codes: Optional[List[str]] = Body(None),
+    district: Optional[str] = Body(None),
+    filters: Optional[StationFilter] = Depends(station_filter),
+):
+    """
+    Search for the charging stations of several postal codes, or of a whole district, at once.
+    
+    Args:
+        postal_codes (Optional[List[str]]): The postal codes to search for.
+        district (Optional[str]): A district (Bezirk) whose overlapping postal codes are searched.
+        filters (Optional[StationFilter]): The `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
     
     Returns:
-        dict: A dictionary containing a list of charging stations and metadata.
+        dict: The stations and their count per postal code, and the total count.
     """
+    if (postal_codes is None) == (district is None):
+        raise HTTPException(status_code=400, detail="Either postal_codes or district is required")
     try:
-        station_management = StationSearchManagement()
-        
-        result = await station_management.search_by_postal_code(postal_code) 
-        return {
-            "stations": [
-                {
-                    "id": station.id,
-                    "postal_code": station.postal_code.value,
-                    "availability_status": station.availability_status,
-                    "location": station.location,
-                    "name": station.name,  
-                }
-                for station in result.stations
-            ],
+        if district is not None:
+            result = await station_management.search_by_district(district, filters)
+        else:
+            result = await station_management.search_by_postal_codes(postal_codes, filters)
+        return FastJSONResponse({
+            "results": {
+                code: {"stations": rows, "stations_found": len(rows)}
+                for code, rows in result.groups.items()
+            },
+            "postal_codes": list(result.event.postal_codes),
+            "district": result.event.district,
             "stations_found": result.event.stations_found,
             "timestamp": result.event.timestamp.isoformat(),
-        }
+        })
+    except (InvalidPostalCodeException, UnknownDistrictException) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.get("/stations/facets", tags=["Charging Stations"])
+async def get_station_facets(
+    postal_code: Optional[str] = None,
+    filters: Optional[StationFilter] = Depends(station_filter),
+):
+    """
+    Count the charging stations per charging type, plug type and postal code.
+
+    Args:
+        postal_code (Optional[str]): Only count stations with this postal code.
+        filters (Optional[StationFilter]): The `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
+
+    Returns:
+        dict: `totals` with the number of stations, available stations and charge points, and
+              `charging_types`, `connectors` and `postal_codes` with those counts per value.
+    """
+    try:
+        return FastJSONResponse(await station_management.station_facets(postal_code, filters))
     except InvalidPostalCodeException as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.get("/stations/autocomplete", tags=["Charging Stations"])
+async def autocomplete_stations(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+):
+    """
+    Suggest postal codes, station names, providers and streets for a partial query.
+
+    Args:
+        q (str): The partial query, e.g. "101", "Vatt" or "marx".
+        limit (int): The maximum number of suggestions (default: 10).
+
+    Returns:
+        dict: The suggestions with their `type`, `value` and number of `stations`; values
+              starting with the query come first, then values with more stations.
+    """
+    try:
+        return FastJSONResponse({"query": q, "suggestions": await station_autocomplete.complete(q, limit)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.get("/stations/stream", tags=["Charging Stations"])
+async def stream_station_availability(
+    station_id: Optional[List[str]] = Query(None),
+    postal_code: Optional[List[str]] = Query(None),
+):
+    """
+    Stream the availability changes of stations as Server-Sent Events.
+
+    Args:
+        station_id (Optional[List[str]]): IDs of the stations to follow; the parameter may be repeated.
+        postal_code (Optional[List[str]]): Postal codes whose stations to follow; the parameter may be repeated.
+
+    Returns:
+        StreamingResponse: An `availability` event with `id`, `postal_code`, `availability_status`
+                           and `timestamp` per change, and keep-alive comments in between.
+    """
+    station_ids, postal_codes = station_id or [], postal_code or []
+    if not station_ids and not postal_codes:
+        raise HTTPException(status_code=400, detail="At least one station_id or postal_code is required")
+    if len(station_ids) + len(postal_codes) > MAX_STREAM_SUBSCRIPTIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STREAM_SUBSCRIPTIONS} stations and postal codes")
+    try:
+        postal_codes = [PostalCode(code).value for code in postal_codes]
+    except InvalidPostalCodeException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    subscription = availability_broadcaster.subscribe(station_ids, postal_codes)
+    return StreamingResponse(
+        availability_broadcaster.stream(subscription, AVAILABILITY_STREAM_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/stations/occupancy", tags=["Charging Stations"])
+async def get_postal_code_occupancy(
+    postal_code: str,
+    granularity: str = Query("hour", pattern="^(hour|day)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """
+    Get the combined occupancy of the stations of a postal code per hour or day.
+
+    Args:
+        postal_code (str): The postal code.
+        granularity (str): "hour" (default) or "day".
+        start (Optional[datetime]): Start of the window (default: one day, or 30 days, before `end`).
+        end (Optional[datetime]): End of the window (default: the end of the current hour or day).
+
+    Returns:
+        dict: One bucket per hour or day with availability reports, each with its occupied and
+              observed seconds, `occupancy` ratio, number of reports, changes and reporting stations.
+    """
+    try:
+        postal_code = PostalCode(postal_code)
+        start, end = occupancy_repository.window(granularity, start, end)
+        buckets = await occupancy_repository.postal_code_occupancy(postal_code, granularity, start, end)
+        return FastJSONResponse({
+            "postal_code": postal_code.value,
+            "granularity": granularity,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "buckets": buckets,
+        })
+    except (InvalidPostalCodeException, InvalidOccupancyQueryException) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.get("/stations/nearby", tags=["Charging Stations"])
+async def search_nearby_stations(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: float = Query(1000, gt=0, le=MAX_NEARBY_RADIUS),
+    limit: int = Query(20, ge=1, le=MAX_NEARBY_LIMIT),
+    filters: Optional[StationFilter] = Depends(station_filter),
+):
+    """
+    Search for the charging stations closest to a position.
+
+    Args:
+        lat (float): Latitude of the position.
+        lon (float): Longitude of the position.
+        radius (float): The maximum distance in meters (default: 1000).
+        limit (int): The maximum number of stations to return (default: 20).
+        filters (Optional[StationFilter]): The `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
+
+    Returns:
+        dict: The stations sorted by distance, each with numeric `location` coordinates and
+              its distance in meters.
+    """
+    try:
+        stations = await station_management.search_nearby(lat, lon, radius, limit, filters)
+        return FastJSONResponse({
+            "stations": [station_to_row(station) for station in stations],
+            "stations_found": len(stations),
+        })
+    except InvalidCoordinatesException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.get("/stations/nearest", tags=["Charging Stations"])
+async def search_nearest_stations(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    k: int = Query(5, ge=1, le=MAX_NEARBY_LIMIT),
+    filters: Optional[StationFilter] = Depends(station_filter),
+):
+    """
+    Search for the `k` charging stations closest to a position, however far away they are.
+
+    Args:
+        lat (float): Latitude of the position.
+        lon (float): Longitude of the position.
+        k (int): The number of stations to return (default: 5).
+        filters (Optional[StationFilter]): The `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
+
+    Returns:
+        dict: The stations sorted by distance, each with numeric `location` coordinates and
+              its distance in meters.
+    """
+    try:
+        stations = await station_management.search_nearest(lat, lon, k, filters)
+        return FastJSONResponse({
+            "stations": [station_to_row(station) for station in stations],
+            "stations_found": len(stations),
+        })
+    except InvalidCoordinatesException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.get("/stations/bbox", tags=["Charging Stations"])
+async def search_stations_in_bbox(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    limit: int = Query(DEFAULT_VIEWPORT_LIMIT, ge=1, le=MAX_VIEWPORT_LIMIT),
+    cluster: bool = False,
+    grid: int = Query(16, ge=2, le=MAX_CLUSTER_GRID),
+    filters: Optional[StationFilter] = Depends(station_filter),
+):
+    """
+    Search for the charging stations within a map viewport.
+
+    Args:
+        min_lat (float): Southern edge of the viewport.
+        min_lon (float): Western edge of the viewport.
+        max_lat (float): Northern edge of the viewport.
+        max_lon (float): Eastern edge of the viewport.
+        limit (int): The maximum number of stations to return (default: 500).
+        cluster (bool): Return per-cell counts instead of stations if the viewport holds more than `limit`.
+        grid (int): The number of cluster cells per axis (default: 16).
+        filters (Optional[StationFilter]): The `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
+
+    Returns:
+        dict: Either `mode` "stations" with up to `limit` stations, or `mode` "clusters" with one
+              entry per non-empty grid cell. `truncated` tells whether the viewport held more stations.
+    """
+    try:
+        result = await station_management.search_in_bbox(
+            min_lon, min_lat, max_lon, max_lat, limit, cluster, grid, filters
+        )
+        return FastJSONResponse({
+            "mode": "clusters" if result.clusters else "stations",
+            "stations": result.stations,
+            "clusters": result.clusters,
+            "stations_found": len(result.stations) or sum(cell["count"] for cell in result.clusters),
+            "truncated": result.truncated,
+        })
+    except InvalidCoordinatesException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@app.get("/stations/clusters", tags=["Charging Stations"])
+async def search_station_clusters(
+    zoom: int = Query(..., ge=0, le=CLUSTER_MAX_ZOOM),
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+):
+    """
+    Get the marker clusters within a map viewport at a zoom level.
+
+    The clusters are precomputed per zoom level by the station import. Beyond the highest
+    cluster zoom level, single stations are served by `/stations/bbox`.
+
+    Args:
+        zoom (int): The map zoom level.
+        min_lat (float): Southern edge of the viewport.
+        min_lon (float): Western edge of the viewport.
+        max_lat (float): Northern edge of the viewport.
+        max_lon (float): Eastern edge of the viewport.
+
+    Returns:
+        dict: The clusters with their station count and mean position, and the number of
+              stations they hold.
+    """
+    try:
+        clusters = await station_management.search_clusters(min_lon, min_lat, max_lon, max_lat, zoom)
+        return FastJSONResponse({
+            "zoom": zoom,
+            "clusters": clusters,
+            "stations_found": sum(cluster["count"] for cluster in clusters),
+        })
+    except InvalidCoordinatesException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
 @app.post("/stations/{station_id}/rate", tags=["Charging Stations"])
 async def rate_station(
     station_id: str,
@@ -152,6 +712,7 @@ async def rate_station(
 async def rate_station(
     station_id: str,
     user_id: Optional[str] = None,
+    state: Optional[str] = Query(None, pattern="^(occupied|free)$"),
     current_user=Depends(user_repository.get_user_by_id)
 ):
     """
@@ -160,10 +721,11 @@ async def rate_station(
     Args:
         station_id (str): ID of the charging station.
         user_id (Optional[str]): User ID, defaults to None.
+        state (Optional[str]): The reported state, "occupied" or "free"; without it the status is toggled.
         current_user: Authenticated user session.
     
     Returns:
-        dict: A confirmation message.
+        dict: A confirmation message and the stored availability status after the update.
     """
 
     if not current_user:
@@ -171,13 +733,128 @@ async def rate_station(
 
     user_id = user_id or str(current_user["_id"])  
     try:
-        station_management = StationSearchManagement()
-        update_result = await station_management.update_availability_status(station_id)
-        return {"message": "Availability changed successfully", "availability_status": update_result}
+        update_result = await station_management.update_availability_status(station_id, state)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if update_result is None:
+        raise HTTPException(status_code=404, detail="Station not found")
+    availability_log.record(update_result, reporter=user_id)
+    if not availability_broadcaster.watching:
+        availability_broadcaster.publish(update_result)
+    return {"message": "Availability changed successfully", "availability_status": update_result.availability_status}
+
+
+@app.post("/stations/availability/bulk", tags=["Charging Stations"])
+async def bulk_update_availability(
+    request: Request,
+    current_user=Depends(user_repository.get_user_by_id)
+):
+    """
+    Apply a batch of availability reports, e.g. an operator feed, with one bulk write.
+
+    The body is a JSON array, or newline-delimited JSON with `Content-Type: application/x-ndjson`,
+    of up to 10,000 objects with a `station_id` and a `state` ("free" or "occupied").
+    
+    Args:
+        request (Request): The request with the reports as its body.
+        current_user: Authenticated user session.
+    
+    Returns:
+        dict: The number of received, updated and failed reports and one result per report with
+              its `index`, `station_id` and `status`.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="User not authenticated")
+
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            items = loads_lines(body)
+        else:
+            items = loads(body)
+            if not isinstance(items, list):
+                raise ValueError("The body must be a JSON array of updates")
+        result = await station_management.bulk_update_availability(items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    reporter = str(current_user["_id"])
+    for change in result.changes:
+        availability_log.record(change, reporter=reporter)
+        if not availability_broadcaster.watching:
+            availability_broadcaster.publish(change)
+    return FastJSONResponse({
+        "received": len(result.results),
+        "updated": len(result.changes),
+        "failed": sum(item["status"] not in ("updated", "unchanged", "superseded") for item in result.results),
+        "results": result.results,
+    })
+
+@app.get("/stations/{station_id}/occupancy", tags=["Charging Stations"])
+async def get_station_occupancy(
+    station_id: str,
+    granularity: str = Query("hour", pattern="^(hour|day)$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """
+    Get the occupancy of a charging station per hour or day.
+
+    Args:
+        station_id (str): ID of the charging station.
+        granularity (str): "hour" (default) or "day".
+        start (Optional[datetime]): Start of the window (default: one day, or 30 days, before `end`).
+        end (Optional[datetime]): End of the window (default: the end of the current hour or day).
+
+    Returns:
+        dict: One bucket per hour or day with availability reports, each with its occupied and
+              observed seconds, `occupancy` ratio, number of reports and changes.
+    """
+    try:
+        start, end = occupancy_repository.window(granularity, start, end)
+        buckets = await occupancy_repository.station_occupancy(station_id, granularity, start, end)
+        return FastJSONResponse({
+            "station_id": station_id,
+            "granularity": granularity,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "buckets": buckets,
+        })
+    except InvalidOccupancyQueryException as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@app.get("/stations/{station_id}/forecast", tags=["Charging Stations"])
+async def get_station_forecast(
+    station_id: str,
+    hours: int = Query(24, ge=1, le=MAX_FORECAST_HOURS),
+    start: Optional[datetime] = None,
+):
+    """
+    Forecast the occupancy of a charging station per hour from its weekly availability history.
+
+    Args:
+        station_id (str): ID of the charging station.
+        hours (int): Number of hours to forecast (default 24, at most one week).
+        start (Optional[datetime]): First hour to forecast (default: the current hour).
+
+    Returns:
+        dict: The forecast `occupancy` and `free_probability` of each hour, with the hours of
+              history observed at that hour of the week.
+    """
+    if start is not None and start.tzinfo is not None:
+        start = start.astimezone().replace(tzinfo=None)
+    forecast = occupancy_forecast.forecast(station_id, start or datetime.now(), hours)
+    if forecast is None:
+        raise HTTPException(status_code=404, detail="No availability history for this station")
+    return FastJSONResponse({"station_id": station_id, "hours": forecast})
 
 
 @app.get("/stations/{station_id}/ratings", tags=["Charging Stations"])
@@ -0,0 +1,207 @@
+import asyncio
+import bisect
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from backend.db.mongo_client import station_collection, import_collection
+
+# Suggestion types, in the order their fields are read from a station document.
+SUGGESTION_FIELDS = (
+    ("postal_code", ("postal_code",)),
+    ("name", ("name",)),
+    ("provider", ("metadata", "provider")),
+    ("street", ("metadata", "street")),
+)
+# Defaults the register import writes for missing values; they are not worth suggesting.
+PLACEHOLDER_VALUES = {"Unknown Name", "Unknown Provider", "Unknown Street"}
+MAX_SUGGESTIONS = 20
+# Prefixes matching more keys than this are ranked when the index is built instead of per request.
+PRECOMPUTED_RANGE = 256
+
+_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_text(text: str) -> str:
+    """Case-folds text, strips diacritics and collapses everything but letters and digits to single spaces."""
+    decomposed = unicodedata.normalize("NFKD", str(text).casefold())
+    ascii_text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _SEPARATORS.sub(" ", ascii_text).strip()
+
+
+def _field(document: dict, path: Tuple[str, ...]):
+    for key in path:
+        document = document.get(key) if isinstance(document, dict) else None
+    return document
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index over suggestion values.
+
+    Every value is indexed under its normalized text and under the text starting at each of
+    its later words, so "marx" finds "Karl-Marx-Allee". A query is answered by bisecting the
+    sorted keys to the range sharing its prefix and ranking the range by a precomputed score;
+    prefixes matching more than `PRECOMPUTED_RANGE` keys are ranked once when the index is built.
+    """
+    def __init__(self, counts: Dict[Tuple[str, str], int]):
+        self._suggestions = [
+            {"type": kind, "value": value, "stations": count} for (kind, value), count in counts.items()
+        ]
+        normalized = [normalize_text(suggestion["value"]) for suggestion in self._suggestions]
+        # Suggestions ordered by station count, then alphabetically; a key scores its suggestion's
+        # place in that order, plus a penalty if it starts at a later word of the value.
+        self._order = np.array(
+            sorted(range(len(normalized)), key=lambda i: (-self._suggestions[i]["stations"], normalized[i])),
+            dtype=np.int64,
+        )
+        rank = np.empty(len(self._order), dtype=np.int64)
+        rank[self._order] = np.arange(len(self._order))
+        keys = sorted(
+            (key, rank[position] + (len(normalized) if offset else 0))
+            for position, text in enumerate(normalized)
+            for offset, key in self._word_suffixes(text)
+        )
+        self._keys = [key for key, _ in keys]
+        self._scores = np.array([score for _, score in keys], dtype=np.int64)
+        self._precomputed = self._precompute()
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[dict]) -> "PrefixIndex":
+        """Builds the index from station documents, counting the stations per suggestion."""
+        counts = Counter()
+        for document in documents:
+            for kind, path in SUGGESTION_FIELDS:
+                value = _field(document, path)
+                if value is not None and str(value).strip() and value not in PLACEHOLDER_VALUES:
+                    counts[(kind, str(value).strip())] += 1
+        return cls(counts)
+
+    @staticmethod
+    def _word_suffixes(text: str) -> List[Tuple[int, str]]:
+        if not text:
+            return []
+        return [(0, text)] + [(match.end(), text[match.end():]) for match in re.finditer(" ", text)]
+
+    def __len__(self):
+        return len(self._suggestions)
+
+    def _range(self, prefix: str, start: int = 0, end: int = None) -> Tuple[int, int]:
+        end = len(self._keys) if end is None else end
+        start = bisect.bisect_left(self._keys, prefix, start, end)
+        return start, bisect.bisect_left(self._keys, prefix + "\x7f", start, end)
+
+    def _rank(self, start: int, end: int, limit: int) -> List[dict]:
+        ranked, seen = [], set()
+        for score in np.unique(self._scores[start:end]).tolist():
+            position = int(self._order[score % len(self._order)])
+            if position not in seen:
+                seen.add(position)
+                ranked.append(self._suggestions[position])
+                if len(ranked) == limit:
+                    break
+        return ranked
+
+    def _precompute(self) -> Dict[str, List[dict]]:
+        """Ranks every prefix matching more than `PRECOMPUTED_RANGE` keys, one prefix length at a time."""
+        precomputed = {}
+        large = [("", 0, len(self._keys))]
+        while large:
+            children = []
+            for prefix, start, end in large:
+                position = start
+                while position < end:
+                    key = self._keys[position]
+                    if len(key) <= len(prefix):
+                        position += 1
+                        continue
+                    child = key[:len(prefix) + 1]
+                    child_start, child_end = self._range(child, position, end)
+                    if child_end - child_start > PRECOMPUTED_RANGE:
+                        precomputed[child] = self._rank(child_start, child_end, MAX_SUGGESTIONS)
+                        children.append((child, child_start, child_end))
+                    position = child_end
+            large = children
+        return precomputed
+
+    def complete(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Suggests values starting with the query, or with a word starting with it.
+
+        Values starting with the query come first, then values with more stations.
+        """
+        prefix = normalize_text(query)
+        if not prefix:
+            return []
+        limit = min(limit, MAX_SUGGESTIONS)
+        if prefix in self._precomputed:
+            return self._precomputed[prefix][:limit]
+        return self._rank(*self._range(prefix), limit)
+
+
+class StationAutocomplete:
+    """
+    Autocompletion of postal codes, station names, providers and streets.
+
+    The prefix index is built from `station_collection` and rebuilt whenever the register
+    import records a newer completed import.
+    """
+    def __init__(self):
+        self.index = PrefixIndex({})
+        self.loaded = False
+        self.import_completed_at = None
+        self._lock = asyncio.Lock()
+
+    async def _latest_import(self):
+        state = await import_collection.find_one({"_id": "charging_stations"}, {"completed_at": 1})
+        return state.get("completed_at") if state else None
+
+    async def load(self):
+        """
+        Load (or rebuild) the prefix index from MongoDB.
+
+        Returns:
+            int: The number of suggestions, or 0 if MongoDB could not be queried.
+        """
+        try:
+            completed_at = await self._latest_import()
+            projection = {"_id": 0, "postal_code": 1, "name": 1, "metadata.provider": 1, "metadata.street": 1}
+            documents = await station_collection.find({}, projection).to_list(None)
+            self.index = PrefixIndex.from_documents(documents)
+            self.loaded, self.import_completed_at = True, completed_at
+            return len(self.index)
+        except Exception as e:
+            print(f"Error loading autocomplete index: {e}")
+            return 0
+
+    async def complete(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Suggest values for a partial query, loading the index on first use.
+
+        Args:
+            query (str): The partial postal code, name, provider or street.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            List[dict]: Suggestions with their `type`, `value` and number of `stations`.
+        """
+        if not self.loaded:
+            async with self._lock:
+                if not self.loaded:
+                    await self.load()
+        return self.index.complete(query, limit)
+
+    async def keep_current(self, refresh_seconds: float):
+        """Rebuild the index after each import, checking for a new import every `refresh_seconds`."""
+        if not self.loaded:
+            await self.load()
+        while True:
+            await asyncio.sleep(refresh_seconds)
+            try:
+                completed_at = await self._latest_import()
+            except Exception as e:
+                print(f"Error checking for a new import: {e}")
+                continue
+            if completed_at is not None and completed_at != self.import_completed_at:
+                await self.load()
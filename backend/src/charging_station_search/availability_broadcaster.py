@@ -0,0 +1,157 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+from backend.db.mongo_client import station_collection
+from backend.src.charging_station_search.charging_station_search_service import AvailabilityChanged
+
+# Stations plus postal codes one subscriber may follow.
+MAX_STREAM_SUBSCRIPTIONS = 500
+# Milliseconds an EventSource waits before reconnecting after the stream was interrupted.
+STREAM_RECONNECT_MS = 3000
+
+# Change stream events that update the availability status of a station.
+AVAILABILITY_CHANGE_PIPELINE = [
+    {"$match": {
+        "operationType": "update",
+        "updateDescription.updatedFields.availability_status": {"$exists": True},
+    }},
+]
+
+
+class AvailabilitySubscription:
+    """
+    The availability changes of a set of stations and postal codes, queued for one subscriber.
+
+    The queue is bounded: a subscriber that falls behind loses its oldest changes, which
+    are counted in `dropped`, instead of holding back the other subscribers.
+    """
+    def __init__(self, station_ids: Iterable[str], postal_codes: Iterable[str], queue_size: int):
+        self.station_ids = frozenset(station_ids)
+        self.postal_codes = frozenset(postal_codes)
+        self.queue = asyncio.Queue(queue_size)
+        self.dropped = 0
+
+    def put(self, change: dict):
+        """Queues a change, dropping the oldest queued change if the queue is full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(change)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Waits up to `timeout` seconds for the next change; returns None if none arrived."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class AvailabilityBroadcaster:
+    """
+    Fans availability changes out to the subscribers of the changed station or its postal code.
+
+    Subscribers are indexed by station ID and postal code, so a change only touches the
+    subscriptions it concerns and idle subscribers cost nothing but their queue. Changes are
+    fed by the availability endpoint through `publish`, or, where MongoDB offers change
+    streams, by `follow_changes`, which then also sees updates made by other processes.
+    """
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.watching = False
+        self._by_station: Dict[str, Set[AvailabilitySubscription]] = defaultdict(set)
+        self._by_postal_code: Dict[str, Set[AvailabilitySubscription]] = defaultdict(set)
+        self._subscriptions: Set[AvailabilitySubscription] = set()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self, station_ids: Iterable[str] = (), postal_codes: Iterable[str] = ()) -> AvailabilitySubscription:
+        """Registers a subscriber for the changes of the given stations and postal codes."""
+        subscription = AvailabilitySubscription(station_ids, postal_codes, self.queue_size)
+        for station_id in subscription.station_ids:
+            self._by_station[station_id].add(subscription)
+        for postal_code in subscription.postal_codes:
+            self._by_postal_code[postal_code].add(subscription)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: AvailabilitySubscription):
+        """Removes a subscriber; unknown subscriptions are ignored."""
+        for keys, index in ((subscription.station_ids, self._by_station),
+                            (subscription.postal_codes, self._by_postal_code)):
+            for key in keys:
+                subscribers = index.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del index[key]
+        self._subscriptions.discard(subscription)
+
+    def publish(self, change: AvailabilityChanged) -> int:
+        """
+        Queues a change for every subscriber of its station or postal code.
+
+        Returns:
+            int: The number of subscribers the change was queued for.
+        """
+        subscribers = self._by_station.get(change.station_id, set()) | self._by_postal_code.get(change.postal_code, set())
+        if subscribers:
+            payload = change.to_dict()
+            for subscription in subscribers:
+                subscription.put(payload)
+        return len(subscribers)
+
+    def publish_change_event(self, event: dict) -> int:
+        """Publishes a change stream update event of `station_collection`."""
+        document = event.get("fullDocument") or {}
+        status = event.get("updateDescription", {}).get("updatedFields", {}).get("availability_status")
+        if status is None:
+            return 0
+        return self.publish(AvailabilityChanged(
+            station_id=str(event["documentKey"]["_id"]),
+            postal_code=document.get("postal_code"),
+            availability_status=status,
+            timestamp=datetime.now(),
+        ))
+
+    async def stream(self, subscription: AvailabilitySubscription, keepalive_seconds: float) -> AsyncIterator[str]:
+        """
+        Yields a subscription's changes as Server-Sent Events until the client disconnects.
+
+        Each change is an `availability` event with the change as JSON data; a comment is sent
+        after `keepalive_seconds` without changes so proxies keep the connection open. The
+        subscription is removed when the stream is closed.
+        """
+        try:
+            yield f"retry: {STREAM_RECONNECT_MS}\n: subscribed\n\n"
+            while True:
+                change = await subscription.get(keepalive_seconds)
+                if change is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: availability\ndata: {json.dumps(change)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    async def follow_changes(self, retry_seconds: float):
+        """
+        Publish the availability changes from the change stream of `station_collection`.
+
+        While the stream is open `watching` is set and the availability endpoint leaves the
+        publishing to this task. Servers without change streams (standalone deployments) are
+        retried every `retry_seconds`; meanwhile the endpoint publishes its own updates.
+        """
+        while True:
+            try:
+                async with station_collection.watch(AVAILABILITY_CHANGE_PIPELINE,
+                                                    full_document="updateLookup") as stream:
+                    self.watching = True
+                    async for event in stream:
+                        self.publish_change_event(event)
+            except Exception as e:
+                print(f"Availability change stream unavailable, retrying in {retry_seconds}s: {e}")
+            finally:
+                self.watching = False
+            await asyncio.sleep(retry_seconds)
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from backend.db.mongo_client import availability_rollup_collection
+
+HOURS_PER_WEEK = 7 * 24
+MAX_FORECAST_HOURS = HOURS_PER_WEEK
+# Observed hours after which an hour of the week is forecast from its own history rather
+# than from the station's weekly mean; sparsely observed hours are blended towards the mean.
+FORECAST_PRIOR_HOURS = 2.0
+# Hourly rollups read per round trip when the profiles are built.
+ROLLUP_LOAD_BATCH_SIZE = 50_000
+
+
+def hour_of_week(starts) -> np.ndarray:
+    """Hour of the week (0 = Monday 00:00 ... 167 = Sunday 23:00) of each timestamp."""
+    starts = np.asarray(starts, dtype="datetime64[h]")
+    days = starts.astype("datetime64[D]")
+    # 1970-01-01, day 0 of datetime64, was a Thursday.
+    weekdays = (days.astype(np.int64) + 3) % 7
+    return weekdays * 24 + (starts - days).astype(np.int64)
+
+
+class OccupancyForecast:
+    """
+    Seasonal hour-of-week occupancy profiles of the stations, for forecasting availability.
+
+    Every station has 168 bins, one per hour of the week, summing the occupied and observed
+    seconds of the hourly availability rollups that fall into them. The forecast occupancy of
+    each bin is precomputed into a table, so a forecast is a lookup of consecutive bins.
+    `load` builds the profiles from the rollups once; afterwards the event log passes the
+    increments of each flush to `apply_increments`, which updates only the bins they touch.
+    """
+    def __init__(self, prior_hours: float = FORECAST_PRIOR_HOURS):
+        self.prior_seconds = prior_hours * 3600
+        self.loaded = False
+        self._rows: Dict[str, int] = {}
+        self._occupied = np.zeros((0, HOURS_PER_WEEK))
+        self._observed = np.zeros((0, HOURS_PER_WEEK))
+        self._table = np.zeros((0, HOURS_PER_WEEK))
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, station_id):
+        return station_id in self._rows
+
+    def _row_indexes(self, station_ids: np.ndarray) -> np.ndarray:
+        """Maps station IDs to profile rows, adding rows for new stations."""
+        unique_ids, inverse = np.unique(station_ids, return_inverse=True)
+        for station_id in unique_ids:
+            self._rows.setdefault(station_id, len(self._rows))
+        if len(self._rows) > len(self._occupied):
+            extra = max(len(self._rows), 2 * len(self._occupied)) - len(self._occupied)
+            self._occupied, self._observed, self._table = (
+                np.vstack([array, np.zeros((extra, HOURS_PER_WEEK))])
+                for array in (self._occupied, self._observed, self._table)
+            )
+        return np.array([self._rows[station_id] for station_id in unique_ids], dtype=np.int64)[inverse]
+
+    def _recompute(self, rows: np.ndarray):
+        """Refreshes the forecast table of the given rows."""
+        occupied, observed = self._occupied[rows], self._observed[rows]
+        totals = observed.sum(axis=1, keepdims=True)
+        weekly_mean = np.divide(occupied.sum(axis=1, keepdims=True), totals,
+                                out=np.zeros_like(totals), where=totals > 0)
+        weights = observed + self.prior_seconds
+        self._table[rows] = np.divide(occupied + self.prior_seconds * weekly_mean, weights,
+                                      out=np.broadcast_to(weekly_mean, weights.shape).copy(), where=weights > 0)
+
+    def add(self, station_ids: Iterable[str], starts, occupied_seconds, observed_seconds):
+        """
+        Add hourly occupancy to the profiles.
+
+        Args:
+            station_ids (Iterable[str]): Station ID of each hour.
+            starts: Start of each hour (datetimes or datetime64).
+            occupied_seconds: Seconds the station was occupied in each hour.
+            observed_seconds: Seconds the station's state was known in each hour.
+        """
+        station_ids = np.asarray(list(station_ids), dtype=object)
+        if not len(station_ids):
+            return
+        rows = self._row_indexes(station_ids)
+        bins = hour_of_week(starts)
+        np.add.at(self._occupied, (rows, bins), np.asarray(occupied_seconds, dtype=float))
+        np.add.at(self._observed, (rows, bins), np.asarray(observed_seconds, dtype=float))
+        self._recompute(np.unique(rows))
+
+    def apply_increments(self, increments: Dict[tuple, dict]):
+        """Adds the hourly rollup increments of an event log flush to the profiles."""
+        hourly = [(station_id, start, counts) for (station_id, granularity, start), counts in increments.items()
+                  if granularity == "hour"]
+        if hourly:
+            station_ids, starts, counts = zip(*hourly)
+            self.add(station_ids, starts, [c["occupied_seconds"] for c in counts],
+                     [c["observed_seconds"] for c in counts])
+
+    async def load(self):
+        """
+        Build the profiles from the hourly rollups in `availability_rollup_collection`.
+
+        The new profiles replace the current ones only once they are complete; if MongoDB
+        cannot be read the current profiles are kept.
+        """
+        profiles = OccupancyForecast()
+        profiles.prior_seconds = self.prior_seconds
+        projection = {"_id": 0, "station_id": 1, "start": 1, "occupied_seconds": 1, "observed_seconds": 1}
+        try:
+            cursor = availability_rollup_collection.find({"granularity": "hour"}, projection)
+            while True:
+                rollups = await cursor.to_list(ROLLUP_LOAD_BATCH_SIZE)
+                if not rollups:
+                    break
+                profiles.add([rollup["station_id"] for rollup in rollups],
+                             np.array([rollup["start"] for rollup in rollups], dtype="datetime64[h]"),
+                             [rollup["occupied_seconds"] for rollup in rollups],
+                             [rollup["observed_seconds"] for rollup in rollups])
+        except Exception as e:
+            print(f"Error loading occupancy profiles: {e}")
+            return
+        self._rows, self._occupied, self._observed, self._table = (
+            profiles._rows, profiles._occupied, profiles._observed, profiles._table
+        )
+        self.loaded = True
+
+    def forecast(self, station_id: str, start: datetime, hours: int = 24) -> Optional[List[dict]]:
+        """
+        Forecast the occupancy of a station for the hours from `start`.
+
+        Args:
+            station_id (str): The ID of the charging station.
+            start (datetime): The first hour to forecast, in local time.
+            hours (int): The number of hours to forecast (at most one week).
+
+        Returns:
+            Optional[List[dict]]: The `start`, forecast `occupancy`, `free_probability` and
+                                  `observed_hours` of each hour, or None if the station has
+                                  no observed availability history.
+        """
+        row = self._rows.get(station_id)
+        if row is None or not self._observed[row].any():
+            return None
+        start = start.replace(minute=0, second=0, microsecond=0)
+        bins = (hour_of_week([start])[0] + np.arange(min(hours, MAX_FORECAST_HOURS))) % HOURS_PER_WEEK
+        occupancy, observed = self._table[row, bins], self._observed[row, bins] / 3600
+        return [
+            {
+                "start": (start + timedelta(hours=offset)).isoformat(),
+                "occupancy": round(float(occupancy[offset]), 4),
+                "free_probability": round(1 - float(occupancy[offset]), 4),
+                "observed_hours": round(float(observed[offset]), 2),
+            }
+            for offset in range(len(bins))
+        ]
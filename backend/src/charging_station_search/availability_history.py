@@ -0,0 +1,370 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, CollectionInvalid
+from backend.db.mongo_client import db, availability_event_collection, availability_rollup_collection
+from backend.src.charging_station_search.charging_station_search_service import AvailabilityChanged, PostalCode
+
+GRANULARITIES = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+# Window returned when a query gives no start: the last day of hours, the last month of days.
+DEFAULT_OCCUPANCY_WINDOW = {"hour": timedelta(days=1), "day": timedelta(days=30)}
+MAX_OCCUPANCY_BUCKETS = 24 * 31
+# A state is attributed to at most this long before the change that ends it; older time counts as unobserved.
+MAX_OBSERVATION_GAP = timedelta(days=7)
+# Batches kept queued while MongoDB is unreachable before the oldest events are dropped.
+MAX_PENDING_BATCHES = 100
+# Write error codes of a single event that may succeed when retried (network errors, elections,
+# shutdowns, timeouts); events failing with any other code, e.g. a validation failure, are dropped.
+RETRYABLE_WRITE_ERRORS = {6, 7, 89, 91, 189, 262, 9001, 10107, 11600, 11602, 13435, 13436}
+
+
+def bucket_start(timestamp: datetime, granularity: str) -> datetime:
+    """Returns the start of the hour or day containing `timestamp`."""
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def split_interval(start: datetime, end: datetime, granularity: str) -> List[Tuple[datetime, float]]:
+    """Splits the interval [start, end) into the seconds it spends in each hour or day."""
+    step = GRANULARITIES[granularity]
+    parts, bucket = [], bucket_start(start, granularity)
+    while bucket < end:
+        seconds = (min(end, bucket + step) - max(start, bucket)).total_seconds()
+        if seconds > 0:
+            parts.append((bucket, seconds))
+        bucket += step
+    return parts
+
+
+def rollup_increments(events: Iterable[dict], last_states: Dict[str, Tuple[bool, datetime]]) -> Dict[tuple, dict]:
+    """
+    Computes the rollup increments of a batch of availability events.
+
+    The time since a station's previous event is attributed to the hours and days it spans,
+    as occupied time if the station was occupied. `last_states` holds the state and time of
+    every station's latest known event and is advanced past the batch.
+
+    Args:
+        events (Iterable[dict]): Availability events ordered by timestamp.
+        last_states (dict): Station ID -> (availability_status, timestamp) of its previous event.
+
+    Returns:
+        dict: (station_id, granularity, start) -> increments of `occupied_seconds`,
+              `observed_seconds`, `reports` and `changes`, plus the station's `postal_code`.
+    """
+    increments = {}
+
+    def bucket(station_id, postal_code, granularity, start):
+        key = (station_id, granularity, start)
+        if key not in increments:
+            increments[key] = {"postal_code": postal_code, "occupied_seconds": 0.0, "observed_seconds": 0.0,
+                               "reports": 0, "changes": 0}
+        return increments[key]
+
+    for event in events:
+        station_id, postal_code = event["station"]["id"], event["station"]["postal_code"]
+        timestamp, status = event["timestamp"], event["availability_status"]
+        previous = last_states.get(station_id)
+        for granularity in GRANULARITIES:
+            counts = bucket(station_id, postal_code, granularity, bucket_start(timestamp, granularity))
+            counts["reports"] += 1
+            counts["changes"] += int(previous is not None and previous[0] != status)
+            if previous is None:
+                continue
+            observed_from = max(previous[1], timestamp - MAX_OBSERVATION_GAP)
+            for start, seconds in split_interval(observed_from, timestamp, granularity):
+                counts = bucket(station_id, postal_code, granularity, start)
+                counts["observed_seconds"] += seconds
+                if not previous[0]:
+                    counts["occupied_seconds"] += seconds
+        if previous is None or timestamp >= previous[1]:
+            last_states[station_id] = (status, timestamp)
+    return increments
+
+
+def merge_increments(target: Dict[tuple, dict], increments: Dict[tuple, dict]):
+    """Adds rollup increments to `target`, summing the counts of buckets present in both."""
+    for key, counts in increments.items():
+        if key not in target:
+            target[key] = dict(counts)
+            continue
+        for field, value in counts.items():
+            if field != "postal_code":
+                target[key][field] += value
+
+
+def failed_indexes(error: BulkWriteError) -> Dict[int, Optional[int]]:
+    """Returns the error code of every operation of an unordered bulk write that failed, by index."""
+    return {write_error["index"]: write_error.get("code") for write_error in error.details.get("writeErrors", [])}
+
+
+async def ensure_availability_collections():
+    """Creates the availability event time series and the indexes of the event and rollup collections."""
+    try:
+        await db.create_collection(
+            availability_event_collection.name,
+            timeseries={"timeField": "timestamp", "metaField": "station", "granularity": "minutes"},
+        )
+    except CollectionInvalid:
+        pass
+    await availability_event_collection.create_index([("station.id", ASCENDING), ("timestamp", ASCENDING)])
+    await availability_rollup_collection.create_index(
+        [("station_id", ASCENDING), ("granularity", ASCENDING), ("start", ASCENDING)], unique=True
+    )
+    await availability_rollup_collection.create_index(
+        [("postal_code", ASCENDING), ("granularity", ASCENDING), ("start", ASCENDING)]
+    )
+
+
+class AvailabilityEventLog:
+    """
+    Append-only log of availability changes with hourly and daily occupancy rollups.
+
+    `record` only queues an event, so the availability endpoint never waits for the log.
+    The queued events are written by `run` in batches to the `availability_events` time
+    series, and each batch increments the per-station rollups the occupancy queries read.
+    Events that could not be written stay queued, unless their write error is permanent;
+    rollup increments that could not be written are retried with the next batch. Rollups
+    follow the written events in timestamp order, so an event that has to be retried holds
+    back the rollups of the events after it until it is written.
+    The `rollup_listeners` are called with the increments of every batch whose rollups were
+    written, so that derived data (e.g. the occupancy forecast) can follow them.
+    """
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self.rollup_listeners: List[Callable[[Dict[tuple, dict]], None]] = []
+        self.written = 0
+        self.dropped = 0
+        self._pending: List[dict] = []
+        self._last_states: Dict[str, Tuple[bool, datetime]] = {}
+        self._pending_rollups: Dict[tuple, dict] = {}
+        self._unrolled: List[dict] = []
+        self._batch_ready = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def record(self, change: AvailabilityChanged, reporter: Optional[str] = None):
+        """Queues an availability change reported by `reporter`."""
+        self._pending.append({
+            "timestamp": change.timestamp,
+            "station": {"id": change.station_id, "postal_code": change.postal_code},
+            "availability_status": change.availability_status,
+            "reporter": reporter,
+        })
+        if len(self._pending) > self.batch_size * MAX_PENDING_BATCHES:
+            del self._pending[:self.batch_size]
+            self.dropped += self.batch_size
+        if len(self._pending) >= self.batch_size:
+            self._batch_ready.set()
+
+    async def _load_last_states(self, station_ids: List[str], before: datetime):
+        """Reads the latest logged event before `before` of stations seen for the first time."""
+        pipeline = [
+            {"$match": {"station.id": {"$in": station_ids}, "timestamp": {"$lt": before}}},
+            {"$sort": {"timestamp": -1}},
+            {"$group": {"_id": "$station.id", "availability_status": {"$first": "$availability_status"},
+                        "timestamp": {"$first": "$timestamp"}}},
+        ]
+        for state in await availability_event_collection.aggregate(pipeline).to_list(None):
+            self._last_states.setdefault(state["_id"], (state["availability_status"], state["timestamp"]))
+
+    async def _write_rollups(self, increments: Dict[tuple, dict]) -> Dict[tuple, dict]:
+        """Upserts rollup increments with one bulk write and returns the increments that failed."""
+        keys = list(increments)
+        try:
+            await availability_rollup_collection.bulk_write([
+                UpdateOne(
+                    {"station_id": station_id, "granularity": granularity, "start": start},
+                    {"$setOnInsert": {"postal_code": counts["postal_code"]},
+                     "$inc": {field: value for field, value in counts.items() if field != "postal_code"}},
+                    upsert=True,
+                )
+                for (station_id, granularity, start), counts in increments.items()
+            ], ordered=False)
+            return {}
+        except BulkWriteError as e:
+            failed = [keys[index] for index in sorted(failed_indexes(e))]
+            print(f"Error updating {len(failed)} availability rollups: {e}")
+        except Exception as e:
+            failed = keys
+            print(f"Error updating availability rollups: {e}")
+        return {key: increments[key] for key in failed}
+
+    async def flush(self) -> int:
+        """
+        Write the queued events and their rollup increments to MongoDB.
+
+        If an unordered insert fails part-way, only the events it did not write are queued
+        again, and only if their error is retryable; the others are dropped. Written events
+        at or after the earliest queued one are kept back and rolled up with it, so every
+        station's states are rolled up in order. The stations' last states advance past the
+        rolled up events once their increments are written or kept for the next flush.
+
+        If the insert fails without telling which events were written (e.g. a network timeout
+        after the server applied it), the whole batch is queued again. The retry may then
+        duplicate events in the time series, which only affects reads of single events;
+        rollups are computed after a successful insert and count every event once.
+
+        Returns:
+            int: The number of events written; 0 if there were none or the write failed, in
+                 which case the events stay queued for the next flush.
+        """
+        async with self._lock:
+            events, self._pending = sorted(self._pending, key=lambda event: event["timestamp"]), []
+            if not events and not self._unrolled and not self._pending_rollups:
+                return 0
+            retried = []
+            try:
+                waiting = events + self._unrolled
+                unknown = list({event["station"]["id"] for event in waiting} - set(self._last_states))
+                if unknown:
+                    await self._load_last_states(unknown, min(event["timestamp"] for event in waiting))
+                if events:
+                    await availability_event_collection.insert_many(events, ordered=False)
+            except BulkWriteError as e:
+                errors = failed_indexes(e)
+                retried = [events[index] for index, code in sorted(errors.items()) if code in RETRYABLE_WRITE_ERRORS]
+                self.dropped += len(errors) - len(retried)
+                print(f"Error writing {len(errors)} availability events, {len(retried)} queued again: {e}")
+                self._pending = retried + self._pending
+                events = [event for index, event in enumerate(events) if index not in errors]
+            except Exception as e:
+                print(f"Error writing availability events: {e}")
+                self._pending = events + self._pending
+                return 0
+            unrolled = sorted(self._unrolled + events, key=lambda event: event["timestamp"])
+            if retried:
+                ready = [event for event in unrolled if event["timestamp"] < retried[0]["timestamp"]]
+            else:
+                ready = unrolled
+            self._unrolled = unrolled[len(ready):]
+            last_states = dict(self._last_states)
+            increments = self._pending_rollups
+            merge_increments(increments, rollup_increments(ready, last_states))
+            self._pending_rollups = await self._write_rollups(increments) if increments else {}
+            self._last_states = last_states
+            written = {key: counts for key, counts in increments.items() if key not in self._pending_rollups}
+            if written:
+                for listener in self.rollup_listeners:
+                    listener(written)
+            self.written += len(events)
+            return len(events)
+
+    async def run(self, flush_seconds: float):
+        """Write the queued events every `flush_seconds`, or as soon as a full batch is queued."""
+        try:
+            await ensure_availability_collections()
+        except Exception as e:
+            print(f"Error creating availability collections: {e}")
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+
+class OccupancyRepository:
+    """
+    Reads the hourly and daily occupancy rollups of stations and postal codes.
+    """
+    @staticmethod
+    def _to_bucket(rollup: dict) -> dict:
+        observed = rollup["observed_seconds"]
+        return {
+            "start": rollup["start"].isoformat(),
+            "occupied_seconds": rollup["occupied_seconds"],
+            "observed_seconds": observed,
+            "occupancy": rollup["occupied_seconds"] / observed if observed else None,
+            "reports": rollup["reports"],
+            "changes": rollup["changes"],
+        }
+
+    @staticmethod
+    def window(granularity: str, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """
+        Validate an occupancy query and fill in its default window.
+
+        Returns:
+            tuple: The (start, end) of the window, aligned to whole hours or days.
+
+        Raises:
+            InvalidOccupancyQueryException: If the granularity is unknown or the window is
+                                            empty or spans too many buckets.
+        """
+        if granularity not in GRANULARITIES:
+            raise InvalidOccupancyQueryException(f"Granularity must be one of: {', '.join(GRANULARITIES)}")
+        # Events are logged in naive local time; aware bounds are converted to it.
+        start, end = (bound.astimezone().replace(tzinfo=None) if bound and bound.tzinfo else bound
+                      for bound in (start, end))
+        end = end or bucket_start(datetime.now(), granularity) + GRANULARITIES[granularity]
+        start = bucket_start(start or end - DEFAULT_OCCUPANCY_WINDOW[granularity], granularity)
+        if start >= end:
+            raise InvalidOccupancyQueryException("start must be before end")
+        if (end - start) / GRANULARITIES[granularity] > MAX_OCCUPANCY_BUCKETS:
+            raise InvalidOccupancyQueryException(f"At most {MAX_OCCUPANCY_BUCKETS} {granularity}s per query")
+        return start, end
+
+    async def station_occupancy(self, station_id: str, granularity: str, start: datetime, end: datetime) -> List[dict]:
+        """
+        Query the occupancy of a station per hour or day.
+
+        Args:
+            station_id (str): The ID of the charging station.
+            granularity (str): "hour" or "day".
+            start (datetime): Start of the first bucket.
+            end (datetime): End of the window (exclusive).
+
+        Returns:
+            List[dict]: One bucket per hour or day with reports, ordered by start, or an empty list if an error occurs.
+        """
+        try:
+            query = {"station_id": station_id, "granularity": granularity, "start": {"$gte": start, "$lt": end}}
+            rollups = await availability_rollup_collection.find(query).sort("start", ASCENDING).to_list(MAX_OCCUPANCY_BUCKETS)
+            return [self._to_bucket(rollup) for rollup in rollups]
+        except Exception as e:
+            print(f"Error querying occupancy of station {station_id}: {e}")
+            return []
+
+    async def postal_code_occupancy(self, postal_code: PostalCode, granularity: str, start: datetime,
+                                    end: datetime) -> List[dict]:
+        """
+        Query the combined occupancy of the stations of a postal code per hour or day.
+
+        Args:
+            postal_code (PostalCode): The postal code.
+            granularity (str): "hour" or "day".
+            start (datetime): Start of the first bucket.
+            end (datetime): End of the window (exclusive).
+
+        Returns:
+            List[dict]: One bucket per hour or day with reports, with the number of reporting
+                        `stations`, ordered by start, or an empty list if an error occurs.
+        """
+        pipeline = [
+            {"$match": {"postal_code": postal_code.value, "granularity": granularity,
+                        "start": {"$gte": start, "$lt": end}}},
+            {"$group": {"_id": "$start", "occupied_seconds": {"$sum": "$occupied_seconds"},
+                        "observed_seconds": {"$sum": "$observed_seconds"}, "reports": {"$sum": "$reports"},
+                        "changes": {"$sum": "$changes"}, "stations": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ]
+        try:
+            rollups = await availability_rollup_collection.aggregate(pipeline).to_list(MAX_OCCUPANCY_BUCKETS)
+            return [{**self._to_bucket({**rollup, "start": rollup["_id"]}), "stations": rollup["stations"]}
+                    for rollup in rollups]
+        except Exception as e:
+            print(f"Error querying occupancy of postal code {postal_code.value}: {e}")
+            return []
+
+
+class InvalidOccupancyQueryException (Exception):
+    """
+    Exception raised for invalid occupancy queries.
+    """
+    pass
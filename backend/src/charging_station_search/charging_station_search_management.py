@@ -1,12 +1,28 @@
 from bson import ObjectId
-from backend.src.charging_station_search.charging_station_search_service import SearchResult, StationRepository, StationSearchService
+from backend.src.charging_station_search.charging_station_search_service import (
+    BatchSearchResult, BulkAvailabilityResult, SearchResult, StationFilter, StationRepository, StationRowsResult,
+    StationSearchService, TextSearchResult, ViewportResult
+)
+from backend.src.charging_station_search.district_repository import DistrictRepository
+from backend.src.charging_station_search.cluster_repository import ClusterRepository
 
 class StationSearchManagement:
     """
     Handles the creation and management of charging station ratings.
     """
-    def __init__(self):
-        self.stationService = StationSearchService(repository=StationRepository())
+    def __init__(self, repository=None):
+        """
+        Initialize the management with a station repository.
+
+        Args:
+            repository: The repository to search, e.g. an `InMemoryStationRepository`
+                (default: a MongoDB `StationRepository`).
+        """
+        self.stationService = StationSearchService(
+            repository=repository or StationRepository(),
+            district_repository=DistrictRepository(),
+            cluster_repository=ClusterRepository(),
+        )
     
     async def search_by_postal_code(self, code: str) -> SearchResult:
         """
@@ -20,6 +36,146 @@ class StationSearchManagement:
         """
         return await self.stationService.search_by_postal_code(code)
     
+    async def search_rows_by_postal_code(self, code: str, page_size: int = None, cursor: str = None,
+                                         filters: StationFilter = None) -> StationRowsResult:
+        """
+        Search for charging stations by postal code, returning lean response rows.
+
+        Args:
+            code (str): The postal code to search for charging stations.
+            page_size (int): The maximum number of stations per page.
+            cursor (str): The `next_cursor` of the previous page.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            StationRowsResult: The rows of the page, the search event and the next cursor.
+        """
+        return await self.stationService.search_rows_by_postal_code(code, page_size, cursor, filters)
+
+    async def search_by_postal_codes(self, codes: list, filters: StationFilter = None) -> BatchSearchResult:
+        """
+        Search for the charging stations of several postal codes at once.
+
+        Args:
+            codes (list): The postal codes to search for.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            BatchSearchResult: The stations grouped by postal code and the search event.
+        """
+        return await self.stationService.search_by_postal_codes(codes, filters=filters)
+
+    async def search_by_district(self, district: str, filters: StationFilter = None) -> BatchSearchResult:
+        """
+        Search for the charging stations of all postal codes overlapping a district.
+
+        Args:
+            district (str): The district (Bezirk) name.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            BatchSearchResult: The stations grouped by postal code and the search event.
+        """
+        return await self.stationService.search_by_district(district, filters)
+
+    async def search_in_bbox(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float,
+                             limit: int = 500, cluster: bool = False, grid: int = 16,
+                             filters: StationFilter = None) -> ViewportResult:
+        """
+        Search for the charging stations within a map viewport.
+
+        Args:
+            min_lon (float): Western edge of the viewport.
+            min_lat (float): Southern edge of the viewport.
+            max_lon (float): Eastern edge of the viewport.
+            max_lat (float): Northern edge of the viewport.
+            limit (int): The maximum number of stations to return.
+            cluster (bool): Return grid clusters instead if the viewport holds more than `limit` stations.
+            grid (int): The number of cluster cells per axis.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            ViewportResult: The stations, or clusters, within the viewport.
+        """
+        return await self.stationService.search_in_bbox(min_lon, min_lat, max_lon, max_lat, limit, cluster, grid, filters)
+
+    async def search_clusters(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int):
+        """
+        Search for the marker clusters within a map viewport at a zoom level.
+
+        Args:
+            min_lon (float): Western edge of the viewport.
+            min_lat (float): Southern edge of the viewport.
+            max_lon (float): Eastern edge of the viewport.
+            max_lat (float): Northern edge of the viewport.
+            zoom (int): The map zoom level.
+
+        Returns:
+            List[dict]: One cluster per occupied cell with its station count and mean position.
+        """
+        return await self.stationService.search_clusters(min_lon, min_lat, max_lon, max_lat, zoom)
+
+    async def search_text(self, query: str, postal_code: str = None, filters: StationFilter = None,
+                          limit: int = 20) -> TextSearchResult:
+        """
+        Search for charging stations by free text, ranked by relevance.
+
+        Args:
+            query (str): Words to search for.
+            postal_code (str, optional): Only return stations with this postal code.
+            filters (StationFilter, optional): Only return stations matching these filters.
+            limit (int): The maximum number of stations to return.
+
+        Returns:
+            TextSearchResult: The matching stations, most relevant first.
+        """
+        return await self.stationService.search_text(query, postal_code, filters, limit)
+
+    async def station_facets(self, postal_code: str = None, filters: StationFilter = None) -> dict:
+        """
+        Count the charging stations per charging type, plug type and postal code.
+
+        Args:
+            postal_code (str, optional): Only count stations with this postal code.
+            filters (StationFilter, optional): Only count stations matching these filters.
+
+        Returns:
+            dict: The totals and the stations per charging type, plug type and postal code.
+        """
+        return await self.stationService.station_facets(postal_code, filters)
+
+    async def search_nearby(self, latitude: float, longitude: float, radius: float = 1000, limit: int = 20,
+                            filters: StationFilter = None):
+        """
+        Search for the charging stations closest to a position.
+
+        Args:
+            latitude (float): Latitude of the position.
+            longitude (float): Longitude of the position.
+            radius (float): The maximum distance in meters.
+            limit (int): The maximum number of stations to return.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            List[ChargingStation]: Matching stations sorted by distance.
+        """
+        return await self.stationService.search_nearby(latitude, longitude, radius, limit, filters)
+
+    async def search_nearest(self, latitude: float, longitude: float, k: int = 5, filters: StationFilter = None):
+        """
+        Search for the `k` charging stations closest to a position, however far away they are.
+
+        Args:
+            latitude (float): Latitude of the position.
+            longitude (float): Longitude of the position.
+            k (int): The number of stations to return.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            List[ChargingStation]: The closest stations sorted by distance.
+        """
+        return await self.stationService.search_nearest(latitude, longitude, k, filters)
+
     async def find_by_object_id(self, object_id: ObjectId):
         """
         Query MongoDB for charging stations by ObjectId.
@@ -32,13 +188,29 @@ class StationSearchManagement:
         """
         return await self.stationService.find_by_object_id(object_id)
 
-    async def update_availability_status(self, station_id: str):
+    async def update_availability_status(self, station_id: str, state: str = None):
         """
         Update the availability status of a charging station.
 
         Args:
             station_id (str): The unique identifier of the charging station.
+            state (str, optional): The reported state, "free" or "occupied", or None to toggle.
+
+        Returns:
+            AvailabilityChanged or None: The update event, or None if the station does not exist.
         """
-        return await self.stationService.update_availability_status(station_id)
+        return await self.stationService.update_availability_status(station_id, state)
+    
     
-    
\ No newline at end of file
+
+    async def bulk_update_availability(self, items: list) -> BulkAvailabilityResult:
+        """
+        Apply a batch of availability reports with one bulk write.
+
+        Args:
+            items (list): The reports, each with a `station_id` and a `state` ("free" or "occupied").
+
+        Returns:
+            BulkAvailabilityResult: One result per item and the applied changes.
+        """
+        return await self.stationService.bulk_update_availability(items)
@@ -1,8 +1,64 @@
+import base64
+import binascii
+import json
+import time
+from collections import OrderedDict
 from dataclasses import dataclass 
 from datetime import datetime
-from typing import List, Optional 
+from typing import Dict, List, Optional, Tuple
 from bson.objectid import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument, UpdateOne
 from backend.db.mongo_client import station_collection
+from backend.utilities.clustering import grid_cell_size
+from backend.utilities.ttl_cache import TTLCache
+from backend.config import TEXT_SEARCH_CACHE_SIZE, TEXT_SEARCH_CACHE_TTL
+
+MAX_NEARBY_RADIUS = 50_000
+MAX_NEARBY_LIMIT = 100
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+MAX_BATCH_POSTAL_CODES = 200
+DEFAULT_VIEWPORT_LIMIT = 500
+MAX_VIEWPORT_LIMIT = 2000
+MAX_CLUSTER_GRID = 64
+DEFAULT_TEXT_SEARCH_LIMIT = 20
+MAX_TEXT_SEARCH_LIMIT = 100
+MAX_TEXT_QUERY_LENGTH = 100
+# Cluster cells per request: a 4096 x 4096 px viewport at 64 px cells.
+MAX_CLUSTER_CELLS = 4096
+# Reported availability states and the stored `availability_status` they set.
+AVAILABILITY_STATES = {"free": True, "occupied": False}
+MAX_BULK_AVAILABILITY_UPDATES = 10_000
+
+# Fields needed to build a ChargingStation; everything else stays in the database.
+STATION_PROJECTION = {
+    "postal_code": 1, "availability_status": 1, "location.latitude": 1, "location.longitude": 1, "name": 1,
+    "power_kw": 1, "charging_type": 1, "charge_points": 1, "connectors": 1,
+}
+
+
+def encode_page_cursor(postal_code: str, last_id: str) -> str:
+    """Encodes the position after the last station of a page as an opaque token."""
+    payload = json.dumps({"p": postal_code, "id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_page_cursor(cursor: str, postal_code: str) -> ObjectId:
+    """
+    Decodes a token from `encode_page_cursor`.
+
+    Raises:
+        InvalidPageException: If the token is malformed or belongs to another postal code.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        after_id = ObjectId(payload["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError, InvalidId):
+        raise InvalidPageException("Ungültiger Cursor")
+    if payload.get("p") != postal_code:
+        raise InvalidPageException("Der Cursor gehört zu einer anderen PLZ")
+    return after_id
 
 @dataclass (frozen=True)
 class PostalCode:
@@ -26,6 +82,109 @@ class PostalCode:
         return (self.value.startswith(("10", "12", "13"))
             and len(self.value) == 5)
 
+@dataclass(frozen=True)
+class Coordinates:
+    """
+    Represents a WGS84 position.
+
+    Attributes:
+        latitude (float): Latitude in degrees.
+        longitude (float): Longitude in degrees.
+
+    Raises:
+        InvalidCoordinatesException: If the position is outside the valid ranges.
+    """
+    latitude: float
+    longitude: float
+    def __post_init__(self):
+        if not (-90 <= self.latitude <= 90 and -180 <= self.longitude <= 180):
+            raise InvalidCoordinatesException(
+                f"{self.latitude}, {self.longitude} sind keine gültigen Koordinaten"
+            )
+
+    def to_geojson(self) -> dict:
+        return {"type": "Point", "coordinates": [self.longitude, self.latitude]}
+
+@dataclass(frozen=True)
+class BoundingBox:
+    """
+    Represents a WGS84 bounding box such as a map viewport.
+
+    Attributes:
+        min_lon (float): Western edge.
+        min_lat (float): Southern edge.
+        max_lon (float): Eastern edge.
+        max_lat (float): Northern edge.
+
+    Raises:
+        InvalidCoordinatesException: If the corners are invalid, inverted or span a hemisphere or more.
+    """
+    min_lon: float
+    min_lat: float
+    max_lon: float
+    max_lat: float
+    def __post_init__(self):
+        Coordinates(self.min_lat, self.min_lon)
+        Coordinates(self.max_lat, self.max_lon)
+        if not (self.min_lon < self.max_lon and self.min_lat < self.max_lat):
+            raise InvalidCoordinatesException("Die minimalen Koordinaten müssen kleiner als die maximalen sein")
+        if self.max_lon - self.min_lon >= 180:
+            raise InvalidCoordinatesException("Die Box muss kleiner als eine Hemisphäre sein")
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        return self.min_lon, self.min_lat, self.max_lon, self.max_lat
+
+    def to_geojson(self) -> dict:
+        ring = [[self.min_lon, self.min_lat], [self.max_lon, self.min_lat], [self.max_lon, self.max_lat],
+                [self.min_lon, self.max_lat], [self.min_lon, self.min_lat]]
+        return {"type": "Polygon", "coordinates": [ring]}
+
+@dataclass(frozen=True)
+class StationFilter:
+    """
+    Represents filters on the typed charging attributes of stations, evaluated in MongoDB.
+
+    Attributes:
+        min_kw (Optional[float]): Minimum nominal power in kW.
+        max_kw (Optional[float]): Maximum nominal power in kW.
+        charging_type (Optional[str]): Register charging type, e.g. "Schnellladeeinrichtung".
+        connector (Optional[str]): A plug type the station must offer, e.g. "DC Kupplung Combo".
+        min_charge_points (Optional[int]): Minimum number of charge points.
+
+    Raises:
+        InvalidSearchQueryException: If a bound is negative or the power range is empty.
+    """
+    min_kw: Optional[float] = None
+    max_kw: Optional[float] = None
+    charging_type: Optional[str] = None
+    connector: Optional[str] = None
+    min_charge_points: Optional[int] = None
+    def __post_init__(self):
+        if any(bound is not None and bound < 0 for bound in (self.min_kw, self.max_kw, self.min_charge_points)):
+            raise InvalidSearchQueryException("Filter bounds must not be negative")
+        if self.min_kw is not None and self.max_kw is not None and self.min_kw > self.max_kw:
+            raise InvalidSearchQueryException("min_kw must not be greater than max_kw")
+
+    def __bool__(self):
+        return any(value is not None for value in
+                   (self.min_kw, self.max_kw, self.charging_type, self.connector, self.min_charge_points))
+
+    def to_query(self) -> dict:
+        """Returns the MongoDB query conditions of the filter."""
+        query = {}
+        power = {**({"$gte": self.min_kw} if self.min_kw is not None else {}),
+                 **({"$lte": self.max_kw} if self.max_kw is not None else {})}
+        if power:
+            query["power_kw"] = power
+        if self.charging_type is not None:
+            query["charging_type"] = self.charging_type
+        if self.connector is not None:
+            query["connectors"] = self.connector
+        if self.min_charge_points is not None:
+            query["charge_points"] = {"$gte": self.min_charge_points}
+        return query
+
 @dataclass
 class ChargingStation:
     """
@@ -38,6 +197,13 @@ class ChargingStation:
         availability_status (bool): Whether the station is currently available.
         name (Optional[str]): The name of the station (default: "Unknown Name").
         usage_statistics (float): The station's usage statistics (default: 0.0).
+        distance (Optional[float]): Distance in meters from a searched position, if any.
+        latitude (Optional[float]): Latitude of the station, if known.
+        longitude (Optional[float]): Longitude of the station, if known.
+        power_kw (Optional[float]): Nominal power in kW, if known.
+        charging_type (Optional[str]): Register charging type, e.g. "Schnellladeeinrichtung".
+        charge_points (Optional[int]): Number of charge points, if known.
+        connectors (Optional[List[str]]): Plug types offered by the station.
     """
     id: str
     location: str
@@ -45,6 +211,13 @@ class ChargingStation:
     availability_status: bool
     name: Optional[str] = "Unknown Name"
     usage_statistics: float = 0.0
+    distance: Optional[float] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    power_kw: Optional[float] = None
+    charging_type: Optional[str] = None
+    charge_points: Optional[int] = None
+    connectors: Optional[List[str]] = None
 
 @dataclass(frozen=True)
 class ChargingStationSearched:
@@ -60,6 +233,31 @@ class ChargingStationSearched:
     stations_found: int 
     timestamp: datetime
 
+@dataclass(frozen=True)
+class AvailabilityChanged:
+    """
+    Domain event triggered when the availability status of a charging station is updated.
+
+    Attributes:
+        station_id (str): The ID of the charging station.
+        postal_code (str): The postal code of the charging station.
+        availability_status (bool): The stored status after the update.
+        timestamp (datetime): The timestamp of the update.
+    """
+    station_id: str
+    postal_code: str
+    availability_status: bool
+    timestamp: datetime
+
+    def to_dict(self) -> dict:
+        """Returns the event as a JSON-serializable dict."""
+        return {
+            "id": self.station_id,
+            "postal_code": self.postal_code,
+            "availability_status": self.availability_status,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
 @dataclass 
 class SearchResult:
     """
@@ -72,10 +270,145 @@ class SearchResult:
     stations: List[ChargingStation] 
     event: ChargingStationSearched
 
+@dataclass(frozen=True)
+class ChargingStationsBatchSearched:
+    """
+    Domain event triggered when charging stations are searched for several postal codes at once.
+
+    Attributes:
+        postal_codes (Tuple[str, ...]): The postal codes searched for.
+        stations_found (int): The total number of stations found.
+        timestamp (datetime): The timestamp of the search event.
+        district (Optional[str]): The district the postal codes were resolved from, if any.
+    """
+    postal_codes: Tuple[str, ...]
+    stations_found: int
+    timestamp: datetime
+    district: Optional[str] = None
+
+@dataclass
+class BatchSearchResult:
+    """
+    Represents the result of a search for several postal codes.
+
+    Attributes:
+        groups (Dict[str, List[dict]]): The stations found as response rows, grouped by postal code
+            in the order the codes were requested (codes without stations map to an empty list).
+        event (ChargingStationsBatchSearched): The event related to the search.
+    """
+    groups: Dict[str, List[dict]]
+    event: ChargingStationsBatchSearched
+
+@dataclass
+class StationRowsResult:
+    """
+    Represents the result of a lean charging station search.
+
+    Attributes:
+        rows (List[dict]): The stations found as response-ready rows (see `station_to_row`).
+        event (ChargingStationSearched): The event related to the search.
+        next_cursor (Optional[str]): Token for the next page, or None on the last page.
+    """
+    rows: List[dict]
+    event: ChargingStationSearched
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class ViewportResult:
+    """
+    Represents the stations within a bounding box.
+
+    Attributes:
+        stations (List[dict]): Up to `limit` stations as response rows (empty if clustered).
+        clusters (List[dict]): Grid clusters (see `grid_cluster`) if the box held too many stations
+            and clustering was requested, otherwise empty.
+        truncated (bool): Whether the box holds more stations than the limit.
+    """
+    stations: List[dict]
+    clusters: List[dict]
+    truncated: bool
+
+@dataclass
+class TextSearchResult:
+    """
+    Represents the result of a full-text station search.
+
+    Attributes:
+        stations (List[dict]): Response rows ordered by relevance, each with its text `score` and `power_kw`.
+        cached (bool): Whether the result was served from the search cache.
+    """
+    stations: List[dict]
+    cached: bool = False
+
+@dataclass
+class BulkAvailabilityResult:
+    """
+    Represents the result of a bulk availability update.
+
+    Attributes:
+        results (List[dict]): One result per submitted item, in order, with its `index`, `station_id`
+                              and `status` ("updated", "unchanged", "superseded", "not_found", "invalid"
+                              or "error").
+        changes (List[AvailabilityChanged]): The applied changes.
+    """
+    results: List[dict]
+    changes: List[AvailabilityChanged]
+
+def station_to_row(station: ChargingStation) -> dict:
+    """Converts a ChargingStation into a response row with numeric coordinates."""
+    row = {
+        "id": station.id,
+        "postal_code": station.postal_code.value,
+        "availability_status": station.availability_status,
+        "location": {"latitude": station.latitude, "longitude": station.longitude},
+        "name": station.name,
+        "power_kw": station.power_kw,
+        "charging_type": station.charging_type,
+        "charge_points": station.charge_points,
+        "connectors": station.connectors,
+    }
+    if station.distance is not None:
+        row["distance_m"] = station.distance
+    return row
+
 class StationRepository:
     """
     Repository for accessing charging station data from MongoDB.
     """
+    @staticmethod
+    def _to_charging_station(station: dict) -> ChargingStation:
+        return ChargingStation(
+            id=str(station["_id"]),
+            postal_code=PostalCode(station["postal_code"]),
+            availability_status=station["availability_status"],
+            location=f"{station['location']['latitude']}, {station['location']['longitude']}",
+            name=station.get("name", "Unknown Name"),
+            distance=station.get("distance"),
+            latitude=station["location"]["latitude"],
+            longitude=station["location"]["longitude"],
+            power_kw=station.get("power_kw"),
+            charging_type=station.get("charging_type"),
+            charge_points=station.get("charge_points"),
+            connectors=station.get("connectors"),
+        )
+
+    @staticmethod
+    def _to_station_row(station: dict) -> dict:
+        """
+        Converts a projected database document into a response row in place.
+
+        Database rows are written by the import and trusted: the postal code is not
+        re-validated and no dataclasses are built.
+        """
+        station["id"] = str(station.pop("_id"))
+        station.setdefault("name", "Unknown Name")
+        return station
+
+    @staticmethod
+    def _filtered(query: dict, filters: Optional[StationFilter]) -> dict:
+        return {**query, **filters.to_query()} if filters else query
+
     async def find_by_postal_code(self, postal_code: PostalCode):
         """
         Query MongoDB for charging stations by postal code.
@@ -88,20 +421,131 @@ class StationRepository:
         """
         try:
             results = await station_collection.find({"postal_code": postal_code.value}).to_list(100)
-            return [
-                ChargingStation(
-                    id=str(station["_id"]),
-                    postal_code=PostalCode(station["postal_code"]),
-                    availability_status=station["availability_status"],
-                    location=f"{station['location']['latitude']}, {station['location']['longitude']}",
-                    name=station.get("name", "Unknown Name"),
-                )
-                for station in results
-            ]
+            return [self._to_charging_station(station) for station in results]
         except Exception as e:
             print(f"Error querying stations: {e}")
             return []
     
+    async def find_page_rows_by_postal_code(self, postal_code: PostalCode, page_size: int,
+                                            after_id: Optional[ObjectId] = None,
+                                            filters: Optional[StationFilter] = None) -> Tuple[List[dict], bool]:
+        """
+        Query one page of charging stations by postal code as response rows, ordered by `_id`.
+
+        Keyset pagination on the (postal_code, _id) index: every page is a bounded range
+        scan starting after `after_id`, so deep pages cost the same as the first one.
+        Stations not matching `filters` are skipped in the database.
+
+        Args:
+            postal_code (PostalCode): The postal code to search for charging stations.
+            page_size (int): The maximum number of stations on the page.
+            after_id (Optional[ObjectId]): The `_id` of the last station of the previous page.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            Tuple[List[dict], bool]: The rows of the page and whether more follow.
+        """
+        try:
+            query = self._filtered({"postal_code": postal_code.value}, filters)
+            if after_id is not None:
+                query["_id"] = {"$gt": after_id}
+            cursor = station_collection.find(query, STATION_PROJECTION).sort("_id", 1).limit(page_size + 1)
+            results = await cursor.to_list(page_size + 1)
+            return [self._to_station_row(station) for station in results[:page_size]], len(results) > page_size
+        except Exception as e:
+            print(f"Error querying stations: {e}")
+            return [], False
+
+    async def find_rows_by_postal_codes(self, postal_codes: List[PostalCode],
+                                        filters: Optional[StationFilter] = None) -> List[dict]:
+        """
+        Query the charging stations of several postal codes with a single `$in` query.
+
+        Args:
+            postal_codes (List[PostalCode]): The postal codes to search for charging stations.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            List[dict]: Response rows ordered by postal code and `_id`.
+        """
+        try:
+            query = self._filtered({"postal_code": {"$in": [postal_code.value for postal_code in postal_codes]}}, filters)
+            cursor = station_collection.find(query, STATION_PROJECTION).sort([("postal_code", 1), ("_id", 1)])
+            return [self._to_station_row(station) for station in await cursor.to_list(None)]
+        except Exception as e:
+            print(f"Error querying stations: {e}")
+            return []
+
+    async def search_text(self, query: str, postal_code: Optional[PostalCode] = None,
+                          filters: Optional[StationFilter] = None, limit: int = DEFAULT_TEXT_SEARCH_LIMIT) -> List[dict]:
+        """
+        Query MongoDB for charging stations matching a free-text query using the `station_text` index.
+
+        Args:
+            query (str): Words to search for in the station name, provider and location description.
+            postal_code (PostalCode, optional): Only return stations with this postal code.
+            filters (StationFilter, optional): Only return stations matching these filters.
+            limit (int): The maximum number of stations to return.
+
+        Returns:
+            List[dict]: Response rows ordered by text score, each with its `score`.
+        """
+        criteria = {"$text": {"$search": query}}
+        if postal_code is not None:
+            criteria["postal_code"] = postal_code.value
+        criteria = self._filtered(criteria, filters)
+        projection = {**STATION_PROJECTION, "score": {"$meta": "textScore"}}
+        try:
+            results = await station_collection.find(criteria, projection).sort(
+                [("score", {"$meta": "textScore"})]
+            ).limit(limit).to_list(limit)
+            return [self._to_station_row(station) for station in results]
+        except Exception as e:
+            print(f"Error searching stations for {query!r}: {e}")
+            return []
+
+    async def facets(self, postal_code: Optional[PostalCode] = None, filters: Optional[StationFilter] = None) -> dict:
+        """
+        Count the charging stations per charging type, plug type and postal code in one aggregation.
+
+        Args:
+            postal_code (PostalCode, optional): Only count stations with this postal code.
+            filters (StationFilter, optional): Only count stations matching these filters.
+
+        Returns:
+            dict: `totals` with the number of stations, available stations and charge points, and
+                  `charging_types`, `connectors` and `postal_codes` with the stations per value.
+        """
+        match = self._filtered({"postal_code": postal_code.value} if postal_code is not None else {}, filters)
+        counts = {
+            "stations": {"$sum": 1},
+            "available": {"$sum": {"$cond": ["$availability_status", 1, 0]}},
+            "charge_points": {"$sum": {"$ifNull": ["$charge_points", 0]}},
+        }
+        pipeline = [
+            {"$match": match},
+            {"$facet": {
+                "totals": [{"$group": {"_id": None, **counts}}],
+                "charging_types": [{"$group": {"_id": "$charging_type", **counts}}, {"$sort": {"stations": -1, "_id": 1}}],
+                "connectors": [{"$unwind": "$connectors"}, {"$group": {"_id": "$connectors", **counts}},
+                               {"$sort": {"stations": -1, "_id": 1}}],
+                "postal_codes": [{"$group": {"_id": "$postal_code", **counts}}, {"$sort": {"_id": 1}}],
+            }},
+        ]
+        empty = {"stations": 0, "available": 0, "charge_points": 0}
+        try:
+            result = (await station_collection.aggregate(pipeline).to_list(1))[0]
+            values = {
+                facet: [{"value": group.pop("_id"), **group} for group in result[facet]]
+                for facet in ("charging_types", "connectors", "postal_codes")
+            }
+            totals = result["totals"][0] if result["totals"] else empty
+            totals.pop("_id", None)
+            return {"totals": totals, **values}
+        except Exception as e:
+            print(f"Error counting station facets: {e}")
+            return {"totals": empty, "charging_types": [], "connectors": [], "postal_codes": []}
+
     async def find_by_object_id(self, object_id: ObjectId):
         """
         Query MongoDB for charging stations by ObjectId.
@@ -115,49 +559,220 @@ class StationRepository:
         try:
             result = await station_collection.find_one({"_id": object_id})
             if result:
-                return ChargingStation(
-                    id=str(result["_id"]),
-                    postal_code=PostalCode(result["postal_code"]),
-                    availability_status=result["availability_status"],
-                    location=f"{result['location']['latitude']}, {result['location']['longitude']}",
-                    name=result.get("name", "Unknown Name"),
-                )
+                return self._to_charging_station(result)
             return None
         except Exception as e:
             print(f"Error querying station by ID {object_id}: {e}")
             return None
     
-    async def update_availability_status(self, station_id: str):
+    async def find_nearby(self, coordinates: Coordinates, radius: Optional[float], limit: int,
+                          filters: Optional[StationFilter] = None):
         """
-        Update the availability status of a charging station.
+        Query MongoDB for the charging stations closest to a position using the `geo` 2dsphere index.
+
+        Args:
+            coordinates (Coordinates): The position to search around.
+            radius (float, optional): The maximum distance in meters; None for no limit.
+            limit (int): The maximum number of stations to return.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            List[ChargingStation]: Matching stations sorted by distance, with `distance` set in meters.
         """
         try:
-            station = await self.find_by_object_id(ObjectId(station_id))
-            if not station:
-                print(f"Station with ID {station_id} not found.")
-                return []
+            pipeline = [
+                {"$geoNear": {
+                    "near": coordinates.to_geojson(),
+                    "key": "geo",
+                    "distanceField": "distance",
+                    **({"maxDistance": radius} if radius is not None else {}),
+                    "spherical": True,
+                    **({"query": filters.to_query()} if filters else {}),
+                }},
+                {"$limit": limit},
+            ]
+            results = await station_collection.aggregate(pipeline).to_list(limit)
+            return [self._to_charging_station(station) for station in results]
+        except Exception as e:
+            print(f"Error querying nearby stations: {e}")
+            return []
 
-            new_status = not station.availability_status
-            await station_collection.update_one(
-                {"_id": ObjectId(station_id)},
-                {"$set": {"availability_status": new_status}}
-            )
+    async def find_k_nearest(self, coordinates: Coordinates, k: int, filters: Optional[StationFilter] = None):
+        """
+        Query MongoDB for the `k` charging stations closest to a position, however far away they are.
+
+        Returns:
+            List[ChargingStation]: The stations sorted by distance, with `distance` set in meters.
+        """
+        return await self.find_nearby(coordinates, None, k, filters)
+
+    async def find_rows_in_bbox(self, bbox: BoundingBox, limit: int,
+                                filters: Optional[StationFilter] = None) -> Tuple[List[dict], bool]:
+        """
+        Query MongoDB for the charging stations within a bounding box using the `geo` 2dsphere index.
+
+        Args:
+            bbox (BoundingBox): The box to search.
+            limit (int): The maximum number of stations to return.
+            filters (StationFilter, optional): Only return stations matching these filters.
+
+        Returns:
+            Tuple[List[dict], bool]: Up to `limit` response rows and whether the box holds more.
+        """
+        try:
+            query = self._filtered({"geo": {"$geoWithin": {"$geometry": bbox.to_geojson()}}}, filters)
+            results = await station_collection.find(query, STATION_PROJECTION).limit(limit + 1).to_list(limit + 1)
+            return [self._to_station_row(station) for station in results[:limit]], len(results) > limit
+        except Exception as e:
+            print(f"Error querying stations in {bbox}: {e}")
+            return [], False
+
+    async def cluster_in_bbox(self, bbox: BoundingBox, grid: int, filters: Optional[StationFilter] = None) -> List[dict]:
+        """
+        Aggregate the charging stations within a bounding box into grid x grid cells in MongoDB.
+
+        Args:
+            bbox (BoundingBox): The box to search.
+            grid (int): The number of cells per axis.
+            filters (StationFilter, optional): Only aggregate stations matching these filters.
+
+        Returns:
+            List[dict]: One cluster per non-empty cell, as returned by `grid_cluster`.
+        """
+        cell_width, cell_height = grid_cell_size(bbox.bounds, grid)
+
+        def cell(field, origin, size):
+            return {"$min": [grid - 1, {"$max": [0, {"$floor": {"$divide": [{"$subtract": [field, origin]}, size]}}]}]}
+
+        pipeline = [
+            {"$match": self._filtered({"geo": {"$geoWithin": {"$geometry": bbox.to_geojson()}}}, filters)},
+            {"$group": {
+                "_id": {"x": cell("$location.longitude", bbox.min_lon, cell_width),
+                        "y": cell("$location.latitude", bbox.min_lat, cell_height)},
+                "count": {"$sum": 1},
+                "available": {"$sum": {"$cond": ["$availability_status", 1, 0]}},
+                "latitude": {"$avg": "$location.latitude"},
+                "longitude": {"$avg": "$location.longitude"},
+            }},
+            {"$sort": {"_id.y": 1, "_id.x": 1}},
+        ]
+        try:
+            results = await station_collection.aggregate(pipeline).to_list(None)
+            return [
+                {"cell": [int(cluster["_id"]["x"]), int(cluster["_id"]["y"])], "count": cluster["count"],
+                 "available": cluster["available"], "latitude": cluster["latitude"], "longitude": cluster["longitude"]}
+                for cluster in results
+            ]
         except Exception as e:
-            print(f"Error updating availability status for {station_id}: {e}")
+            print(f"Error clustering stations in {bbox}: {e}")
             return []
 
+    async def update_availability_status(self, station_id: str, available: Optional[bool] = None):
+        """
+        Update the availability status of a charging station in one atomic operation.
+
+        Without a target state the stored status is toggled by an update pipeline, so
+        concurrent reports never read a stale status and no update is lost.
+
+        Args:
+            station_id (str): The ID of the charging station.
+            available (Optional[bool]): The new status, or None to toggle the stored one.
+
+        Returns:
+            AvailabilityChanged or None: The stored status after the update, or None if the station
+                                         ID is invalid or the station does not exist.
+
+        Raises:
+            Exception: Database errors are propagated, so callers do not mistake them for a missing station.
+        """
+        if available is None:
+            update = [{"$set": {"availability_status": {"$not": ["$availability_status"]}}}]
+        else:
+            update = {"$set": {"availability_status": available}}
+        try:
+            object_id = ObjectId(station_id)
+        except (InvalidId, TypeError):
+            print(f"Invalid station ID: {station_id}")
+            return None
+        station = await station_collection.find_one_and_update(
+            {"_id": object_id}, update,
+            projection={"postal_code": 1, "availability_status": 1}, return_document=ReturnDocument.AFTER,
+        )
+        if station is None:
+            print(f"Station with ID {station_id} not found.")
+            return None
+        return AvailabilityChanged(
+            station_id=str(station["_id"]),
+            postal_code=station.get("postal_code"),
+            availability_status=station["availability_status"],
+            timestamp=datetime.now(),
+        )
+
+    async def bulk_update_availability(self, updates: Dict[ObjectId, bool]) -> Optional[Dict[ObjectId, Tuple[str, str]]]:
+        """
+        Set the availability status of many charging stations with one bulk write.
+
+        The stations are read first; only those whose stored status differs are written, each
+        update filtered on the status that was read. If fewer updates apply than were sent, the
+        stations were deleted or reported concurrently and are read again to tell which.
+
+        Args:
+            updates (Dict[ObjectId, bool]): The new status per station.
+
+        Returns:
+            Dict[ObjectId, Tuple[str, str]] or None: The postal code and outcome of every existing
+                station: "updated", "unchanged" if it already had the status, or "superseded" if a
+                concurrent report changed it back. Stations that do not exist are missing. None if
+                an error occurs.
+        """
+        try:
+            projection = {"postal_code": 1, "availability_status": 1}
+            stations = await station_collection.find({"_id": {"$in": list(updates)}}, projection).to_list(None)
+            outcomes, statuses = {}, {}
+            for station in stations:
+                object_id = station["_id"]
+                statuses[object_id] = station.get("availability_status")
+                outcome = "unchanged" if statuses[object_id] == updates[object_id] else "updated"
+                outcomes[object_id] = (station.get("postal_code"), outcome)
+            changed = [object_id for object_id, (_, outcome) in outcomes.items() if outcome == "updated"]
+            if not changed:
+                return outcomes
+            result = await station_collection.bulk_write([
+                UpdateOne({"_id": object_id, "availability_status": statuses[object_id]},
+                          {"$set": {"availability_status": updates[object_id]}})
+                for object_id in changed
+            ], ordered=False)
+            if result.modified_count < len(changed):
+                current = await station_collection.find({"_id": {"$in": changed}}, projection).to_list(None)
+                current = {station["_id"]: station.get("availability_status") for station in current}
+                for object_id in changed:
+                    if object_id not in current:
+                        del outcomes[object_id]
+                    elif current[object_id] != updates[object_id]:
+                        outcomes[object_id] = (outcomes[object_id][0], "superseded")
+            return outcomes
+        except Exception as e:
+            print(f"Error updating the availability status of {len(updates)} stations: {e}")
+            return None
+
 class StationSearchService:
     """
     Service for searching charging stations by postal code.
     """
-    def __init__(self, repository: StationRepository):
+    def __init__(self, repository: StationRepository, district_repository=None, cluster_repository=None):
         """
         Initialize the service with a repository instance.
 
         Args:
             repository (StationRepository): The repository handling data access.
+            district_repository (DistrictRepository, optional): Resolves districts to postal codes.
+            cluster_repository (ClusterRepository, optional): Reads the precomputed marker clusters.
         """
         self.repository = repository
+        self.district_repository = district_repository
+        self.cluster_repository = cluster_repository
+        self.text_search_cache = TTLCache(TEXT_SEARCH_CACHE_SIZE, TEXT_SEARCH_CACHE_TTL)
+        self._recent_availability = OrderedDict()
         
     async def find_by_object_id(self, object_id: ObjectId):
         """
@@ -171,14 +786,115 @@ class StationSearchService:
         """
         return await self.repository.find_by_object_id(object_id)
     
-    async def update_availability_status(self, station_id: str):
+    async def update_availability_status(self, station_id: str, state: Optional[str] = None):
         """
         Update the availability status of a charging station.
         
         Args:
             station_id (str): The ID of the charging station.
+            state (Optional[str]): The reported state, "free" or "occupied", or None to toggle.
+
+        Returns:
+            AvailabilityChanged or None: The update event, or None if the station does not exist.
+
+        Raises:
+            ValueError: If the state is unknown.
+        """
+        if state is not None and state not in AVAILABILITY_STATES:
+            raise ValueError(f"Unknown availability state: {state}")
+        available = AVAILABILITY_STATES[state] if state is not None else None
+        result = await self.repository.update_availability_status(station_id, available)
+        if result is not None:
+            self._record_availability([result])
+        return result
+
+    async def bulk_update_availability(self, items: List[dict]) -> BulkAvailabilityResult:
         """
-        return await self.repository.update_availability_status(station_id)
+        Apply a batch of availability reports, such as an operator feed, with one bulk write.
+
+        Every item needs a `station_id` and a `state` ("free" or "occupied"). Invalid items are
+        reported and skipped; if a station is reported more than once, the last report wins.
+        Stations that already have the reported state are reported as "unchanged" and, like
+        stations whose report was superseded concurrently, publish no change.
+
+        Args:
+            items (List[dict]): The reports, in the order they were submitted.
+
+        Returns:
+            BulkAvailabilityResult: One result per item and the applied changes.
+
+        Raises:
+            ValueError: If the batch is empty or has more than 10,000 items.
+        """
+        if not 1 <= len(items) <= MAX_BULK_AVAILABILITY_UPDATES:
+            raise ValueError(f"Between 1 and {MAX_BULK_AVAILABILITY_UPDATES} updates are required")
+        results, latest = [], {}
+        for index, item in enumerate(items):
+            station_id = item.get("station_id") if isinstance(item, dict) else None
+            state = item.get("state") if isinstance(item, dict) else None
+            result = {"index": index, "station_id": station_id}
+            results.append(result)
+            if not isinstance(item, dict):
+                result.update(status="invalid", detail="Each update must be a JSON object")
+            elif not isinstance(station_id, str) or not ObjectId.is_valid(station_id):
+                result.update(status="invalid", detail="station_id must be a station ID")
+            elif state not in AVAILABILITY_STATES:
+                result.update(status="invalid", detail=f"state must be one of: {', '.join(AVAILABILITY_STATES)}")
+            else:
+                object_id = ObjectId(station_id)
+                if object_id in latest:
+                    results[latest[object_id][0]].update(status="superseded")
+                latest[object_id] = (index, AVAILABILITY_STATES[state])
+
+        changes = []
+        if latest:
+            outcomes = await self.repository.bulk_update_availability(
+                {object_id: available for object_id, (_, available) in latest.items()}
+            )
+            timestamp = datetime.now()
+            for object_id, (index, available) in latest.items():
+                if outcomes is None:
+                    results[index].update(status="error")
+                elif object_id not in outcomes:
+                    results[index].update(status="not_found")
+                else:
+                    postal_code, outcome = outcomes[object_id]
+                    results[index].update(status=outcome, availability_status=available)
+                    if outcome == "updated":
+                        changes.append(AvailabilityChanged(str(object_id), postal_code, available, timestamp))
+            self._record_availability(changes)
+        return BulkAvailabilityResult(results=results, changes=changes)
+
+    def _record_availability(self, changes: List[AvailabilityChanged]):
+        """
+        Remembers the availability of updated stations, for serving cached text searches.
+
+        A report only has to be remembered for as long as a search cached before it can be
+        served, so reports older than the cache TTL are dropped.
+        """
+        now = time.monotonic()
+        for change in changes:
+            self._recent_availability.pop(change.station_id, None)
+            self._recent_availability[change.station_id] = (now + self.text_search_cache.ttl, change.availability_status)
+        while self._recent_availability and next(iter(self._recent_availability.values()))[0] <= now:
+            self._recent_availability.popitem(last=False)
+
+    def _with_current_availability(self, stations: List[dict]) -> List[dict]:
+        """Returns copies of the cached rows of stations reported since, with their current availability."""
+        recent = self._recent_availability
+        if not recent:
+            return stations
+        return [{**station, "availability_status": recent[station["id"]][1]} if station["id"] in recent else station
+                for station in stations]
+
+    @staticmethod
+    def _page_request(code: str, page_size: Optional[int], cursor: Optional[str]):
+        postal_code = PostalCode(code)
+        page_size = DEFAULT_PAGE_SIZE if page_size is None else page_size
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise InvalidPageException(f"Page size must be between 1 and {MAX_PAGE_SIZE}")
+        after_id = decode_page_cursor(cursor, postal_code.value) if cursor else None
+        return postal_code, page_size, after_id
 
     async def search_by_postal_code(self, code: str) -> SearchResult:
         """
@@ -207,6 +923,290 @@ class StationSearchService:
         )
         return SearchResult(stations=stations, event=event)
 
+    async def search_rows_by_postal_code(self, code: str, page_size: Optional[int] = None, cursor: Optional[str] = None,
+                                         filters: Optional[StationFilter] = None) -> StationRowsResult:
+        """
+        Search for charging stations by postal code, one page at a time, for API responses.
+
+        The requested postal code is validated once; the matching stations are fetched with
+        a projection and returned as plain rows with numeric coordinates. `next_cursor` is
+        set if more stations follow.
+
+        Args:
+            code (str): The postal code to search for charging stations.
+            page_size (Optional[int]): The maximum number of stations per page (default: 100).
+            cursor (Optional[str]): The `next_cursor` of the previous page.
+            filters (Optional[StationFilter]): Only return stations matching these filters.
+
+        Returns:
+            StationRowsResult: The rows of the page, the search event and the next cursor.
+
+        Raises:
+            InvalidPostalCodeException: If the postal code is invalid.
+            InvalidPageException: If the page size or cursor is invalid.
+        """
+        postal_code, page_size, after_id = self._page_request(code, page_size, cursor)
+
+        next_cursor = None
+        try:
+            rows, has_more = await self.repository.find_page_rows_by_postal_code(postal_code, page_size, after_id, filters)
+            if has_more and rows:
+                next_cursor = encode_page_cursor(postal_code.value, rows[-1]["id"])
+        except Exception as e:
+            print(f"Error searching stations by postal code {code}: {e}")
+            rows = []
+
+        event = ChargingStationSearched(
+            postal_code=postal_code.value,
+            stations_found=len(rows),
+            timestamp=datetime.now()
+        )
+        return StationRowsResult(rows=rows, event=event, next_cursor=next_cursor)
+
+    async def search_by_postal_codes(self, codes: List[str], district: Optional[str] = None,
+                                     filters: Optional[StationFilter] = None) -> BatchSearchResult:
+        """
+        Search for the charging stations of several postal codes with one database query.
+
+        Args:
+            codes (List[str]): The postal codes to search for; duplicates are ignored.
+            district (Optional[str]): The district the codes were resolved from, for the event.
+            filters (Optional[StationFilter]): Only return stations matching these filters.
+
+        Returns:
+            BatchSearchResult: The stations grouped by postal code and the search event.
+
+        Raises:
+            InvalidPostalCodeException: If no or too many codes are given, or any code is invalid.
+        """
+        codes = list(dict.fromkeys(code.strip() for code in codes))
+        if not 1 <= len(codes) <= MAX_BATCH_POSTAL_CODES:
+            raise InvalidPostalCodeException(f"Between 1 and {MAX_BATCH_POSTAL_CODES} postal codes are required")
+        invalid = []
+        postal_codes = []
+        for code in codes:
+            try:
+                postal_codes.append(PostalCode(code))
+            except InvalidPostalCodeException:
+                invalid.append(code)
+        if invalid:
+            raise InvalidPostalCodeException(f"{', '.join(invalid)}: keine gültigen Berliner PLZ")
+
+        try:
+            rows = await self.repository.find_rows_by_postal_codes(postal_codes, filters) or []
+        except Exception as e:
+            print(f"Error searching stations by postal codes {codes}: {e}")
+            rows = []
+
+        groups = {code: [] for code in codes}
+        for row in rows:
+            groups.setdefault(row["postal_code"], []).append(row)
+        event = ChargingStationsBatchSearched(
+            postal_codes=tuple(codes),
+            stations_found=len(rows),
+            timestamp=datetime.now(),
+            district=district,
+        )
+        return BatchSearchResult(groups=groups, event=event)
+
+    async def search_by_district(self, district: str, filters: Optional[StationFilter] = None) -> BatchSearchResult:
+        """
+        Search for the charging stations of all postal codes overlapping a district.
+
+        Args:
+            district (str): The district (Bezirk) name.
+            filters (Optional[StationFilter]): Only return stations matching these filters.
+
+        Returns:
+            BatchSearchResult: The stations grouped by postal code and the search event.
+
+        Raises:
+            UnknownDistrictException: If there is no district with that name.
+        """
+        district = self.district_repository.resolve(district)
+        return await self.search_by_postal_codes(self.district_repository.postal_codes(district), district=district,
+                                                 filters=filters)
+
+    async def search_in_bbox(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float,
+                             limit: int = DEFAULT_VIEWPORT_LIMIT, cluster: bool = False, grid: int = 16,
+                             filters: Optional[StationFilter] = None) -> ViewportResult:
+        """
+        Search for the charging stations within a map viewport.
+
+        Args:
+            min_lon (float): Western edge of the viewport.
+            min_lat (float): Southern edge of the viewport.
+            max_lon (float): Eastern edge of the viewport.
+            max_lat (float): Northern edge of the viewport.
+            limit (int): The maximum number of stations to return (default: 500).
+            cluster (bool): Return grid clusters instead if the viewport holds more than `limit` stations.
+            grid (int): The number of cluster cells per axis (default: 16).
+            filters (Optional[StationFilter]): Only return stations matching these filters.
+
+        Returns:
+            ViewportResult: The stations, or clusters, within the viewport.
+
+        Raises:
+            InvalidCoordinatesException: If the viewport, limit or grid is invalid.
+        """
+        bbox = BoundingBox(min_lon, min_lat, max_lon, max_lat)
+        if not 1 <= limit <= MAX_VIEWPORT_LIMIT:
+            raise InvalidCoordinatesException(f"Limit must be between 1 and {MAX_VIEWPORT_LIMIT}")
+        if not 1 <= grid <= MAX_CLUSTER_GRID:
+            raise InvalidCoordinatesException(f"Grid must be between 1 and {MAX_CLUSTER_GRID}")
+
+        try:
+            stations, truncated = await self.repository.find_rows_in_bbox(bbox, limit, filters)
+            if truncated and cluster:
+                clusters = await self.repository.cluster_in_bbox(bbox, grid, filters)
+                return ViewportResult(stations=[], clusters=clusters, truncated=True)
+        except Exception as e:
+            print(f"Error searching stations in {bbox}: {e}")
+            stations, truncated = [], False
+        return ViewportResult(stations=stations, clusters=[], truncated=truncated)
+
+    async def search_clusters(self, min_lon: float, min_lat: float, max_lon: float, max_lat: float,
+                              zoom: int) -> List[dict]:
+        """
+        Search for the marker clusters within a map viewport at a zoom level.
+
+        Args:
+            min_lon (float): Western edge of the viewport.
+            min_lat (float): Southern edge of the viewport.
+            max_lon (float): Eastern edge of the viewport.
+            max_lat (float): Northern edge of the viewport.
+            zoom (int): The map zoom level.
+
+        Returns:
+            List[dict]: One cluster per occupied cell with its station count and mean position.
+
+        Raises:
+            InvalidCoordinatesException: If the viewport or zoom level is invalid, or the viewport
+                covers too many cells at that zoom level.
+        """
+        if self.cluster_repository is None:
+            raise RuntimeError("No cluster repository configured")
+        bbox = BoundingBox(min_lon, min_lat, max_lon, max_lat)
+        if not 0 <= zoom <= self.cluster_repository.max_zoom:
+            raise InvalidCoordinatesException(f"Zoom must be between 0 and {self.cluster_repository.max_zoom}")
+        if self.cluster_repository.cell_count(bbox.bounds, zoom) > MAX_CLUSTER_CELLS:
+            raise InvalidCoordinatesException(f"The viewport is too large for zoom {zoom}")
+        return await self.cluster_repository.find_clusters(bbox.bounds, zoom)
+
+    async def search_text(self, query: str, postal_code: Optional[str] = None, filters: Optional[StationFilter] = None,
+                          limit: int = DEFAULT_TEXT_SEARCH_LIMIT) -> TextSearchResult:
+        """
+        Search for charging stations by free text, ranked by relevance.
+
+        Results with stations are cached for a short time, so popular queries are answered
+        without a database round trip. Cached rows are served with the availability reported
+        since they were cached, so availability updates do not invalidate the cache.
+
+        Args:
+            query (str): Words to search for, e.g. "schnelllader alexanderplatz".
+            postal_code (str, optional): Only return stations with this postal code.
+            filters (StationFilter, optional): Only return stations matching these filters.
+            limit (int): The maximum number of stations to return (default: 20).
+
+        Returns:
+            TextSearchResult: The matching stations, most relevant first.
+
+        Raises:
+            InvalidSearchQueryException: If the query or limit is invalid.
+            InvalidPostalCodeException: If the postal code filter is invalid.
+        """
+        terms = " ".join(query.split()) if query else ""
+        if not terms or len(terms) > MAX_TEXT_QUERY_LENGTH:
+            raise InvalidSearchQueryException(f"Query must have between 1 and {MAX_TEXT_QUERY_LENGTH} characters")
+        if not 1 <= limit <= MAX_TEXT_SEARCH_LIMIT:
+            raise InvalidSearchQueryException(f"Limit must be between 1 and {MAX_TEXT_SEARCH_LIMIT}")
+        code = PostalCode(postal_code) if postal_code is not None else None
+
+        key = (terms.casefold(), postal_code, filters or None, limit)
+        stations = self.text_search_cache.get(key)
+        if stations is not None:
+            return TextSearchResult(stations=self._with_current_availability(stations), cached=True)
+        stations = await self.repository.search_text(terms, code, filters, limit)
+        if stations:
+            self.text_search_cache.set(key, stations)
+        return TextSearchResult(stations=stations)
+
+    async def station_facets(self, postal_code: Optional[str] = None, filters: Optional[StationFilter] = None) -> dict:
+        """
+        Count the charging stations per charging type, plug type and postal code.
+
+        Args:
+            postal_code (Optional[str]): Only count stations with this postal code.
+            filters (Optional[StationFilter]): Only count stations matching these filters.
+
+        Returns:
+            dict: The totals and the stations per charging type, plug type and postal code.
+
+        Raises:
+            InvalidPostalCodeException: If the postal code is invalid.
+        """
+        code = PostalCode(postal_code) if postal_code is not None else None
+        return await self.repository.facets(code, filters)
+
+    async def search_nearby(self, latitude: float, longitude: float, radius: float = 1000, limit: int = 20,
+                            filters: Optional[StationFilter] = None) -> List[ChargingStation]:
+        """
+        Search for the charging stations closest to a position.
+
+        Args:
+            latitude (float): Latitude of the position.
+            longitude (float): Longitude of the position.
+            radius (float): The maximum distance in meters (default: 1000).
+            limit (int): The maximum number of stations to return (default: 20).
+            filters (Optional[StationFilter]): Only return stations matching these filters.
+
+        Returns:
+            List[ChargingStation]: Matching stations sorted by distance.
+
+        Raises:
+            InvalidCoordinatesException: If the position, radius or limit is invalid.
+        """
+        coordinates = Coordinates(latitude, longitude)
+        if not 0 < radius <= MAX_NEARBY_RADIUS:
+            raise InvalidCoordinatesException(f"Radius must be between 0 and {MAX_NEARBY_RADIUS} meters")
+        if not 1 <= limit <= MAX_NEARBY_LIMIT:
+            raise InvalidCoordinatesException(f"Limit must be between 1 and {MAX_NEARBY_LIMIT}")
+
+        try:
+            stations = await self.repository.find_nearby(coordinates, radius, limit, filters)
+        except Exception as e:
+            print(f"Error searching stations near {latitude}, {longitude}: {e}")
+            stations = []
+        return stations or []
+
+    async def search_nearest(self, latitude: float, longitude: float, k: int = 5,
+                             filters: Optional[StationFilter] = None) -> List[ChargingStation]:
+        """
+        Search for the `k` charging stations closest to a position, however far away they are.
+
+        Args:
+            latitude (float): Latitude of the position.
+            longitude (float): Longitude of the position.
+            k (int): The number of stations to return (default: 5).
+            filters (Optional[StationFilter]): Only return stations matching these filters.
+
+        Returns:
+            List[ChargingStation]: The closest stations sorted by distance.
+
+        Raises:
+            InvalidCoordinatesException: If the position or k is invalid.
+        """
+        coordinates = Coordinates(latitude, longitude)
+        if not 1 <= k <= MAX_NEARBY_LIMIT:
+            raise InvalidCoordinatesException(f"k must be between 1 and {MAX_NEARBY_LIMIT}")
+
+        try:
+            stations = await self.repository.find_k_nearest(coordinates, k, filters)
+        except Exception as e:
+            print(f"Error searching stations nearest to {latitude}, {longitude}: {e}")
+            stations = []
+        return stations or []
+
 
 class InvalidPostalCodeException (Exception):
     """
@@ -214,3 +1214,20 @@ class InvalidPostalCodeException (Exception):
     """
     pass
 
+class InvalidCoordinatesException (Exception):
+    """
+    Exception raised for invalid positions or search areas.
+    """
+    pass
+
+class InvalidPageException (Exception):
+    """
+    Exception raised for invalid page sizes or cursors.
+    """
+    pass
+
+class InvalidSearchQueryException (Exception):
+    """
+    Exception raised for invalid full-text search queries or station filters.
+    """
+    pass
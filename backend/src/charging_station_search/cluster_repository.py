@@ -0,0 +1,64 @@
+from typing import List
+from backend.config import CLUSTER_MAX_ZOOM
+from backend.db.mongo_client import station_cluster_collection
+from backend.utilities.clustering import cell_range
+
+
+class ClusterRepository:
+    """
+    Reads the marker clusters precomputed per zoom level by the station import.
+
+    Every zoom level is divided into nested Web Mercator cells; a cluster document holds
+    the number of stations in its cell and the sums of their coordinates, from which the
+    cluster's mean position is derived.
+    """
+    max_zoom = CLUSTER_MAX_ZOOM
+
+    @staticmethod
+    def _to_cluster(cluster: dict) -> dict:
+        count = cluster["count"]
+        return {
+            "zoom": cluster["zoom"],
+            "cell": [cluster["x"], cluster["y"]],
+            "count": count,
+            "latitude": cluster["lat_sum"] / count,
+            "longitude": cluster["lon_sum"] / count,
+        }
+
+    @staticmethod
+    def cell_count(bounds, zoom: int) -> int:
+        """
+        Count the cells a bounding box covers at a zoom level.
+
+        Args:
+            bounds (tuple): (min_lon, min_lat, max_lon, max_lat) of the box.
+            zoom (int): The zoom level.
+
+        Returns:
+            int: The number of cells, occupied or not.
+        """
+        min_x, min_y, max_x, max_y = cell_range(bounds, zoom)
+        return (max_x - min_x + 1) * (max_y - min_y + 1)
+
+    async def find_clusters(self, bounds, zoom: int) -> List[dict]:
+        """
+        Query the marker clusters within a bounding box at a zoom level.
+
+        Args:
+            bounds (tuple): (min_lon, min_lat, max_lon, max_lat) of the box.
+            zoom (int): The zoom level.
+
+        Returns:
+            List[dict]: One cluster per occupied cell with its cell, station count and mean
+                        position, ordered by row and column.
+        """
+        min_x, min_y, max_x, max_y = cell_range(bounds, zoom)
+        query = {"zoom": zoom, "x": {"$gte": min_x, "$lte": max_x}, "y": {"$gte": min_y, "$lte": max_y},
+                 "count": {"$gt": 0}}
+        try:
+            results = await station_cluster_collection.find(query, {"_id": 0}).to_list(None)
+            return sorted((self._to_cluster(cluster) for cluster in results),
+                          key=lambda cluster: (cluster["cell"][1], cluster["cell"][0]))
+        except Exception as e:
+            print(f"Error querying clusters at zoom {zoom}: {e}")
+            return []
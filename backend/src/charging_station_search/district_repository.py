@@ -0,0 +1,76 @@
+import threading
+from typing import Dict, List, Optional
+from backend.config import DATA_PATHS, DISTRICTS_PATH
+from backend.utilities.dataset_loader import load_geodata_plz, load_geodata_districts
+from backend.utilities.geometry_utils import overlapping_areas
+
+
+class DistrictRepository:
+    """
+    Resolves Berlin districts (Bezirke) to the postal codes whose areas overlap them.
+
+    The assignment is computed once per process from a spatial join of the postal code
+    and district geometries.
+    """
+    def __init__(self, plz_path: str = DATA_PATHS['geodata_berlin_plz'], districts_path: str = DISTRICTS_PATH):
+        self.plz_path = plz_path
+        self.districts_path = districts_path
+        self._postal_codes: Optional[Dict[str, List[str]]] = None
+        self._lock = threading.Lock()
+
+    def _assignment(self) -> Dict[str, List[str]]:
+        with self._lock:
+            if self._postal_codes is None:
+                assignment = overlapping_areas(load_geodata_plz(self.plz_path), load_geodata_districts(self.districts_path))
+                self._postal_codes = {district: [str(code) for code in codes] for district, codes in assignment.items()}
+            return self._postal_codes
+
+    def districts(self) -> List[str]:
+        """
+        List the known districts.
+
+        Returns:
+            List[str]: The district names in alphabetical order.
+        """
+        return sorted(self._assignment())
+
+    def resolve(self, district: str) -> str:
+        """
+        Resolve a district name to its canonical spelling.
+
+        Args:
+            district (str): The district name; case and surrounding whitespace are ignored.
+
+        Returns:
+            str: The district name as in the district dataset.
+
+        Raises:
+            UnknownDistrictException: If there is no district with that name.
+        """
+        names = {name.casefold(): name for name in self._assignment()}
+        name = names.get(district.strip().casefold())
+        if name is None:
+            raise UnknownDistrictException(f"{district} ist kein Berliner Bezirk")
+        return name
+
+    def postal_codes(self, district: str) -> List[str]:
+        """
+        Resolve a district to its postal codes.
+
+        Args:
+            district (str): The district name; case and surrounding whitespace are ignored.
+
+        Returns:
+            List[str]: The postal codes overlapping the district.
+
+        Raises:
+            UnknownDistrictException: If there is no district with that name.
+        """
+        return self._assignment()[self.resolve(district)]
+
+
+class UnknownDistrictException (Exception):
+    """
+    Exception raised for unknown district names.
+    """
+    pass
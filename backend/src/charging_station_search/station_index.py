@@ -0,0 +1,326 @@
+import asyncio
+import bisect
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import shapely
+from bson.objectid import ObjectId
+from backend.db.mongo_client import station_collection
+from backend.utilities.clustering import grid_cluster
+from backend.src.charging_station_search.charging_station_search_service import (
+    BoundingBox, ChargingStation, Coordinates, PostalCode, StationFilter, StationRepository, InvalidPostalCodeException,
+    STATION_PROJECTION, station_to_row
+)
+
+EARTH_RADIUS_M = 6_371_008.8
+METERS_PER_DEGREE = 111_320.0
+MAX_POSTAL_CODE_RESULTS = 100
+
+
+def haversine_distance(latitude, longitude, latitudes, longitudes):
+    """Great-circle distances in meters from one position to arrays of positions."""
+    lat0, lon0 = np.radians(latitude), np.radians(longitude)
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lat) * np.sin((lon - lon0) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def radius_bounds(latitude, longitude, radius):
+    """Bounding box (min_lon, min_lat, max_lon, max_lat) enclosing a circle of `radius` meters."""
+    dlat = radius / METERS_PER_DEGREE
+    dlon = radius / (METERS_PER_DEGREE * max(np.cos(np.radians(latitude)), 1e-6))
+    return longitude - dlon, latitude - dlat, longitude + dlon, latitude + dlat
+
+
+class StationIndex:
+    """
+    In-memory index of charging stations by id, postal code and position.
+
+    Stations are kept in dictionaries, positions in an STRtree over their points. The tree
+    is rebuilt lazily on the first spatial query after a station was added, moved or removed,
+    so a burst of changes (e.g. a register import) costs one rebuild.
+    """
+    def __init__(self):
+        self._stations: Dict[str, ChargingStation] = {}
+        self._positions: Dict[str, Tuple[float, float]] = {}
+        self._by_postal_code: Dict[str, Dict[str, None]] = {}
+        self._ids: List[str] = []
+        self._latitudes = np.empty(0)
+        self._longitudes = np.empty(0)
+        self._tree: Optional[shapely.STRtree] = None
+        self._spacing = 500.0
+        self._dirty = False
+
+    @classmethod
+    def from_documents(cls, documents) -> "StationIndex":
+        """
+        Build an index from MongoDB station documents.
+
+        Args:
+            documents (Iterable[dict]): Station documents with at least `STATION_PROJECTION`.
+
+        Returns:
+            StationIndex: The index; documents with an invalid postal code are skipped.
+        """
+        index = cls()
+        for document in documents:
+            index.upsert_document(document)
+        return index
+
+    def __len__(self):
+        return len(self._stations)
+
+    def __contains__(self, station_id):
+        return station_id in self._stations
+
+    def upsert_document(self, document: dict) -> bool:
+        """
+        Add or replace a station from its MongoDB document.
+
+        Returns:
+            bool: Whether the document was indexed.
+        """
+        try:
+            station = StationRepository._to_charging_station(document)
+        except (InvalidPostalCodeException, KeyError, TypeError):
+            return False
+        location = document.get("location", {})
+        self.upsert(station, location.get("latitude"), location.get("longitude"))
+        return True
+
+    def upsert(self, station: ChargingStation, latitude: Optional[float], longitude: Optional[float]):
+        """Adds or replaces a station and its position."""
+        previous = self._stations.get(station.id)
+        if previous is not None and previous.postal_code != station.postal_code:
+            self._by_postal_code[previous.postal_code.value].pop(station.id, None)
+        self._stations[station.id] = replace(station, distance=None)
+        self._by_postal_code.setdefault(station.postal_code.value, {})[station.id] = None
+
+        position = None
+        if latitude is not None and longitude is not None and np.isfinite([latitude, longitude]).all():
+            position = (float(latitude), float(longitude))
+        if self._positions.get(station.id) != position:
+            self._positions.pop(station.id, None)
+            if position is not None:
+                self._positions[station.id] = position
+            self._dirty = True
+
+    def remove(self, station_id: str):
+        """Removes a station if it is indexed."""
+        station = self._stations.pop(station_id, None)
+        if station is None:
+            return
+        self._by_postal_code.get(station.postal_code.value, {}).pop(station_id, None)
+        if self._positions.pop(station_id, None) is not None:
+            self._dirty = True
+
+    def set_availability(self, station_id: str, availability_status: bool):
+        """Updates the availability status of an indexed station in place."""
+        if station_id in self._stations:
+            self._stations[station_id] = replace(self._stations[station_id], availability_status=availability_status)
+
+    def get(self, station_id: str) -> Optional[ChargingStation]:
+        return self._stations.get(station_id)
+
+    def by_postal_code(self, postal_code: str, limit: int = MAX_POSTAL_CODE_RESULTS) -> List[ChargingStation]:
+        ids = self._by_postal_code.get(postal_code, {})
+        return [self._stations[station_id] for station_id, _ in zip(ids, range(limit))]
+
+    def page_by_postal_code(self, postal_code: str, page_size: int,
+                            after_id: Optional[str] = None) -> Tuple[List[ChargingStation], bool]:
+        """One page of a postal code's stations ordered by id, and whether more follow."""
+        ids = sorted(self._by_postal_code.get(postal_code, {}))
+        start = bisect.bisect_right(ids, after_id) if after_id is not None else 0
+        page = ids[start:start + page_size]
+        return [self._stations[station_id] for station_id in page], start + page_size < len(ids)
+
+    def _spatial(self):
+        if self._dirty or (self._tree is None and self._positions):
+            self._ids = list(self._positions)
+            positions = np.array([self._positions[station_id] for station_id in self._ids]).reshape(-1, 2)
+            self._latitudes, self._longitudes = positions[:, 0], positions[:, 1]
+            self._tree = shapely.STRtree(shapely.points(self._longitudes, self._latitudes)) if self._ids else None
+            if self._ids:
+                height = np.ptp(self._latitudes) * METERS_PER_DEGREE
+                width = np.ptp(self._longitudes) * METERS_PER_DEGREE * np.cos(np.radians(np.mean(self._latitudes)))
+                self._spacing = max(np.sqrt(height * width / len(self._ids)), 50.0)
+            self._dirty = False
+        return self._tree
+
+    def _query_bounds(self, min_lon, min_lat, max_lon, max_lat) -> np.ndarray:
+        tree = self._spatial()
+        if tree is None:
+            return np.empty(0, dtype=int)
+        return np.sort(tree.query(shapely.box(min_lon, min_lat, max_lon, max_lat)))
+
+    def _with_distances(self, positions, distances) -> List[ChargingStation]:
+        return [replace(self._stations[self._ids[i]], distance=float(d)) for i, d in zip(positions, distances)]
+
+    def in_bbox(self, min_lon, min_lat, max_lon, max_lat, limit: Optional[int] = None) -> List[ChargingStation]:
+        """Stations within a bounding box, in index order."""
+        positions = self._query_bounds(min_lon, min_lat, max_lon, max_lat)[:limit]
+        return [self._stations[self._ids[i]] for i in positions]
+
+    def cluster_in_bbox(self, min_lon, min_lat, max_lon, max_lat, grid: int) -> List[dict]:
+        """Stations within a bounding box aggregated into grid x grid cells (see `grid_cluster`)."""
+        positions = self._query_bounds(min_lon, min_lat, max_lon, max_lat)
+        available = [self._stations[self._ids[i]].availability_status for i in positions]
+        return grid_cluster(self._latitudes[positions], self._longitudes[positions], available,
+                            (min_lon, min_lat, max_lon, max_lat), grid)
+
+    def nearby(self, latitude: float, longitude: float, radius: float, limit: int) -> List[ChargingStation]:
+        """Stations within `radius` meters, sorted by distance, with `distance` set."""
+        candidates = self._query_bounds(*radius_bounds(latitude, longitude, radius))
+        distances = haversine_distance(latitude, longitude, self._latitudes[candidates], self._longitudes[candidates])
+        order = np.argsort(distances, kind="stable")
+        order = order[distances[order] <= radius][:limit]
+        return self._with_distances(candidates[order], distances[order])
+
+    def k_nearest(self, latitude: float, longitude: float, k: int) -> List[ChargingStation]:
+        """The `k` closest stations, sorted by distance, with `distance` set."""
+        if k < 1 or self._spatial() is None:
+            return []
+        # Start with the radius expected to hold k stations at the index's average density.
+        radius = self._spacing * np.sqrt(k / np.pi) * 1.5
+        while True:
+            candidates = self._query_bounds(*radius_bounds(latitude, longitude, radius))
+            distances = haversine_distance(latitude, longitude, self._latitudes[candidates], self._longitudes[candidates])
+            if np.count_nonzero(distances <= radius) >= k or len(candidates) == len(self._ids):
+                break
+            radius *= 4
+        order = np.argsort(distances, kind="stable")[:k]
+        return self._with_distances(candidates[order], distances[order])
+
+
+class InMemoryStationRepository:
+    """
+    Station repository answering queries from a `StationIndex` instead of MongoDB.
+
+    MongoDB stays the source of truth: the index is loaded from `station_collection`,
+    writes go through the wrapped `StationRepository` and are mirrored into the index,
+    and `keep_current` follows changes made by other processes such as the register
+    import. Until the index is loaded, and for queries with a `StationFilter`, queries
+    are delegated to the wrapped repository.
+    """
+    def __init__(self, repository: Optional[StationRepository] = None):
+        self.repository = repository or StationRepository()
+        self.index = StationIndex()
+        self.loaded = False
+
+    async def load(self):
+        """
+        Load (or reload) the index from MongoDB.
+
+        Returns:
+            int: The number of indexed stations, or 0 if MongoDB could not be queried.
+        """
+        try:
+            documents = await station_collection.find({}, STATION_PROJECTION).to_list(None)
+            self.index = StationIndex.from_documents(documents)
+            self.loaded = True
+            return len(self.index)
+        except Exception as e:
+            print(f"Error loading station index: {e}")
+            return 0
+
+    def apply_change(self, change: dict):
+        """Applies a MongoDB change stream event to the index."""
+        operation = change.get("operationType")
+        if operation == "delete":
+            self.index.remove(str(change["documentKey"]["_id"]))
+        elif operation in ("insert", "update", "replace") and change.get("fullDocument"):
+            self.index.upsert_document(change["fullDocument"])
+        elif operation in ("drop", "invalidate"):
+            self.index = StationIndex()
+
+    async def keep_current(self, refresh_seconds: float):
+        """
+        Keep the index in sync with MongoDB for as long as the task runs.
+
+        Follows the collection's change stream; servers without change streams (standalone
+        deployments) fall back to reloading the index every `refresh_seconds`.
+        """
+        try:
+            async with station_collection.watch(full_document="updateLookup") as stream:
+                async for change in stream:
+                    self.apply_change(change)
+        except Exception as e:
+            print(f"Station change stream unavailable, reloading every {refresh_seconds}s: {e}")
+        while True:
+            await asyncio.sleep(refresh_seconds)
+            await self.load()
+
+    async def find_by_postal_code(self, postal_code: PostalCode):
+        if not self.loaded:
+            return await self.repository.find_by_postal_code(postal_code)
+        return self.index.by_postal_code(postal_code.value)
+
+    async def find_page_rows_by_postal_code(self, postal_code: PostalCode, page_size: int, after_id: Optional[ObjectId] = None,
+                                            filters: Optional[StationFilter] = None):
+        if not self.loaded or filters:
+            return await self.repository.find_page_rows_by_postal_code(postal_code, page_size, after_id, filters)
+        stations, has_more = self.index.page_by_postal_code(postal_code.value, page_size, str(after_id) if after_id else None)
+        return [station_to_row(station) for station in stations], has_more
+
+    async def find_rows_by_postal_codes(self, postal_codes: List[PostalCode], filters: Optional[StationFilter] = None):
+        if not self.loaded or filters:
+            return await self.repository.find_rows_by_postal_codes(postal_codes, filters)
+        return [
+            station_to_row(station)
+            for postal_code in sorted({postal_code.value for postal_code in postal_codes})
+            for station in sorted(self.index.by_postal_code(postal_code, limit=len(self.index)), key=lambda s: s.id)
+        ]
+
+    async def find_by_object_id(self, object_id: ObjectId):
+        if not self.loaded:
+            return await self.repository.find_by_object_id(object_id)
+        return self.index.get(str(object_id))
+
+    async def find_nearby(self, coordinates: Coordinates, radius: float, limit: int, filters: Optional[StationFilter] = None):
+        if not self.loaded or filters:
+            return await self.repository.find_nearby(coordinates, radius, limit, filters)
+        return self.index.nearby(coordinates.latitude, coordinates.longitude, radius, limit)
+
+    async def find_k_nearest(self, coordinates: Coordinates, k: int, filters: Optional[StationFilter] = None):
+        if not self.loaded or filters:
+            return await self.repository.find_k_nearest(coordinates, k, filters)
+        return self.index.k_nearest(coordinates.latitude, coordinates.longitude, k)
+
+    async def find_rows_in_bbox(self, bbox: BoundingBox, limit: int, filters: Optional[StationFilter] = None):
+        if not self.loaded or filters:
+            return await self.repository.find_rows_in_bbox(bbox, limit, filters)
+        stations = self.index.in_bbox(*bbox.bounds, limit=limit + 1)
+        return [station_to_row(station) for station in stations[:limit]], len(stations) > limit
+
+    async def cluster_in_bbox(self, bbox: BoundingBox, grid: int, filters: Optional[StationFilter] = None):
+        if not self.loaded or filters:
+            return await self.repository.cluster_in_bbox(bbox, grid, filters)
+        return self.index.cluster_in_bbox(*bbox.bounds, grid)
+
+    async def search_text(self, query: str, postal_code: Optional[PostalCode] = None,
+                          filters: Optional[StationFilter] = None, limit: int = 20):
+        """Full-text search is always answered by MongoDB's text index."""
+        return await self.repository.search_text(query, postal_code, filters, limit)
+
+    async def facets(self, postal_code: Optional[PostalCode] = None, filters: Optional[StationFilter] = None):
+        """Facet counts are always aggregated by MongoDB."""
+        return await self.repository.facets(postal_code, filters)
+
+    async def update_availability_status(self, station_id: str, available: Optional[bool] = None):
+        """
+        Update the availability status in MongoDB and mirror the stored state into the index.
+        """
+        result = await self.repository.update_availability_status(station_id, available)
+        if result is not None:
+            self.index.set_availability(station_id, result.availability_status)
+        return result
+
+    async def bulk_update_availability(self, updates: Dict[ObjectId, bool]):
+        """
+        Update the availability status of many stations in MongoDB and mirror the updated ones into the index.
+        """
+        outcomes = await self.repository.bulk_update_availability(updates)
+        for object_id, (_, outcome) in (outcomes or {}).items():
+            if outcome == "updated":
+                self.index.set_availability(str(object_id), updates[object_id])
+        return outcomes
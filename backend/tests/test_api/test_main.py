@@ -66,7 +66,7 @@ async def test_rate_station(test_client, test_access_token, test_user):
 
 @pytest.mark.asyncio
 async def test_update_availability(test_client, test_access_token, test_user):
-    """Test updating a charging station's availability status."""
+    """Test that updating the availability status of an unknown charging station is rejected."""
     station_id = "123"
     user_id = str(test_user["_id"])
     url = f"/stations/{station_id}/availability?user_id={user_id}"
@@ -74,7 +74,13 @@ async def test_update_availability(test_client, test_access_token, test_user):
         url,
         headers={"Authorization": f"Bearer {test_access_token}"}
     )
-    assert response.status_code == status.HTTP_200_OK 
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = await test_client.post(
+        url,
+        params={"state": "broken"},
+        headers={"Authorization": f"Bearer {test_access_token}"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 @pytest.mark.asyncio
 async def test_get_station_ratings(test_client):
@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import AsyncMock
+from backend.src.charging_station_search import autocomplete_index
+from backend.src.charging_station_search.autocomplete_index import PrefixIndex, StationAutocomplete, normalize_text
+
+
+def station_document(postal_code, name, provider, street):
+    return {"postal_code": postal_code, "name": name, "metadata": {"provider": provider, "street": street}}
+
+
+@pytest.fixture
+def documents():
+    """Create stations of two providers, one of them with register placeholders."""
+    return [
+        station_document("10115", "Allego - Karl-Marx-Allee 1", "Allego GmbH", "Karl-Marx-Allee"),
+        station_document("10117", "Vattenfall Müllerstraße", "Vattenfall Europe", "Müllerstraße"),
+        station_document("10115", "Unknown Name", "Allego GmbH", "Unknown Street"),
+    ]
+
+
+def test_normalize_text():
+    """
+    Test that case, diacritics and punctuation are normalized away.
+    """
+    assert normalize_text("  Karl-Marx-Allee ") == "karl marx allee"
+    assert normalize_text("Müllerstraße") == "mullerstrasse"
+
+
+def test_complete_ranks_value_prefixes_before_word_prefixes(documents):
+    """
+    Test that values starting with the query come first, then values with more stations.
+    """
+    index = PrefixIndex.from_documents(documents)
+
+    assert [(s["type"], s["value"], s["stations"]) for s in index.complete("ALL")] == [
+        ("provider", "Allego GmbH", 2), ("name", "Allego - Karl-Marx-Allee 1", 1), ("street", "Karl-Marx-Allee", 1)
+    ]
+    assert [s["value"] for s in index.complete("101")] == ["10115", "10117"]
+    assert [s["value"] for s in index.complete("muller")] == ["Müllerstraße", "Vattenfall Müllerstraße"]
+    assert index.complete("all", limit=1)[0]["value"] == "Allego GmbH"
+    assert index.complete("xyz") == [] and index.complete(" - ") == []
+
+
+def test_complete_skips_placeholders(documents):
+    """
+    Test that the import's placeholder values are not suggested.
+    """
+    index = PrefixIndex.from_documents(documents)
+
+    assert index.complete("unknown") == []
+    assert len(index) == 8
+
+
+def test_precomputed_prefixes_match_ranking_per_query(documents, monkeypatch):
+    """
+    Test that the suggestions precomputed for large prefix ranges equal those ranked per query.
+    """
+    monkeypatch.setattr(autocomplete_index, "PRECOMPUTED_RANGE", 0)
+    precomputed = PrefixIndex.from_documents(documents)
+    monkeypatch.setattr(autocomplete_index, "PRECOMPUTED_RANGE", 10 ** 9)
+    per_query = PrefixIndex.from_documents(documents)
+
+    assert precomputed._precomputed and not per_query._precomputed
+    for query in ["a", "al", "all", "k", "m", "1", "10", "101", "v", "mul"]:
+        assert precomputed.complete(query) == per_query.complete(query)
+
+
+@pytest.mark.asyncio
+async def test_station_autocomplete_loads_on_first_use(documents, mocker):
+    """
+    Test that the autocomplete builds its index from MongoDB on the first query and remembers the import.
+    """
+    stations = mocker.patch("backend.src.charging_station_search.autocomplete_index.station_collection")
+    stations.find.return_value.to_list = AsyncMock(return_value=documents)
+    imports = mocker.patch("backend.src.charging_station_search.autocomplete_index.import_collection")
+    imports.find_one = AsyncMock(return_value={"completed_at": "2024-01-01"})
+    autocomplete = StationAutocomplete()
+
+    suggestions = await autocomplete.complete("vatt")
+    await autocomplete.complete("all")
+
+    assert [s["value"] for s in suggestions] == ["Vattenfall Europe", "Vattenfall Müllerstraße"]
+    assert autocomplete.import_completed_at == "2024-01-01"
+    stations.find.assert_called_once()
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from datetime import datetime
+import pytest
+from bson import ObjectId
+from backend.src.charging_station_search.charging_station_search_service import AvailabilityChanged
+from backend.src.charging_station_search.availability_broadcaster import AvailabilityBroadcaster
+
+
+def change(station_id="a", postal_code="10115", available=False):
+    return AvailabilityChanged(station_id, postal_code, available, datetime(2024, 5, 1, 12))
+
+
+@pytest.mark.asyncio
+async def test_publish_reaches_only_matching_subscribers():
+    """
+    Test that a change is queued for the subscribers of its station or postal code, once each.
+    """
+    broadcaster = AvailabilityBroadcaster()
+    by_station = broadcaster.subscribe(station_ids=["a"])
+    by_both = broadcaster.subscribe(station_ids=["a"], postal_codes=["10115"])
+    other = broadcaster.subscribe(postal_codes=["12205"])
+
+    assert broadcaster.publish(change()) == 2
+
+    assert (await by_station.get(1))["availability_status"] is False
+    assert (await by_both.get(1))["postal_code"] == "10115"
+    assert by_both.queue.empty()
+    assert await other.get(0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_changes():
+    """
+    Test that a full queue drops its oldest change instead of blocking the broadcaster.
+    """
+    broadcaster = AvailabilityBroadcaster(queue_size=2)
+    subscription = broadcaster.subscribe(station_ids=["a"])
+
+    for available in (True, False, True):
+        broadcaster.publish(change(available=available))
+
+    assert subscription.dropped == 1
+    assert [(await subscription.get(1))["availability_status"] for _ in range(2)] == [False, True]
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_server_sent_events_and_unsubscribes():
+    """
+    Test that the stream encodes changes as SSE events, sends keep-alives and unsubscribes when closed.
+    """
+    broadcaster = AvailabilityBroadcaster()
+    subscription = broadcaster.subscribe(postal_codes=["10115"])
+    stream = broadcaster.stream(subscription, keepalive_seconds=0.01)
+
+    assert (await stream.__anext__()).startswith("retry: ")
+    assert await stream.__anext__() == ": keepalive\n\n"
+    broadcaster.publish(change())
+    event = await stream.__anext__()
+    await stream.aclose()
+
+    event_type, data = event.strip().split("\n")
+    assert event_type == "event: availability"
+    assert json.loads(data[len("data: "):]) == {
+        "id": "a", "postal_code": "10115", "availability_status": False, "timestamp": "2024-05-01T12:00:00",
+    }
+    assert len(broadcaster) == 0 and not broadcaster._by_postal_code
+
+
+@pytest.mark.asyncio
+async def test_thousands_of_idle_subscribers():
+    """
+    Test that thousands of waiting subscribers are served by one publish without polling.
+    """
+    broadcaster = AvailabilityBroadcaster()
+    subscriptions = [broadcaster.subscribe(station_ids=[str(i % 100)]) for i in range(5000)]
+    waiters = [asyncio.ensure_future(subscription.get(5)) for subscription in subscriptions]
+    await asyncio.sleep(0)
+
+    assert broadcaster.publish(change(station_id="7")) == 50
+    done, pending = await asyncio.wait(waiters, timeout=0.5)
+
+    assert len(done) == 50 and len(pending) == 4950
+    for waiter in pending:
+        waiter.cancel()
+
+
+def test_publish_change_event():
+    """
+    Test that a change stream update event is published with the postal code of the full document.
+    """
+    broadcaster = AvailabilityBroadcaster()
+    subscription = broadcaster.subscribe(postal_codes=["10115"])
+    station_id = ObjectId()
+
+    delivered = broadcaster.publish_change_event({
+        "operationType": "update",
+        "documentKey": {"_id": station_id},
+        "updateDescription": {"updatedFields": {"availability_status": True}},
+        "fullDocument": {"_id": station_id, "postal_code": "10115", "availability_status": True},
+    })
+
+    assert delivered == 1
+    assert subscription.queue.get_nowait()["id"] == str(station_id)
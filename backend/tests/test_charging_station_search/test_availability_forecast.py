@@ -0,0 +1,86 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from backend.src.charging_station_search.availability_forecast import OccupancyForecast, hour_of_week
+
+
+def test_hour_of_week():
+    """
+    Test that timestamps map to hours of the week starting on Monday midnight.
+    """
+    starts = [datetime(2024, 4, 29, 0), datetime(2024, 5, 1, 10, 30), datetime(2024, 5, 5, 23)]
+
+    assert hour_of_week(starts).tolist() == [0, 58, 167]
+
+
+def test_forecast_blends_sparse_hours_towards_the_weekly_mean():
+    """
+    Test that well observed hours are forecast from their own history and unobserved hours from the weekly mean.
+    """
+    forecast = OccupancyForecast(prior_hours=1)
+    # Wednesdays 10:00, two weeks fully occupied; Wednesdays 11:00 once, free.
+    forecast.add(["a", "a", "a"], [datetime(2024, 5, 1, 10), datetime(2024, 5, 8, 10), datetime(2024, 5, 1, 11)],
+                 [3600, 3600, 0], [3600, 3600, 3600])
+
+    hours = forecast.forecast("a", datetime(2024, 5, 15, 10, 20), hours=3)
+
+    assert [hour["start"] for hour in hours] == ["2024-05-15T10:00:00", "2024-05-15T11:00:00", "2024-05-15T12:00:00"]
+    assert [hour["occupancy"] for hour in hours] == [pytest.approx(8 / 9, abs=1e-4), pytest.approx(1 / 3, abs=1e-4),
+                                                     pytest.approx(2 / 3, abs=1e-4)]
+    assert hours[0]["free_probability"] == pytest.approx(1 / 9, abs=1e-4)
+    assert [hour["observed_hours"] for hour in hours] == [2, 1, 0]
+    assert forecast.forecast("b", datetime(2024, 5, 15)) is None
+
+
+def test_apply_increments_updates_only_hourly_bins():
+    """
+    Test that event log increments update the profiles incrementally and that daily rollups are ignored.
+    """
+    forecast = OccupancyForecast(prior_hours=0)
+    forecast.add(["a"], [datetime(2024, 5, 1, 10)], [0], [3600])
+
+    forecast.apply_increments({
+        ("a", "hour", datetime(2024, 5, 8, 10)): {"occupied_seconds": 3600.0, "observed_seconds": 3600.0},
+        ("b", "hour", datetime(2024, 5, 8, 10)): {"occupied_seconds": 900.0, "observed_seconds": 1800.0},
+        ("a", "day", datetime(2024, 5, 8)): {"occupied_seconds": 3600.0, "observed_seconds": 86400.0},
+    })
+
+    assert forecast.forecast("a", datetime(2024, 5, 15, 10), hours=1)[0]["occupancy"] == 0.5
+    assert forecast.forecast("b", datetime(2024, 5, 15, 10), hours=1)[0]["occupancy"] == 0.5
+    assert len(forecast) == 2
+
+
+def test_profiles_grow_for_many_stations():
+    """
+    Test that thousands of stations are added in one vectorized call.
+    """
+    forecast = OccupancyForecast()
+    station_ids = [str(i) for i in range(5000)]
+    starts = np.datetime64("2024-05-01T00") + np.arange(5000).astype("timedelta64[h]")
+
+    forecast.add(station_ids, starts, np.full(5000, 1800.0), np.full(5000, 3600.0))
+
+    assert len(forecast) == 5000
+    assert forecast.forecast("4999", datetime(2024, 5, 1), hours=1)[0]["occupancy"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_load_builds_profiles_from_hourly_rollups(mocker):
+    """
+    Test that the profiles are built from the hourly rollups read in batches.
+    """
+    rollups = mocker.patch("backend.src.charging_station_search.availability_forecast.availability_rollup_collection")
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(side_effect=[
+        [{"station_id": "a", "start": datetime(2024, 5, 1, 10), "occupied_seconds": 3600.0, "observed_seconds": 3600.0}],
+        [],
+    ])
+    rollups.find.return_value = cursor
+    forecast = OccupancyForecast()
+
+    await forecast.load()
+
+    assert rollups.find.call_args.args[0] == {"granularity": "hour"}
+    assert forecast.loaded and "a" in forecast
+    assert forecast.forecast("a", datetime(2024, 5, 8, 10), hours=1)[0]["occupancy"] == 1.0
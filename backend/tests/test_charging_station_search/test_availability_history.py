@@ -0,0 +1,210 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from pymongo.errors import BulkWriteError
+from unittest.mock import AsyncMock
+from backend.src.charging_station_search.charging_station_search_service import AvailabilityChanged, PostalCode
+from backend.src.charging_station_search.availability_history import (
+    AvailabilityEventLog, OccupancyRepository, InvalidOccupancyQueryException, split_interval, rollup_increments
+)
+
+
+def event(minute, available, station_id="a"):
+    return {"timestamp": datetime(2024, 5, 1, 10) + timedelta(minutes=minute),
+            "station": {"id": station_id, "postal_code": "10115"}, "availability_status": available}
+
+
+def test_split_interval():
+    """
+    Test that an interval is split into the seconds spent in each hour.
+    """
+    parts = split_interval(datetime(2024, 5, 1, 10, 45), datetime(2024, 5, 1, 12, 15), "hour")
+
+    assert parts == [(datetime(2024, 5, 1, 10), 900.0), (datetime(2024, 5, 1, 11), 3600.0),
+                     (datetime(2024, 5, 1, 12), 900.0)]
+    assert split_interval(datetime(2024, 5, 1, 10), datetime(2024, 5, 1, 10), "day") == []
+
+
+def test_rollup_increments_attribute_time_to_the_previous_state():
+    """
+    Test that the time between events counts as occupied for the hours and days the station was occupied.
+    """
+    last_states = {}
+    increments = rollup_increments([event(30, True), event(45, False), event(135, True)], last_states)
+
+    hour_10 = increments[("a", "hour", datetime(2024, 5, 1, 10))]
+    hour_11 = increments[("a", "hour", datetime(2024, 5, 1, 11))]
+    day = increments[("a", "day", datetime(2024, 5, 1))]
+    assert (hour_10["observed_seconds"], hour_10["occupied_seconds"]) == (1800.0, 900.0)
+    assert (hour_10["reports"], hour_10["changes"]) == (2, 1)
+    assert (hour_11["observed_seconds"], hour_11["occupied_seconds"], hour_11["reports"]) == (3600.0, 3600.0, 0)
+    assert (day["observed_seconds"], day["occupied_seconds"], day["reports"], day["changes"]) == (6300.0, 5400.0, 3, 2)
+    assert last_states == {"a": (True, datetime(2024, 5, 1, 12, 15))}
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_events_and_rollups_in_batches(mocker):
+    """
+    Test that recorded changes are written with one insert and one bulk rollup write per flush.
+    """
+    events = mocker.patch("backend.src.charging_station_search.availability_history.availability_event_collection")
+    events.aggregate.return_value.to_list = AsyncMock(return_value=[
+        {"_id": "a", "availability_status": True, "timestamp": datetime(2024, 5, 1, 9)},
+    ])
+    events.insert_many = AsyncMock()
+    rollups = mocker.patch("backend.src.charging_station_search.availability_history.availability_rollup_collection")
+    rollups.bulk_write = AsyncMock()
+    log = AvailabilityEventLog(batch_size=10)
+
+    log.record(AvailabilityChanged("a", "10115", False, datetime(2024, 5, 1, 10, 30)), reporter="user-1")
+    log.record(AvailabilityChanged("a", "10115", True, datetime(2024, 5, 1, 10, 45)), reporter="user-2")
+
+    assert len(log) == 2 and not events.insert_many.called
+    assert await log.flush() == 2
+
+    [written] = events.insert_many.await_args.args
+    assert [(e["availability_status"], e["reporter"]) for e in written] == [(False, "user-1"), (True, "user-2")]
+    [operations] = rollups.bulk_write.await_args.args
+    updates = {(op._filter["granularity"], op._filter["start"]): op._doc["$inc"] for op in operations}
+    assert updates[("hour", datetime(2024, 5, 1, 9))]["observed_seconds"] == 3600.0
+    assert updates[("hour", datetime(2024, 5, 1, 10))]["occupied_seconds"] == 900.0
+    assert all(op._upsert for op in operations)
+    assert len(log) == 0 and log.written == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_events_queued(mocker):
+    """
+    Test that events stay queued when MongoDB cannot be written.
+    """
+    events = mocker.patch("backend.src.charging_station_search.availability_history.availability_event_collection")
+    events.aggregate.return_value.to_list = AsyncMock(return_value=[])
+    events.insert_many = AsyncMock(side_effect=Exception("MongoDB unavailable"))
+    log = AvailabilityEventLog()
+
+    log.record(AvailabilityChanged("a", "10115", False, datetime(2024, 5, 1, 10)))
+
+    assert await log.flush() == 0
+    assert len(log) == 1
+
+
+@pytest.mark.asyncio
+async def test_partially_failed_flush_requeues_only_unwritten_events(mocker):
+    """
+    Test that only the events an unordered insert did not write with a retryable error are queued again.
+    """
+    events = mocker.patch("backend.src.charging_station_search.availability_history.availability_event_collection")
+    events.aggregate.return_value.to_list = AsyncMock(return_value=[])
+    events.insert_many = AsyncMock(side_effect=[
+        BulkWriteError({"writeErrors": [{"index": 1, "code": 91, "errmsg": "shutdown in progress"},
+                                        {"index": 2, "code": 121, "errmsg": "document failed validation"}]}),
+        None,
+    ])
+    rollups = mocker.patch("backend.src.charging_station_search.availability_history.availability_rollup_collection")
+    rollups.bulk_write = AsyncMock()
+    log = AvailabilityEventLog()
+
+    log.record(AvailabilityChanged("a", "10115", False, datetime(2024, 5, 1, 10)))
+    log.record(AvailabilityChanged("b", "10115", True, datetime(2024, 5, 1, 10, 15)))
+    log.record(AvailabilityChanged("c", "10115", True, datetime(2024, 5, 1, 10, 20)))
+    log.record(AvailabilityChanged("a", "10115", True, datetime(2024, 5, 1, 10, 30)))
+
+    assert await log.flush() == 2
+    assert [e["station"]["id"] for e in log._pending] == ["b"] and log.dropped == 1
+    assert await log.flush() == 1
+    assert [e["station"]["id"] for e in events.insert_many.await_args.args[0]] == ["b"]
+    assert len(log) == 0 and log.written == 3
+
+
+@pytest.mark.asyncio
+async def test_partially_failed_flush_rolls_up_events_in_order(mocker):
+    """
+    Test that events written after a retried one are rolled up with it, in timestamp order.
+    """
+    events = mocker.patch("backend.src.charging_station_search.availability_history.availability_event_collection")
+    events.aggregate.return_value.to_list = AsyncMock(return_value=[])
+    events.insert_many = AsyncMock(side_effect=[
+        BulkWriteError({"writeErrors": [{"index": 1, "code": 189, "errmsg": "primary stepped down"}]}), None,
+    ])
+    rollups = mocker.patch("backend.src.charging_station_search.availability_history.availability_rollup_collection")
+    rollups.bulk_write = AsyncMock()
+    log = AvailabilityEventLog()
+
+    log.record(AvailabilityChanged("a", "10115", True, datetime(2024, 5, 1, 10)))
+    log.record(AvailabilityChanged("a", "10115", False, datetime(2024, 5, 1, 10, 5)))
+    log.record(AvailabilityChanged("a", "10115", True, datetime(2024, 5, 1, 10, 10)))
+    await log.flush()
+    await log.flush()
+
+    totals = {}
+    for call in rollups.bulk_write.await_args_list:
+        for op in call.args[0]:
+            if op._filter["granularity"] == "hour":
+                for field, value in op._doc["$inc"].items():
+                    totals[field] = totals.get(field, 0) + value
+    assert totals == {"occupied_seconds": 300.0, "observed_seconds": 600.0, "reports": 3, "changes": 2}
+    assert not log._unrolled and log.written == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_rollup_write_is_retried_with_the_next_flush(mocker):
+    """
+    Test that rollup increments that could not be written are retried once, merged with the next batch.
+    """
+    events = mocker.patch("backend.src.charging_station_search.availability_history.availability_event_collection")
+    events.aggregate.return_value.to_list = AsyncMock(return_value=[])
+    events.insert_many = AsyncMock()
+    rollups = mocker.patch("backend.src.charging_station_search.availability_history.availability_rollup_collection")
+    rollups.bulk_write = AsyncMock(side_effect=[Exception("MongoDB unavailable"), None])
+    log = AvailabilityEventLog()
+    listener = mocker.Mock()
+    log.rollup_listeners.append(listener)
+
+    log.record(AvailabilityChanged("a", "10115", False, datetime(2024, 5, 1, 10)))
+    log.record(AvailabilityChanged("a", "10115", True, datetime(2024, 5, 1, 10, 30)))
+    assert await log.flush() == 2
+    assert not listener.called
+
+    log.record(AvailabilityChanged("a", "10115", False, datetime(2024, 5, 1, 10, 45)))
+    assert await log.flush() == 1
+
+    [operations] = rollups.bulk_write.await_args.args
+    updates = {(op._filter["granularity"], op._filter["start"]): op._doc["$inc"] for op in operations}
+    assert updates[("hour", datetime(2024, 5, 1, 10))] == {"occupied_seconds": 1800.0, "observed_seconds": 2700.0,
+                                                           "reports": 3, "changes": 2}
+    assert listener.call_count == 1 and not log._pending_rollups
+
+
+def test_occupancy_window():
+    """
+    Test that the occupancy window defaults to the last day of hours and rejects empty or overlong windows.
+    """
+    start, end = OccupancyRepository.window("hour", end=datetime(2024, 5, 2))
+    assert (start, end) == (datetime(2024, 5, 1), datetime(2024, 5, 2))
+    start, _ = OccupancyRepository.window("day", datetime(2024, 5, 1, 13, tzinfo=timezone.utc), datetime(2024, 5, 9))
+    assert start.tzinfo is None and start.hour == 0
+
+    for granularity, start, end in [("week", None, None), ("hour", datetime(2024, 5, 2), datetime(2024, 5, 1)),
+                                    ("hour", datetime(2024, 1, 1), datetime(2024, 5, 1))]:
+        with pytest.raises(InvalidOccupancyQueryException):
+            OccupancyRepository.window(granularity, start, end)
+
+
+@pytest.mark.asyncio
+async def test_postal_code_occupancy_groups_station_rollups(mocker):
+    """
+    Test that the occupancy of a postal code sums the station rollups per bucket.
+    """
+    rollups = mocker.patch("backend.src.charging_station_search.availability_history.availability_rollup_collection")
+    rollups.aggregate.return_value.to_list = AsyncMock(return_value=[{
+        "_id": datetime(2024, 5, 1, 10), "occupied_seconds": 1800.0, "observed_seconds": 7200.0,
+        "reports": 3, "changes": 2, "stations": 2,
+    }])
+
+    buckets = await OccupancyRepository().postal_code_occupancy(
+        PostalCode("10115"), "hour", datetime(2024, 5, 1), datetime(2024, 5, 2)
+    )
+
+    [pipeline] = rollups.aggregate.call_args.args
+    assert pipeline[0]["$match"]["postal_code"] == "10115" and pipeline[0]["$match"]["granularity"] == "hour"
+    assert buckets == [{"start": "2024-05-01T10:00:00", "occupied_seconds": 1800.0, "observed_seconds": 7200.0,
+                        "occupancy": 0.25, "reports": 3, "changes": 2, "stations": 2}]
@@ -1,9 +1,14 @@
 from datetime import datetime
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 from backend.src.charging_station_search.charging_station_search_service import (
-    PostalCode, ChargingStation, SearchResult, ChargingStationSearched, InvalidPostalCodeException
+    PostalCode, ChargingStation, SearchResult, ChargingStationSearched, InvalidPostalCodeException,
+    Coordinates, InvalidCoordinatesException, InvalidPageException, encode_page_cursor, decode_page_cursor,
+    StationRowsResult, station_to_row, BatchSearchResult, BoundingBox, InvalidSearchQueryException, StationFilter,
+    AvailabilityChanged
 )
+from backend.src.charging_station_search.district_repository import DistrictRepository, UnknownDistrictException
+from backend.src.charging_station_search.cluster_repository import ClusterRepository
 from bson import ObjectId
 from backend.src.charging_station_search.charging_station_search_service import StationSearchService, StationRepository
 from backend.db.mongo_client import station_collection
@@ -290,25 +295,677 @@ async def test_find_by_object_id_exception():
     assert result is None
 
 @pytest.mark.asyncio
-async def test_update_availability_status_station_not_found():
+async def test_update_availability_status_station_not_found(mocker):
     """
     Test updating availability status when station is not found.
     """
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.find_one_and_update = AsyncMock(return_value=None)
     station_id = str(ObjectId())
     repository = StationRepository()
-    repository.find_by_object_id = AsyncMock(return_value=None)
     
     result = await repository.update_availability_status(station_id)
-    assert result == []
+    assert result is None
+    assert await repository.update_availability_status("123") is None
 
 @pytest.mark.asyncio
-async def test_update_availability_status_exception():
+async def test_update_availability_status_exception(mocker):
     """
-    Test that update_availability_status handles exceptions gracefully.
+    Test that update_availability_status propagates database errors instead of reporting a missing station.
     """
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.find_one_and_update = AsyncMock(side_effect=Exception("Database Error"))
     station_id = str(ObjectId())
     repository = StationRepository()
-    repository.find_by_object_id = AsyncMock(side_effect=Exception("Database Error"))
     
-    result = await repository.update_availability_status(station_id)
-    assert result == []
\ No newline at end of file
+    with pytest.raises(Exception, match="Database Error"):
+        await repository.update_availability_status(station_id)
+
+@pytest.mark.asyncio
+async def test_search_nearby():
+    """
+    Test that a nearby search validates its input and returns the repository's stations.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.find_nearby.return_value = [
+        ChargingStation(id="1", location="52.52, 13.405", postal_code=PostalCode("10115"),
+                        availability_status=True, distance=12.5)
+    ]
+    service = StationSearchService(repository_mock)
+
+    stations = await service.search_nearby(52.52, 13.405, radius=500, limit=5)
+
+    assert [station.distance for station in stations] == [12.5]
+    repository_mock.find_nearby.assert_awaited_once_with(Coordinates(52.52, 13.405), 500, 5, None)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("latitude, longitude, radius, limit", [
+    (91, 13.4, 1000, 20), (52.5, 181, 1000, 20), (52.5, 13.4, 0, 20), (52.5, 13.4, 1000, 0),
+])
+async def test_search_nearby_invalid_input(latitude, longitude, radius, limit):
+    """
+    Test that invalid positions, radii and limits raise an InvalidCoordinatesException.
+    """
+    service = StationSearchService(AsyncMock(spec=StationRepository))
+
+    with pytest.raises(InvalidCoordinatesException):
+        await service.search_nearby(latitude, longitude, radius, limit)
+
+@pytest.mark.asyncio
+async def test_search_nearest():
+    """
+    Test that a k-nearest search validates k and asks the repository for the k closest stations.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.find_k_nearest.return_value = []
+    service = StationSearchService(repository_mock)
+
+    assert await service.search_nearest(52.52, 13.405, k=3) == []
+    repository_mock.find_k_nearest.assert_awaited_once_with(Coordinates(52.52, 13.405), 3, None)
+    with pytest.raises(InvalidCoordinatesException):
+        await service.search_nearest(52.52, 13.405, k=0)
+
+@pytest.mark.asyncio
+async def test_find_nearby_uses_geo_near(mocker):
+    """
+    Test that find_nearby runs a $geoNear aggregation and maps the distance onto the stations.
+    """
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.aggregate.return_value.to_list = AsyncMock(return_value=[{
+        "_id": ObjectId(), "postal_code": "10115", "availability_status": True,
+        "location": {"latitude": 52.52, "longitude": 13.405}, "name": "Near", "distance": 42.0,
+    }])
+
+    stations = await StationRepository().find_nearby(Coordinates(52.52, 13.405), 1000, 3)
+
+    [pipeline] = collection.aggregate.call_args.args
+    assert pipeline[0]["$geoNear"]["near"] == {"type": "Point", "coordinates": [13.405, 52.52]}
+    assert pipeline[0]["$geoNear"]["maxDistance"] == 1000
+    assert pipeline[1] == {"$limit": 3}
+    assert stations[0].distance == 42.0
+    assert stations[0].name == "Near"
+
+    await StationRepository().find_k_nearest(Coordinates(52.52, 13.405), 5)
+    [pipeline] = collection.aggregate.call_args.args
+    assert "maxDistance" not in pipeline[0]["$geoNear"] and pipeline[1] == {"$limit": 5}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size, cursor", [
+    (0, None), (501, None), (10, "not-a-cursor"), (10, encode_page_cursor("10117", str(ObjectId()))),
+])
+async def test_search_rows_by_postal_code_invalid_page(page_size, cursor):
+    """
+    Test that invalid page sizes, malformed cursors and cursors of another postal code are rejected.
+    """
+    service = StationSearchService(AsyncMock(spec=StationRepository))
+
+    with pytest.raises(InvalidPageException):
+        await service.search_rows_by_postal_code("10115", page_size=page_size, cursor=cursor)
+
+@pytest.mark.asyncio
+async def test_find_page_rows_by_postal_code_is_a_bounded_keyset_query(mocker):
+    """
+    Test that a page is fetched with a projection, an _id range, a sort on _id and a limit of one extra row.
+    """
+    after_id = ObjectId()
+    documents = [{"_id": ObjectId(), "postal_code": "10115", "availability_status": True,
+                  "location": {"latitude": 52.5, "longitude": 13.4}} for _ in range(3)]
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    cursor = collection.find.return_value.sort.return_value.limit.return_value
+    cursor.to_list = AsyncMock(return_value=documents)
+
+    rows, has_more = await StationRepository().find_page_rows_by_postal_code(PostalCode("10115"), 2, after_id)
+
+    query, projection = collection.find.call_args.args
+    assert query == {"postal_code": "10115", "_id": {"$gt": after_id}}
+    assert "metadata" not in projection
+    collection.find.return_value.sort.assert_called_once_with("_id", 1)
+    collection.find.return_value.sort.return_value.limit.assert_called_once_with(3)
+    assert len(rows) == 2
+    assert has_more
+
+@pytest.mark.asyncio
+async def test_find_page_rows_by_postal_code_returns_trusted_rows(mocker):
+    """
+    Test that the lean path returns projected rows with numeric coordinates without validating postal codes.
+    """
+    object_id = ObjectId()
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.find.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=[{
+        "_id": object_id, "postal_code": "99999", "availability_status": True,
+        "location": {"latitude": 52.5, "longitude": 13.4},
+    }])
+
+    rows, has_more = await StationRepository().find_page_rows_by_postal_code(PostalCode("10115"), 10)
+
+    assert rows == [{"id": str(object_id), "postal_code": "99999", "availability_status": True,
+                     "location": {"latitude": 52.5, "longitude": 13.4}, "name": "Unknown Name"}]
+    assert not has_more
+
+@pytest.mark.asyncio
+async def test_search_rows_by_postal_code():
+    """
+    Test that the lean search validates the requested code once and pages over rows.
+    """
+    ids = [str(ObjectId()) for _ in range(2)]
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.find_page_rows_by_postal_code.return_value = ([{"id": station_id} for station_id in ids], True)
+    service = StationSearchService(repository_mock)
+
+    result = await service.search_rows_by_postal_code("10115", page_size=2)
+    await service.search_rows_by_postal_code("10115", page_size=2, cursor=result.next_cursor)
+
+    assert isinstance(result, StationRowsResult)
+    assert result.event.stations_found == 2
+    assert decode_page_cursor(result.next_cursor, "10115") == ObjectId(ids[1])
+    assert [call.args[2] for call in repository_mock.find_page_rows_by_postal_code.await_args_list] == [None, ObjectId(ids[1])]
+    with pytest.raises(InvalidPostalCodeException):
+        await service.search_rows_by_postal_code("99999")
+
+def test_station_to_row():
+    """
+    Test that a ChargingStation is converted into a row with numeric coordinates and an optional distance.
+    """
+    station = ChargingStation(id="1", location="52.5, 13.4", postal_code=PostalCode("10115"),
+                              availability_status=False, name="A", distance=5.0, latitude=52.5, longitude=13.4)
+
+    assert station_to_row(station) == {
+        "id": "1", "postal_code": "10115", "availability_status": False,
+        "location": {"latitude": 52.5, "longitude": 13.4}, "name": "A", "power_kw": None,
+        "charging_type": None, "charge_points": None, "connectors": None, "distance_m": 5.0,
+    }
+
+@pytest.mark.asyncio
+async def test_search_by_postal_codes_groups_one_query():
+    """
+    Test that a batch search runs one repository query and groups the rows by requested code.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.find_rows_by_postal_codes.return_value = [
+        {"id": "1", "postal_code": "10115"}, {"id": "2", "postal_code": "10115"}, {"id": "3", "postal_code": "10119"},
+    ]
+    service = StationSearchService(repository_mock)
+
+    result = await service.search_by_postal_codes(["10119", "10115", "10117", "10115"])
+
+    assert isinstance(result, BatchSearchResult)
+    assert list(result.groups) == ["10119", "10115", "10117"]
+    assert {code: len(rows) for code, rows in result.groups.items()} == {"10119": 1, "10115": 2, "10117": 0}
+    assert result.event.stations_found == 3
+    postal_codes, _ = repository_mock.find_rows_by_postal_codes.await_args.args
+    assert [postal_code.value for postal_code in postal_codes] == ["10119", "10115", "10117"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codes", [[], ["10115", "99999"], [str(10000 + i) for i in range(201)]])
+async def test_search_by_postal_codes_invalid(codes):
+    """
+    Test that empty, oversized and partly invalid batches are rejected before querying.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    service = StationSearchService(repository_mock)
+
+    with pytest.raises(InvalidPostalCodeException):
+        await service.search_by_postal_codes(codes)
+    repository_mock.find_rows_by_postal_codes.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_find_rows_by_postal_codes_uses_one_in_query(mocker):
+    """
+    Test that the repository fetches all codes with a single projected $in query.
+    """
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.find.return_value.sort.return_value.to_list = AsyncMock(return_value=[])
+
+    await StationRepository().find_rows_by_postal_codes([PostalCode("10115"), PostalCode("10117")])
+
+    query, projection = collection.find.call_args.args
+    assert query == {"postal_code": {"$in": ["10115", "10117"]}}
+    assert "metadata" not in projection
+    collection.find.assert_called_once()
+
+@pytest.fixture
+def district_repository(tmp_path):
+    """Create a district repository over two districts and three postal code areas."""
+    plz_path, districts_path = tmp_path / "plz.csv", tmp_path / "dis.csv"
+    plz_path.write_text("PLZ;geometry\n"
+                        "10115;POLYGON ((0 0, 1 0, 1 1, 0 1, 0 0))\n"
+                        "10117;POLYGON ((1 0, 2 0, 2 1, 1 1, 1 0))\n"
+                        "10119;POLYGON ((0 1, 2 1, 2 2, 0 2, 0 1))\n")
+    districts_path.write_text("Bezirk;geometry\n"
+                              "Mitte;POLYGON ((0 0, 1 0, 1 2, 0 2, 0 0))\n"
+                              "Friedrichshain-Kreuzberg;POLYGON ((1 0, 2 0, 2 2, 1 2, 1 0))\n")
+    return DistrictRepository(str(plz_path), str(districts_path))
+
+def test_district_repository(district_repository):
+    """
+    Test that districts resolve case-insensitively to the postal codes overlapping them.
+    """
+    assert district_repository.districts() == ["Friedrichshain-Kreuzberg", "Mitte"]
+    assert district_repository.postal_codes(" mitte ") == ["10115", "10119"]
+    assert district_repository.postal_codes("Friedrichshain-Kreuzberg") == ["10117", "10119"]
+    with pytest.raises(UnknownDistrictException):
+        district_repository.postal_codes("Atlantis")
+
+@pytest.mark.asyncio
+async def test_search_by_district(district_repository):
+    """
+    Test that a district search resolves the district and searches its postal codes.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.find_rows_by_postal_codes.return_value = []
+    service = StationSearchService(repository_mock, district_repository=district_repository)
+
+    result = await service.search_by_district("MITTE")
+
+    assert result.event.district == "Mitte"
+    assert list(result.groups) == ["10115", "10119"]
+
+@pytest.mark.parametrize("corners", [
+    (13.5, 52.4, 13.3, 52.6),    # west edge east of the east edge
+    (13.3, 52.6, 13.5, 52.4),    # south edge north of the north edge
+    (-100.0, 0.0, 100.0, 1.0),   # a hemisphere or more
+    (13.3, 52.4, 13.5, 95.0),    # invalid latitude
+])
+def test_bounding_box_invalid(corners):
+    """
+    Test that inverted, too large or out-of-range bounding boxes are rejected.
+    """
+    with pytest.raises(InvalidCoordinatesException):
+        BoundingBox(*corners)
+
+def test_bounding_box_to_geojson():
+    """
+    Test that a bounding box converts to a closed GeoJSON polygon.
+    """
+    ring = BoundingBox(13.3, 52.4, 13.5, 52.6).to_geojson()["coordinates"][0]
+
+    assert ring[0] == ring[-1] == [13.3, 52.4]
+    assert [13.5, 52.6] in ring
+
+@pytest.mark.asyncio
+async def test_search_in_bbox_returns_stations():
+    """
+    Test that a viewport holding no more than the limit returns its stations.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    rows = [{"id": "1", "postal_code": "10115"}]
+    repository_mock.find_rows_in_bbox.return_value = (rows, False)
+    service = StationSearchService(repository_mock)
+
+    result = await service.search_in_bbox(13.3, 52.4, 13.5, 52.6, limit=10, cluster=True)
+
+    assert result.stations == rows and result.clusters == [] and not result.truncated
+    repository_mock.find_rows_in_bbox.assert_awaited_once_with(BoundingBox(13.3, 52.4, 13.5, 52.6), 10, None)
+    repository_mock.cluster_in_bbox.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_search_in_bbox_clusters_truncated_viewports():
+    """
+    Test that a viewport holding more than the limit is clustered only if requested.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.find_rows_in_bbox.return_value = ([{"id": "1"}], True)
+    repository_mock.cluster_in_bbox.return_value = [{"cell": [0, 0], "count": 3}]
+    service = StationSearchService(repository_mock)
+
+    clustered = await service.search_in_bbox(13.3, 52.4, 13.5, 52.6, limit=1, cluster=True, grid=8)
+    limited = await service.search_in_bbox(13.3, 52.4, 13.5, 52.6, limit=1)
+
+    assert clustered.stations == [] and clustered.clusters == [{"cell": [0, 0], "count": 3}] and clustered.truncated
+    repository_mock.cluster_in_bbox.assert_awaited_once_with(BoundingBox(13.3, 52.4, 13.5, 52.6), 8, None)
+    assert limited.stations == [{"id": "1"}] and limited.truncated
+
+@pytest.mark.asyncio
+async def test_find_rows_in_bbox_uses_geo_within(mocker):
+    """
+    Test that the repository queries the `geo` index and fetches one extra row to detect truncation.
+    """
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    documents = [{"_id": ObjectId(), "postal_code": "10115", "availability_status": True,
+                  "location": {"latitude": 52.5, "longitude": 13.4}} for _ in range(3)]
+    collection.find.return_value.limit.return_value.to_list = AsyncMock(return_value=documents)
+    bbox = BoundingBox(13.3, 52.4, 13.5, 52.6)
+
+    rows, truncated = await StationRepository().find_rows_in_bbox(bbox, 2)
+
+    query, _ = collection.find.call_args.args
+    assert query == {"geo": {"$geoWithin": {"$geometry": bbox.to_geojson()}}}
+    collection.find.return_value.limit.assert_called_once_with(3)
+    assert len(rows) == 2 and truncated
+
+@pytest.mark.asyncio
+async def test_search_clusters():
+    """
+    Test that a cluster search validates the zoom level and viewport size before reading the clusters.
+    """
+    cluster_repository = AsyncMock(spec=ClusterRepository)
+    cluster_repository.max_zoom = 16
+    cluster_repository.cell_count = ClusterRepository.cell_count
+    cluster_repository.find_clusters.return_value = [{"cell": [0, 0], "count": 3}]
+    service = StationSearchService(AsyncMock(spec=StationRepository), cluster_repository=cluster_repository)
+
+    clusters = await service.search_clusters(13.3, 52.4, 13.5, 52.6, 12)
+
+    assert clusters == [{"cell": [0, 0], "count": 3}]
+    cluster_repository.find_clusters.assert_awaited_once_with((13.3, 52.4, 13.5, 52.6), 12)
+    with pytest.raises(InvalidCoordinatesException):
+        await service.search_clusters(13.3, 52.4, 13.5, 52.6, 17)
+    with pytest.raises(InvalidCoordinatesException):
+        await service.search_clusters(5.0, 47.0, 15.0, 55.0, 16)
+
+@pytest.mark.asyncio
+async def test_find_clusters_queries_the_cell_range(mocker):
+    """
+    Test that the cluster repository queries the cells of the zoom level and derives mean positions.
+    """
+    collection = mocker.patch("backend.src.charging_station_search.cluster_repository.station_cluster_collection")
+    collection.find.return_value.to_list = AsyncMock(return_value=[
+        {"zoom": 12, "x": 8801, "y": 5375, "count": 2, "lat_sum": 105.0, "lon_sum": 26.8},
+        {"zoom": 12, "x": 8800, "y": 5375, "count": 1, "lat_sum": 52.5, "lon_sum": 13.3},
+    ])
+
+    clusters = await ClusterRepository().find_clusters((13.3, 52.4, 13.5, 52.6), 12)
+
+    query = collection.find.call_args.args[0]
+    assert query["zoom"] == 12 and query["x"] == {"$gte": 8797, "$lte": 8806} and query["count"] == {"$gt": 0}
+    assert [cluster["cell"] for cluster in clusters] == [[8800, 5375], [8801, 5375]]
+    assert clusters[1] == {"zoom": 12, "cell": [8801, 5375], "count": 2, "latitude": 52.5, "longitude": 13.4}
+
+@pytest.mark.asyncio
+async def test_search_text_caches_popular_queries():
+    """
+    Test that a repeated text search is served from the cache with the availability reported since.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.search_text.return_value = [{"id": "1", "score": 2.5, "availability_status": True},
+                                                {"id": "6650f1e2a1b2c3d4e5f60002", "score": 1.5, "availability_status": True},
+                                                {"id": "3", "score": 0.5, "availability_status": True}]
+    repository_mock.update_availability_status.return_value = AvailabilityChanged("1", "10178", False, datetime.now())
+    repository_mock.bulk_update_availability.return_value = {ObjectId("6650f1e2a1b2c3d4e5f60002"): ("10178", "updated")}
+    service = StationSearchService(repository_mock)
+
+    first = await service.search_text("  Schnelllader   Alexanderplatz ", postal_code="10178", filters=StationFilter(min_kw=50))
+    await service.update_availability_status("1", "occupied")
+    await service.bulk_update_availability([{"station_id": "6650f1e2a1b2c3d4e5f60002", "state": "occupied"}])
+    second = await service.search_text("schnelllader alexanderplatz", postal_code="10178", filters=StationFilter(min_kw=50))
+
+    assert not first.cached and second.cached
+    assert [station["availability_status"] for station in first.stations] == [True, True, True]
+    assert [station["availability_status"] for station in second.stations] == [False, False, True]
+    repository_mock.search_text.assert_awaited_once_with(
+        "Schnelllader Alexanderplatz", PostalCode("10178"), StationFilter(min_kw=50), 20
+    )
+
+@pytest.mark.parametrize("query, filters", [
+    ("   ", {}),
+    ("x" * 101, {}),
+    ("lader", {"limit": 0}),
+])
+@pytest.mark.asyncio
+async def test_search_text_invalid(query, filters):
+    """
+    Test that empty or overlong queries and invalid limits are rejected.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    service = StationSearchService(repository_mock)
+
+    with pytest.raises(InvalidSearchQueryException):
+        await service.search_text(query, **filters)
+    repository_mock.search_text.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_repository_search_text_ranks_by_text_score(mocker):
+    """
+    Test that the repository combines the $text query with the filters and sorts by text score.
+    """
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    cursor = collection.find.return_value.sort.return_value.limit.return_value
+    cursor.to_list = AsyncMock(return_value=[{"_id": ObjectId(), "postal_code": "10178", "score": 1.5, "power_kw": 150.0}])
+
+    rows = await StationRepository().search_text("schnelllader", PostalCode("10178"), StationFilter(min_kw=50), 10)
+
+    query, projection = collection.find.call_args.args
+    assert query == {"$text": {"$search": "schnelllader"}, "postal_code": "10178", "power_kw": {"$gte": 50}}
+    assert projection["score"] == {"$meta": "textScore"}
+    collection.find.return_value.sort.assert_called_once_with([("score", {"$meta": "textScore"})])
+    assert rows[0]["score"] == 1.5 and rows[0]["power_kw"] == 150.0 and "id" in rows[0]
+
+def test_station_filter_to_query():
+    """
+    Test that a station filter translates into MongoDB conditions on the typed attributes.
+    """
+    filters = StationFilter(min_kw=50, max_kw=150, charging_type="Schnellladeeinrichtung",
+                            connector="DC Kupplung Combo", min_charge_points=2)
+
+    assert filters.to_query() == {
+        "power_kw": {"$gte": 50, "$lte": 150},
+        "charging_type": "Schnellladeeinrichtung",
+        "connectors": "DC Kupplung Combo",
+        "charge_points": {"$gte": 2},
+    }
+    assert StationFilter(max_kw=22).to_query() == {"power_kw": {"$lte": 22}}
+    assert not StationFilter() and StationFilter(connector="Typ2")
+
+@pytest.mark.parametrize("bounds", [{"min_kw": 50, "max_kw": 22}, {"min_kw": -1}, {"min_charge_points": -2}])
+def test_station_filter_invalid(bounds):
+    """
+    Test that negative bounds and empty power ranges are rejected.
+    """
+    with pytest.raises(InvalidSearchQueryException):
+        StationFilter(**bounds)
+
+@pytest.mark.asyncio
+async def test_repository_queries_apply_filters(mocker):
+    """
+    Test that the postal code, batch and nearby queries evaluate the filters in MongoDB.
+    """
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.find.return_value.sort.return_value.limit.return_value.to_list = AsyncMock(return_value=[])
+    collection.find.return_value.sort.return_value.to_list = AsyncMock(return_value=[])
+    collection.aggregate.return_value.to_list = AsyncMock(return_value=[])
+    filters = StationFilter(min_kw=50, charging_type="Schnellladeeinrichtung")
+    conditions = {"power_kw": {"$gte": 50}, "charging_type": "Schnellladeeinrichtung"}
+    repository = StationRepository()
+
+    await repository.find_page_rows_by_postal_code(PostalCode("10115"), 10, filters=filters)
+    page_query = collection.find.call_args.args[0]
+    await repository.find_rows_by_postal_codes([PostalCode("10115")], filters)
+    batch_query = collection.find.call_args.args[0]
+    await repository.find_nearby(Coordinates(52.52, 13.405), 1000, 3, filters)
+
+    assert page_query == {"postal_code": "10115", **conditions}
+    assert batch_query == {"postal_code": {"$in": ["10115"]}, **conditions}
+    [pipeline] = collection.aggregate.call_args.args
+    assert pipeline[0]["$geoNear"]["query"] == conditions
+
+@pytest.mark.asyncio
+async def test_search_in_bbox_passes_filters():
+    """
+    Test that the viewport search passes the filters to both the station and the cluster query.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.find_rows_in_bbox.return_value = ([{"id": "1"}], True)
+    repository_mock.cluster_in_bbox.return_value = [{"cell": [0, 0], "count": 3}]
+    service = StationSearchService(repository_mock)
+    filters = StationFilter(connector="DC Kupplung Combo")
+
+    await service.search_in_bbox(13.3, 52.4, 13.5, 52.6, limit=1, cluster=True, grid=8, filters=filters)
+
+    repository_mock.find_rows_in_bbox.assert_awaited_once_with(BoundingBox(13.3, 52.4, 13.5, 52.6), 1, filters)
+    repository_mock.cluster_in_bbox.assert_awaited_once_with(BoundingBox(13.3, 52.4, 13.5, 52.6), 8, filters)
+
+@pytest.mark.asyncio
+async def test_repository_facets_counts_in_one_aggregation(mocker):
+    """
+    Test that the facets are counted by a single filtered $facet aggregation.
+    """
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.aggregate.return_value.to_list = AsyncMock(return_value=[{
+        "totals": [{"_id": None, "stations": 3, "available": 2, "charge_points": 5}],
+        "charging_types": [{"_id": "Schnellladeeinrichtung", "stations": 3, "available": 2, "charge_points": 5}],
+        "connectors": [{"_id": "DC Kupplung Combo", "stations": 2, "available": 1, "charge_points": 4}],
+        "postal_codes": [{"_id": "10115", "stations": 3, "available": 2, "charge_points": 5}],
+    }])
+
+    facets = await StationRepository().facets(PostalCode("10115"), StationFilter(min_kw=50))
+
+    [pipeline] = collection.aggregate.call_args.args
+    assert pipeline[0] == {"$match": {"postal_code": "10115", "power_kw": {"$gte": 50}}}
+    assert set(pipeline[1]["$facet"]) == {"totals", "charging_types", "connectors", "postal_codes"}
+    assert facets["totals"] == {"stations": 3, "available": 2, "charge_points": 5}
+    assert facets["connectors"] == [{"value": "DC Kupplung Combo", "stations": 2, "available": 1, "charge_points": 4}]
+
+class AtomicStationCollection:
+    """
+    In-memory stand-in for `station_collection` that yields to the event loop inside every
+    operation, like a network round trip, and applies each single-document write atomically.
+    """
+    def __init__(self, station_id, availability_status=True):
+        self.documents = {station_id: {"_id": station_id, "postal_code": "10115",
+                                       "availability_status": availability_status}}
+
+    async def find_one(self, query, projection=None):
+        await asyncio.sleep(0)
+        return dict(self.documents[query["_id"]]) if query["_id"] in self.documents else None
+
+    async def update_one(self, query, update):
+        await asyncio.sleep(0)
+        self.documents[query["_id"]].update(update["$set"])
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=None):
+        await asyncio.sleep(0)
+        document = self.documents.get(query["_id"])
+        if document is None:
+            return None
+        if isinstance(update, list):
+            document["availability_status"] = not document["availability_status"]
+        else:
+            document.update(update["$set"])
+        return dict(document)
+
+@pytest.mark.asyncio
+async def test_concurrent_availability_reports_lose_no_updates(mocker):
+    """
+    Test that hundreds of parallel availability reports are all applied, each seeing its own result.
+    """
+    station_id = ObjectId()
+    collection = AtomicStationCollection(station_id)
+    mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection", collection)
+    service = StationSearchService(StationRepository())
+
+    changes = await asyncio.gather(*(service.update_availability_status(str(station_id)) for _ in range(501)))
+    toggles = [change.availability_status for change in changes]
+
+    assert collection.documents[station_id]["availability_status"] is False
+    assert toggles.count(False) == 251 and toggles.count(True) == 250
+
+    reports = await asyncio.gather(*(
+        service.update_availability_status(str(station_id), "occupied" if i % 3 else "free") for i in range(300)
+    ))
+
+    assert [change.availability_status for change in reports] == [i % 3 == 0 for i in range(300)]
+    assert collection.documents[station_id]["availability_status"] is False
+
+@pytest.mark.asyncio
+async def test_update_availability_status_sets_reported_state():
+    """
+    Test that a reported state is passed to the repository as the target status and unknown states are rejected.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    change = AvailabilityChanged("1", "10115", False, datetime(2024, 5, 1, 12))
+    repository_mock.update_availability_status.return_value = change
+    service = StationSearchService(repository_mock)
+
+    assert await service.update_availability_status("1", "occupied") == change
+    repository_mock.update_availability_status.assert_awaited_once_with("1", False)
+    with pytest.raises(ValueError):
+        await service.update_availability_status("1", "broken")
+
+@pytest.mark.asyncio
+async def test_bulk_update_availability_reports_every_item():
+    """
+    Test that a bulk update validates every item, lets the last report of a station win and publishes only real changes.
+    """
+    ids = [ObjectId() for _ in range(4)]
+    repository_mock = AsyncMock(spec=StationRepository)
+    repository_mock.bulk_update_availability.return_value = {
+        ids[0]: ("10115", "updated"), ids[1]: ("12205", "updated"), ids[3]: ("10115", "unchanged")
+    }
+    service = StationSearchService(repository_mock)
+
+    result = await service.bulk_update_availability([
+        {"station_id": str(ids[0]), "state": "free"},
+        {"station_id": str(ids[1]), "state": "occupied"},
+        {"station_id": str(ids[0]), "state": "occupied"},
+        {"station_id": str(ids[2]), "state": "free"},
+        {"station_id": "123", "state": "free"},
+        {"station_id": str(ids[1]), "state": "broken"},
+        None,
+        {"station_id": str(ids[3]), "state": "free"},
+    ])
+
+    repository_mock.bulk_update_availability.assert_awaited_once_with(
+        {ids[0]: False, ids[1]: False, ids[2]: True, ids[3]: True}
+    )
+    assert [item["status"] for item in result.results] == [
+        "superseded", "updated", "updated", "not_found", "invalid", "invalid", "invalid", "unchanged"
+    ]
+    assert result.results[2]["availability_status"] is False
+    assert [(change.station_id, change.postal_code) for change in result.changes] == [
+        (str(ids[0]), "10115"), (str(ids[1]), "12205")
+    ]
+
+@pytest.mark.asyncio
+async def test_bulk_update_availability_limits_batch_size():
+    """
+    Test that empty and oversized batches are rejected without touching the repository.
+    """
+    repository_mock = AsyncMock(spec=StationRepository)
+    service = StationSearchService(repository_mock)
+
+    for items in ([], [{"station_id": str(ObjectId()), "state": "free"}] * 10_001):
+        with pytest.raises(ValueError):
+            await service.bulk_update_availability(items)
+    repository_mock.bulk_update_availability.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_repository_bulk_update_availability_uses_one_bulk_write(mocker):
+    """
+    Test that the repository reads the stations with one query and writes only the changed ones with one bulk write.
+    """
+    changed, unchanged, missing = ObjectId(), ObjectId(), ObjectId()
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.find.return_value.to_list = AsyncMock(return_value=[
+        {"_id": changed, "postal_code": "10115", "availability_status": True},
+        {"_id": unchanged, "postal_code": "10117", "availability_status": True},
+    ])
+    collection.bulk_write = AsyncMock(return_value=MagicMock(modified_count=1))
+
+    outcomes = await StationRepository().bulk_update_availability({changed: False, unchanged: True, missing: True})
+
+    assert outcomes == {changed: ("10115", "updated"), unchanged: ("10117", "unchanged")}
+    assert collection.find.call_args.args[1] == {"postal_code": 1, "availability_status": 1}
+    [operations] = collection.bulk_write.await_args.args
+    assert [(op._filter, op._doc) for op in operations] == [
+        ({"_id": changed, "availability_status": True}, {"$set": {"availability_status": False}})
+    ]
+    assert collection.bulk_write.await_args.kwargs == {"ordered": False}
+
+@pytest.mark.asyncio
+async def test_repository_bulk_update_availability_rereads_stations_changed_concurrently(mocker):
+    """
+    Test that stations deleted or reported between the read and the bulk write are not reported as updated.
+    """
+    deleted, reported, updated = ObjectId(), ObjectId(), ObjectId()
+    collection = mocker.patch("backend.src.charging_station_search.charging_station_search_service.station_collection")
+    collection.find.return_value.to_list = AsyncMock(side_effect=[
+        [{"_id": object_id, "postal_code": "10115", "availability_status": True}
+         for object_id in (deleted, reported, updated)],
+        [{"_id": reported, "availability_status": True}, {"_id": updated, "availability_status": False}],
+    ])
+    collection.bulk_write = AsyncMock(return_value=MagicMock(modified_count=1))
+
+    outcomes = await StationRepository().bulk_update_availability({deleted: False, reported: False, updated: False})
+
+    assert outcomes == {reported: ("10115", "superseded"), updated: ("10115", "updated")}
+    assert collection.find.call_args.args[0] == {"_id": {"$in": [deleted, reported, updated]}}
@@ -0,0 +1,238 @@
+from datetime import datetime
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+from backend.src.charging_station_search.charging_station_search_service import (
+    AvailabilityChanged, BoundingBox, Coordinates, PostalCode, StationFilter, StationRepository, StationSearchService
+)
+from backend.src.charging_station_search.station_index import (
+    StationIndex, InMemoryStationRepository, haversine_distance
+)
+
+
+def station_document(latitude, longitude, postal_code="10115", name=None, available=True):
+    return {
+        "_id": ObjectId(),
+        "postal_code": postal_code,
+        "availability_status": available,
+        "location": {"latitude": latitude, "longitude": longitude},
+        "name": name or f"{latitude}, {longitude}",
+    }
+
+
+@pytest.fixture
+def documents():
+    """Create stations along a line east of Alexanderplatz, one in another PLZ and one without a position."""
+    return [
+        station_document(52.5219, 13.4132, name="Alexanderplatz"),
+        station_document(52.5219, 13.4200, name="East 1"),
+        station_document(52.5219, 13.4400, name="East 2"),
+        station_document(52.4500, 13.3000, postal_code="12205", name="South West"),
+        station_document(float("nan"), float("nan"), name="No position"),
+        station_document(52.52, 13.41, postal_code="99999", name="Invalid PLZ"),
+    ]
+
+
+@pytest.fixture
+def index(documents):
+    return StationIndex.from_documents(documents)
+
+
+def test_from_documents_skips_invalid_postal_codes(index, documents):
+    """
+    Test that documents with an invalid postal code are not indexed.
+    """
+    assert len(index) == 5
+    assert str(documents[-1]["_id"]) not in index
+
+
+def test_by_postal_code(index):
+    """
+    Test that the postal code lookup returns the stations of that code only.
+    """
+    assert [station.name for station in index.by_postal_code("10115")] == [
+        "Alexanderplatz", "East 1", "East 2", "No position"
+    ]
+    assert index.by_postal_code("10115", limit=1)[0].name == "Alexanderplatz"
+    assert index.by_postal_code("13000") == []
+
+
+def test_page_by_postal_code(index):
+    """
+    Test that pages continue after the given id and report whether more stations follow.
+    """
+    first, more = index.page_by_postal_code("10115", 3)
+    rest, more_after_rest = index.page_by_postal_code("10115", 3, after_id=first[-1].id)
+
+    assert more and not more_after_rest
+    assert [station.id for station in first + rest] == sorted(station.id for station in index.by_postal_code("10115"))
+
+
+def test_nearby_is_sorted_by_distance_and_limited_to_radius(index):
+    """
+    Test that nearby returns stations within the radius, closest first, with distances.
+    """
+    stations = index.nearby(52.5219, 13.4132, radius=1000, limit=10)
+
+    assert [station.name for station in stations] == ["Alexanderplatz", "East 1"]
+    assert stations[0].distance == pytest.approx(0.0, abs=1e-6)
+    assert stations[1].distance == pytest.approx(haversine_distance(52.5219, 13.4132, 52.5219, 13.42))
+    assert [station.name for station in index.nearby(52.5219, 13.4132, radius=5000, limit=1)] == ["Alexanderplatz"]
+
+
+def test_k_nearest_expands_until_k_stations_are_found(index):
+    """
+    Test that k-nearest finds the closest stations regardless of how far away they are.
+    """
+    stations = index.k_nearest(52.5219, 13.4132, 4)
+
+    assert [station.name for station in stations] == ["Alexanderplatz", "East 1", "East 2", "South West"]
+    assert stations[-1].distance > 10_000
+    assert len(index.k_nearest(52.5219, 13.4132, 10)) == 4
+
+
+def test_in_bbox(index):
+    """
+    Test that the bounding box query returns the stations within the box.
+    """
+    stations = index.in_bbox(13.41, 52.51, 13.43, 52.53)
+
+    assert [station.name for station in stations] == ["Alexanderplatz", "East 1"]
+    assert len(index.in_bbox(13.41, 52.51, 13.43, 52.53, limit=1)) == 1
+
+
+def test_changes_are_reflected_in_queries(index, documents):
+    """
+    Test that moved, removed and updated stations are reflected in subsequent queries.
+    """
+    alexanderplatz, east_1 = (str(document["_id"]) for document in documents[:2])
+
+    index.upsert_document({**documents[2], "location": {"latitude": 52.5219, "longitude": 13.4140}})
+    index.remove(east_1)
+    index.set_availability(alexanderplatz, False)
+
+    stations = index.nearby(52.5219, 13.4132, radius=1000, limit=10)
+    assert [station.name for station in stations] == ["Alexanderplatz", "East 2"]
+    assert stations[0].availability_status is False
+    assert index.get(alexanderplatz).availability_status is False
+    assert east_1 not in index
+
+
+@pytest.mark.asyncio
+async def test_in_memory_repository_serves_the_search_service(documents, mocker):
+    """
+    Test that StationSearchService can search an InMemoryStationRepository loaded from MongoDB.
+    """
+    collection = mocker.patch("backend.src.charging_station_search.station_index.station_collection")
+    collection.find.return_value.to_list = AsyncMock(return_value=documents)
+    mongo_repository = AsyncMock(spec=StationRepository)
+    repository = InMemoryStationRepository(mongo_repository)
+    service = StationSearchService(repository)
+
+    assert await repository.load() == 5
+    result = await service.search_by_postal_code("12205")
+    nearby = await service.search_nearby(52.5219, 13.4132, radius=1000, limit=5)
+
+    assert [station.name for station in result.stations] == ["South West"]
+    assert [station.name for station in nearby] == ["Alexanderplatz", "East 1"]
+    mongo_repository.find_by_postal_code.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_repository_delegates_until_loaded():
+    """
+    Test that queries go to MongoDB until the index has been loaded.
+    """
+    mongo_repository = AsyncMock(spec=StationRepository)
+    mongo_repository.find_by_postal_code.return_value = []
+    repository = InMemoryStationRepository(mongo_repository)
+
+    await repository.find_by_postal_code(PostalCode("10115"))
+    await repository.find_k_nearest(Coordinates(52.52, 13.405), 3)
+
+    mongo_repository.find_by_postal_code.assert_awaited_once()
+    mongo_repository.find_k_nearest.assert_awaited_once_with(Coordinates(52.52, 13.405), 3, None)
+
+
+@pytest.mark.asyncio
+async def test_availability_update_is_mirrored(index, documents):
+    """
+    Test that an availability update is written to MongoDB and the stored state mirrored into the index.
+    """
+    station_id = str(documents[0]["_id"])
+    mongo_repository = AsyncMock(spec=StationRepository)
+    change = AvailabilityChanged(station_id, "10115", False, datetime(2024, 5, 1, 12))
+    mongo_repository.update_availability_status.return_value = change
+    repository = InMemoryStationRepository(mongo_repository)
+    repository.index, repository.loaded = index, True
+
+    assert await repository.update_availability_status(station_id) == change
+
+    mongo_repository.update_availability_status.assert_awaited_once_with(station_id, None)
+    mongo_repository.find_by_object_id.assert_not_called()
+    assert (await repository.find_by_object_id(documents[0]["_id"])).availability_status is False
+
+
+def test_apply_change_events(index, documents):
+    """
+    Test that change stream events update the index.
+    """
+    repository = InMemoryStationRepository(MagicMock())
+    repository.index = index
+    new_station = station_document(52.5220, 13.4133, name="New")
+
+    repository.apply_change({"operationType": "insert", "fullDocument": new_station})
+    repository.apply_change({"operationType": "delete", "documentKey": {"_id": documents[0]["_id"]}})
+
+    stations = index.nearby(52.5219, 13.4132, radius=100, limit=10)
+    assert [station.name for station in stations] == ["New"]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_rows_by_postal_codes(index):
+    """
+    Test that the in-memory repository answers batch searches with rows ordered by postal code and id.
+    """
+    repository = InMemoryStationRepository(AsyncMock(spec=StationRepository))
+    repository.index, repository.loaded = index, True
+
+    rows = await repository.find_rows_by_postal_codes([PostalCode("12205"), PostalCode("10115")])
+
+    assert [row["postal_code"] for row in rows] == ["10115"] * 4 + ["12205"]
+    assert [row["id"] for row in rows[:4]] == sorted(row["id"] for row in rows[:4])
+    assert rows[-1]["location"] == {"latitude": 52.45, "longitude": 13.3}
+
+
+@pytest.mark.asyncio
+async def test_in_memory_bbox_rows_and_clusters(index):
+    """
+    Test that the in-memory repository limits viewport rows and clusters all stations within the viewport.
+    """
+    repository = InMemoryStationRepository(AsyncMock(spec=StationRepository))
+    repository.index, repository.loaded = index, True
+    bbox = BoundingBox(13.2, 52.4, 13.5, 52.6)
+
+    rows, truncated = await repository.find_rows_in_bbox(bbox, 2)
+    clusters = await repository.cluster_in_bbox(bbox, 2)
+
+    assert len(rows) == 2 and truncated
+    assert [(cluster["cell"], cluster["count"]) for cluster in clusters] == [([0, 0], 1), ([1, 1], 3)]
+    assert clusters[1]["available"] == 3
+
+
+@pytest.mark.asyncio
+async def test_in_memory_repository_delegates_filtered_queries(index):
+    """
+    Test that filtered queries are answered by MongoDB even when the index is loaded.
+    """
+    mongo_repository = AsyncMock(spec=StationRepository)
+    mongo_repository.find_nearby.return_value = []
+    repository = InMemoryStationRepository(mongo_repository)
+    repository.index, repository.loaded = index, True
+    filters = StationFilter(min_kw=50)
+
+    unfiltered = await repository.find_nearby(Coordinates(52.5219, 13.4132), 1000, 10)
+    await repository.find_nearby(Coordinates(52.5219, 13.4132), 1000, 10, filters)
+
+    assert [station.name for station in unfiltered] == ["Alexanderplatz", "East 1"]
+    mongo_repository.find_nearby.assert_awaited_once_with(Coordinates(52.5219, 13.4132), 1000, 10, filters)
@@ -0,0 +1,281 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo import DeleteMany, UpdateOne
+from backend.db.import_charging_stations import (
+    sanitize_value, sanitize_column, build_station_documents, iter_document_batches, insert_station_documents,
+    assign_station_keys, sync_station_documents, apply_cluster_deltas
+)
+
+
+@pytest.fixture
+def processed_data():
+    """Create preprocessed register rows including the register columns for the documents."""
+    return pd.DataFrame({
+        "PLZ": pd.array([10115, 10117, pd.NA], dtype="Int64"),
+        "Breitengrad": [52.53, 52.51, 52.50],
+        "Längengrad": [13.38, 13.39, 13.40],
+        "KW": [22.0, np.nan, 11.0],
+        "Betreiber": [" Stromnetz Berlin ", None, "Other"],
+        "Straße": ["Invalidenstr.", "  ", "Somewhere"],
+        "Hausnummer": ["12", np.nan, "1"],
+        "Ort": ["Berlin", "Berlin", "Berlin"],
+        "Anzeigename (Karte)": [None, "Mitte Hub", None],
+    })
+
+
+def test_sanitize_column_matches_sanitize_value():
+    """
+    Test that the vectorized sanitizer agrees with the per-value sanitizer.
+    """
+    series = pd.Series([" a ", "", "   ", None, np.nan, 12, 1.5, "b"], dtype=object)
+
+    assert sanitize_column(series).tolist() == [sanitize_value(value) for value in series]
+    assert sanitize_column(None) is None
+
+
+def test_build_station_documents(processed_data):
+    """
+    Test that documents are built from the same row, with defaults and without rows missing a postal code.
+    """
+    documents = build_station_documents(processed_data)
+
+    assert len(documents) == 2
+    first, second = documents
+    assert first["postal_code"] == "10115"
+    assert first["name"] == "Stromnetz Berlin - Invalidenstr. 12"
+    assert first["location"] == {"latitude": 52.53, "longitude": 13.38,
+                                 "description": "Stromnetz Berlin, Invalidenstr. 12, Berlin"}
+    assert first["geo"] == {"type": "Point", "coordinates": [13.38, 52.53]}
+    assert first["power_kw"] == 22.0
+    assert first["metadata"]["postal_code"] == "10115"
+    assert second["name"] == "Mitte Hub"
+    assert second["power_kw"] is None
+    assert second["metadata"] == {"provider": "Unknown Provider", "street": "Unknown Street",
+                                  "house_number": "", "city": "Berlin", "postal_code": "10117"}
+
+
+def test_build_station_documents_types_charging_attributes(processed_data):
+    """
+    Test that the charging type, number of charge points and distinct plug types are typed fields.
+    """
+    processed_data = processed_data.assign(**{
+        "Art der Ladeeinrichung": ["Schnellladeeinrichtung", None, "Normalladeeinrichtung"],
+        "Anzahl Ladepunkte": [2.0, np.nan, 1.0],
+        "Steckertypen1": ["DC Kupplung Combo, AC Steckdose Typ 2", "AC Steckdose Typ 2", None],
+        "Steckertypen2": ["AC Steckdose Typ 2", None, None],
+    })
+
+    first, second = build_station_documents(processed_data)
+
+    assert first["charging_type"] == "Schnellladeeinrichtung"
+    assert first["charge_points"] == 2 and isinstance(first["charge_points"], int)
+    assert first["connectors"] == ["AC Steckdose Typ 2", "DC Kupplung Combo"]
+    assert second["charging_type"] is None and second["charge_points"] is None
+    assert second["connectors"] == ["AC Steckdose Typ 2"]
+
+
+def test_iter_document_batches(processed_data):
+    """
+    Test that documents are produced in batches of at most batch_size rows.
+    """
+    batches = list(iter_document_batches(processed_data, batch_size=2))
+
+    assert [len(batch) for batch in batches] == [2]
+    assert [len(batch) for batch in iter_document_batches(processed_data, batch_size=1)] == [1, 1]
+    with pytest.raises(ValueError):
+        list(iter_document_batches(processed_data, batch_size=0))
+
+
+@pytest.mark.asyncio
+async def test_insert_station_documents_is_unordered_and_batched(processed_data, mocker):
+    """
+    Test that every batch is inserted with one unordered insert_many call.
+    """
+    collection = mocker.patch("backend.db.import_charging_stations.station_collection")
+    collection.insert_many = AsyncMock(side_effect=lambda batch, ordered: MagicMock(inserted_ids=list(range(len(batch)))))
+
+    inserted = await insert_station_documents(processed_data, batch_size=1)
+
+    assert inserted == 2
+    assert collection.insert_many.await_count == 2
+    assert all(call.kwargs == {"ordered": False} for call in collection.insert_many.await_args_list)
+
+
+def test_missing_register_column_uses_defaults(processed_data):
+    """
+    Test that a register column missing from the dataset falls back to its default on every batch.
+    """
+    documents = build_station_documents(processed_data.drop(columns=["Anzeigename (Karte)"]).iloc[1:])
+
+    assert [document["name"] for document in documents] == ["Unknown Provider - Unknown Street"]
+
+
+@pytest.fixture
+def cluster_collection(mocker):
+    """Patch the marker cluster collection the import keeps current."""
+    collection = mocker.patch("backend.db.import_charging_stations.station_cluster_collection")
+    collection.bulk_write = AsyncMock()
+    collection.delete_many = AsyncMock()
+    return collection
+
+
+class AsyncCursor:
+    """Minimal async iterator standing in for a Motor cursor."""
+    def __init__(self, documents):
+        self.documents = iter(documents)
+
+    def __aiter__(self):
+        return self
+
+    def sort(self, *args):
+        return self
+
+    async def to_list(self, length):
+        return list(self.documents)
+
+    async def __anext__(self):
+        try:
+            return next(self.documents)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def test_station_keys_are_stable_and_unique(processed_data):
+    """
+    Test that station keys only depend on the identifying columns and number duplicate rows.
+    """
+    keys = assign_station_keys(processed_data)
+    renamed = processed_data.assign(**{"Anzeigename (Karte)": ["A", "B", "C"]}).iloc[::-1]
+    duplicated = pd.concat([processed_data, processed_data.iloc[:1]], ignore_index=True)
+
+    assert keys.tolist() == assign_station_keys(renamed).iloc[::-1].tolist()
+    assert keys.is_unique
+    duplicate_keys = assign_station_keys(duplicated)
+    assert duplicate_keys.is_unique
+    assert duplicate_keys[0].split("-")[0] == duplicate_keys[3].split("-")[0]
+
+
+def test_station_keys_survive_power_and_operator_changes(processed_data):
+    """
+    Test that a power upgrade or a new operator keeps the station key, while a move changes it.
+    """
+    keys = assign_station_keys(processed_data)
+    upgraded = processed_data.assign(KW=[50.0, 150.0, 11.0], Betreiber=["New Operator", None, "Other"])
+    moved = processed_data.assign(Breitengrad=[52.54, 52.51, 52.50])
+
+    assert assign_station_keys(upgraded).tolist() == keys.tolist()
+    assert assign_station_keys(moved)[0] != keys[0]
+
+
+@pytest.mark.asyncio
+async def test_sync_applies_only_the_difference(processed_data, mocker, cluster_collection):
+    """
+    Test that a sync upserts new and changed stations, skips unchanged ones and deletes removed ones.
+    """
+    processed_data = processed_data.assign(station_key=assign_station_keys(processed_data))
+    unchanged, changed = build_station_documents(processed_data)
+    existing = [
+        {"station_key": unchanged["station_key"], "content_hash": unchanged["content_hash"]},
+        {"station_key": changed["station_key"], "content_hash": "outdated"},
+        {"station_key": "removed-0", "content_hash": "whatever"},
+    ]
+    collection = mocker.patch("backend.db.import_charging_stations.station_collection")
+    collection.find = MagicMock(return_value=AsyncCursor(existing))
+    collection.bulk_write = AsyncMock(return_value=MagicMock(deleted_count=1))
+
+    renamed = processed_data.assign(**{"Anzeigename (Karte)": [None, "Renamed Hub", None]})
+
+    report = await sync_station_documents(renamed, batch_size=10)
+
+    assert report == {"rekeyed": 0, "inserted": 0, "updated": 1, "deleted": 1, "unchanged": 1}
+    upserts, deletes = [call.args[0] for call in collection.bulk_write.await_args_list]
+    renamed_document = build_station_documents(renamed)[1]
+    assert renamed_document["name"] == "Renamed Hub"
+    assert upserts == [UpdateOne(
+        {"station_key": changed["station_key"]},
+        {"$set": {key: value for key, value in renamed_document.items() if key != "availability_status"},
+         "$setOnInsert": {"availability_status": True}},
+        upsert=True,
+    )]
+    assert deletes == [DeleteMany({"station_key": {"$in": ["removed-0"]}}), DeleteMany({"station_key": {"$exists": False}})]
+
+
+@pytest.mark.asyncio
+async def test_sync_inserts_new_stations(processed_data, mocker, cluster_collection):
+    """
+    Test that a sync against an empty collection upserts every station with its initial availability.
+    """
+    processed_data = processed_data.assign(station_key=assign_station_keys(processed_data))
+    collection = mocker.patch("backend.db.import_charging_stations.station_collection")
+    collection.find = MagicMock(return_value=AsyncCursor([]))
+    collection.bulk_write = AsyncMock(return_value=MagicMock(deleted_count=0))
+
+    report = await sync_station_documents(processed_data, batch_size=1)
+
+    assert report == {"rekeyed": 0, "inserted": 2, "updated": 0, "deleted": 0, "unchanged": 0}
+    assert collection.bulk_write.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_updates_clusters_of_inserted_and_deleted_stations(processed_data, mocker, cluster_collection):
+    """
+    Test that a sync adds inserted and subtracts deleted station positions from the marker clusters.
+    """
+    processed_data = processed_data.assign(station_key=assign_station_keys(processed_data))
+    existing = [{"station_key": "removed-0", "content_hash": "whatever"}]
+    removed_positions = [{"location": {"latitude": 52.45, "longitude": 13.30}}]
+    collection = mocker.patch("backend.db.import_charging_stations.station_collection")
+    collection.find = MagicMock(side_effect=[AsyncCursor(existing), AsyncCursor([]), AsyncCursor(removed_positions)])
+    collection.bulk_write = AsyncMock(return_value=MagicMock(deleted_count=1))
+    apply_deltas = mocker.patch("backend.db.import_charging_stations.apply_cluster_deltas", new_callable=AsyncMock)
+
+    await sync_station_documents(processed_data, batch_size=10)
+
+    position_query = collection.find.call_args_list[2].args[0]
+    assert position_query == {"$or": [{"station_key": {"$in": ["removed-0"]}}, {"station_key": {"$exists": False}}]}
+    apply_deltas.assert_awaited_once_with([(52.53, 13.38), (52.51, 13.39)], [(52.45, 13.30)], 10)
+
+
+@pytest.mark.asyncio
+async def test_sync_rekeys_stations_from_earlier_imports(processed_data, mocker, cluster_collection):
+    """
+    Test that stations stored without a current key keep their ids when their position matches a register row.
+    """
+    processed_data = processed_data.assign(station_key=assign_station_keys(processed_data))
+    existing = [{"station_key": "old-key", "content_hash": "whatever"}]
+    stored = [
+        {"_id": 1, "station_key": "old-key", "postal_code": "10115", "location": {"latitude": 52.53, "longitude": 13.38}},
+        {"_id": 2, "postal_code": "10117", "location": {"latitude": 52.51, "longitude": 13.39}},
+        {"_id": 3, "postal_code": "12000", "location": {"latitude": 52.40, "longitude": 13.20}},
+    ]
+    collection = mocker.patch("backend.db.import_charging_stations.station_collection")
+    collection.find = MagicMock(side_effect=[AsyncCursor(existing), AsyncCursor(stored)])
+    collection.bulk_write = AsyncMock(return_value=MagicMock(deleted_count=1))
+
+    report = await sync_station_documents(processed_data, batch_size=10, update_clusters=False)
+
+    assert report == {"rekeyed": 2, "inserted": 0, "updated": 2, "deleted": 1, "unchanged": 0}
+    rekeys, upserts, deletes = [call.args[0] for call in collection.bulk_write.await_args_list]
+    keys = processed_data["station_key"].tolist()
+    assert rekeys == [UpdateOne({"_id": 1}, {"$set": {"station_key": keys[0], "content_hash": None}}),
+                      UpdateOne({"_id": 2}, {"$set": {"station_key": keys[1], "content_hash": None}})]
+    assert [operation._filter for operation in upserts] == [{"station_key": keys[0]}, {"station_key": keys[1]}]
+    assert deletes == [DeleteMany({"station_key": {"$exists": False}})]
+
+
+@pytest.mark.asyncio
+async def test_apply_cluster_deltas_increments_every_zoom_level(cluster_collection, mocker):
+    """
+    Test that each affected cluster cell is changed with one $inc upsert and emptied cells are deleted.
+    """
+    mocker.patch("backend.db.import_charging_stations.CLUSTER_MAX_ZOOM", 2)
+
+    cells = await apply_cluster_deltas([(52.53, 13.38)], [(52.45, 13.30)], batch_size=100)
+
+    operations = cluster_collection.bulk_write.await_args.args[0]
+    assert cells == len(operations) == 3
+    assert {operation._doc["$inc"]["count"] for operation in operations} == {0}
+    assert all(operation._upsert for operation in operations)
+    cluster_collection.delete_many.assert_awaited_once_with({"count": {"$lte": 0}})
@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from backend.utilities.clustering import grid_cell_size, grid_cluster, zoom_cells, cell_range, cluster_deltas
+
+
+def test_grid_cell_size():
+    """
+    Test that the bounds are split into equally sized cells.
+    """
+    assert grid_cell_size((13.0, 52.0, 14.0, 53.0), 4) == (0.25, 0.25)
+
+
+def test_grid_cluster_counts_points_per_cell():
+    """
+    Test that points are counted per cell with their availability and mean position, ordered by row and column.
+    """
+    latitudes = [0.1, 0.2, 0.1, 1.9, 2.0]
+    longitudes = [0.1, 0.3, 1.5, 0.1, 2.0]
+    available = [True, False, True, True, False]
+
+    clusters = grid_cluster(latitudes, longitudes, available, (0.0, 0.0, 2.0, 2.0), 2)
+
+    assert [(cluster["cell"], cluster["count"], cluster["available"]) for cluster in clusters] == [
+        ([0, 0], 2, 1), ([1, 0], 1, 1), ([0, 1], 1, 1), ([1, 1], 1, 0)
+    ]
+    assert clusters[0]["latitude"] == pytest.approx(0.15)
+    assert clusters[0]["longitude"] == pytest.approx(0.2)
+    assert sum(cluster["count"] for cluster in clusters) == len(latitudes)
+
+
+def test_grid_cluster_without_points():
+    """
+    Test that no points produce no clusters.
+    """
+    assert grid_cluster([], [], [], (0.0, 0.0, 1.0, 1.0), 4) == []
+
+
+def test_zoom_cells_are_nested():
+    """
+    Test that every cell splits into 2 x 2 cells at the next zoom level.
+    """
+    latitudes, longitudes = np.array([52.52, 52.45, -33.9]), np.array([13.40, 13.30, 18.4])
+
+    for zoom in range(0, 16):
+        x, y = zoom_cells(latitudes, longitudes, zoom)
+        child_x, child_y = zoom_cells(latitudes, longitudes, zoom + 1)
+        assert (child_x // 2 == x).all() and (child_y // 2 == y).all()
+
+
+def test_cell_range_covers_the_bounds():
+    """
+    Test that the cell range of a box contains the cells of its corners, north at the top.
+    """
+    min_x, min_y, max_x, max_y = cell_range((13.3, 52.4, 13.5, 52.6), 12)
+    x, y = zoom_cells([52.6, 52.4], [13.3, 13.5], 12)
+
+    assert (min_x, min_y, max_x, max_y) == (x[0], y[0], x[1], y[1])
+    assert min_x < max_x and min_y < max_y
+
+
+def test_cluster_deltas_add_and_remove():
+    """
+    Test that added and removed positions change the counts and coordinate sums of their cells.
+    """
+    deltas = cluster_deltas([(52.52, 13.40), (52.53, 13.41)], [(52.52, 13.40), (float("nan"), 13.0)], 0, 3)
+
+    assert [delta["zoom"] for delta in deltas] == [0, 1, 2, 3]
+    assert all(delta["count"] == 1 for delta in deltas)
+    assert deltas[0]["lat_sum"] == pytest.approx(52.53)
+    assert cluster_deltas([(52.52, 13.40)], [(52.52, 13.40)], 0, 3) == []
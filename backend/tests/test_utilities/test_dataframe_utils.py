@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.utilities.dataframe_utils import sort_dataframe
+
+
+@pytest.fixture
+def df():
+    """Create a DataFrame with ties and missing values in the sort columns."""
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 20, 200).astype(float)
+    values[rng.choice(200, 10, replace=False)] = np.nan
+    return pd.DataFrame({
+        "KW": values,
+        "PLZ": rng.integers(10115, 10120, 200),
+        "row": np.arange(200),
+    }, index=rng.permutation(200))
+
+
+def test_sort_is_stable_with_range_index(df):
+    """
+    Test that equal keys keep their original order and the index is reset.
+    """
+    result = sort_dataframe(df, "PLZ")
+
+    assert list(result.index) == list(range(len(df)))
+    for _, group in result.groupby("PLZ"):
+        assert group["row"].is_monotonic_increasing
+    assert result["PLZ"].is_monotonic_increasing
+
+
+def test_sort_descending_places_missing_last(df):
+    """
+    Test descending order with missing values at the end.
+    """
+    result = sort_dataframe(df, "KW", ascending=False)
+
+    assert result["KW"].iloc[-10:].isna().all()
+    assert result["KW"].iloc[:-10].is_monotonic_decreasing
+
+
+def test_multi_key_sort(df):
+    """
+    Test sorting by several columns with per-column directions.
+    """
+    result = sort_dataframe(df, ["PLZ", "KW"], ascending=[True, False])
+    expected = df.sort_values(["PLZ", "KW"], ascending=[True, False], kind="stable").reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("column", ["KW", "PLZ"])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("top_k", [0, 1, 7, 50, 195, 500])
+def test_top_k_matches_full_sort(df, column, ascending, top_k):
+    """
+    Test that the partial top-k selection equals the head of the full stable sort, including ties and NaN.
+    """
+    expected = sort_dataframe(df, column, ascending=ascending).head(top_k)
+
+    result = sort_dataframe(df, column, ascending=ascending, top_k=top_k)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_top_k_on_text_column_falls_back_to_sort(df):
+    """
+    Test that non-numeric columns still support top-k.
+    """
+    df = df.assign(name=df["row"].astype(str))
+
+    result = sort_dataframe(df, "name", top_k=3)
+
+    assert result["name"].tolist() == ["0", "1", "10"]
+
+
+def test_sort_empty_dataframe():
+    """
+    Test that an empty DataFrame is returned unchanged.
+    """
+    result = sort_dataframe(pd.DataFrame({"KW": []}), "KW", top_k=5)
+
+    assert result.empty
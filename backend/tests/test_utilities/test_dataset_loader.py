@@ -0,0 +1,63 @@
+import os
+import pandas as pd
+import pytest
+from backend.utilities.dataset_loader import (
+    REGISTER_HEADER_ROW, CACHE_FOLDER, columnar_cache_path, load_ladesaeulenregister, load_residents
+)
+
+
+@pytest.fixture
+def register_path(tmp_path):
+    """Create a small register-shaped Excel file with decimal-comma coordinates."""
+    path = tmp_path / "Ladesaeulenregister.xlsx"
+    pd.DataFrame({
+        "Betreiber": ["Allego GmbH", "Vattenfall"],
+        "Postleitzahl": [10115, 10117],
+        "Bundesland": ["Berlin", "Berlin"],
+        "Breitengrad": ["52,5200", "52,5300"],
+        "Längengrad": ["13,4050", "13,4100"],
+        "Nennleistung Ladeeinrichtung [kW]": [22, 50],
+        "Hausnummer": ["12a", "3"],
+    }).to_excel(path, index=False, startrow=REGISTER_HEADER_ROW)
+    return str(path)
+
+
+def test_register_is_typed_and_coordinates_fixed(register_path):
+    """
+    Test that coordinates with decimal commas are converted into floats.
+    """
+    df = load_ladesaeulenregister(register_path)
+
+    assert df["Breitengrad"].tolist() == [52.52, 52.53]
+    assert df["Längengrad"].tolist() == [13.405, 13.41]
+    assert df["Postleitzahl"].tolist() == [10115, 10117]
+    assert df["Hausnummer"].tolist() == ["12a", "3"]
+
+
+def test_register_is_served_from_columnar_cache(register_path, mocker):
+    """
+    Test that the Excel file is parsed once and later loads use the Arrow cache.
+    """
+    first = load_ladesaeulenregister(register_path)
+    assert os.path.exists(columnar_cache_path(register_path))
+
+    read_excel = mocker.patch("backend.utilities.dataset_loader.pd.read_excel")
+    second = load_ladesaeulenregister(register_path)
+
+    read_excel.assert_not_called()
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_stale_cache_is_replaced(tmp_path):
+    """
+    Test that changing the source produces a new cache file and removes the old one.
+    """
+    path = tmp_path / "plz_einwohner.csv"
+    path.write_text("plz,einwohner\n10115,100\n")
+    load_residents(str(path))
+
+    path.write_text("plz,einwohner\n10115,100\n10117,200\n")
+    df = load_residents(str(path))
+
+    assert len(df) == 2
+    assert os.listdir(tmp_path / CACHE_FOLDER) == [os.path.basename(columnar_cache_path(str(path)))]
@@ -0,0 +1,49 @@
+import json
+from datetime import datetime
+from bson import ObjectId
+from backend.utilities import fast_json
+from backend.utilities.fast_json import FastJSONResponse, dumps, loads_lines
+
+
+def test_dumps_matches_standard_json():
+    """
+    Test that the fast encoder produces JSON equal to the standard library's, including non-ASCII text.
+    """
+    content = {"name": "Straße", "location": {"latitude": 52.5, "longitude": 13.4}, "ok": True, "none": None}
+
+    assert json.loads(dumps(content)) == content
+
+
+def test_dumps_encodes_dates_and_object_ids(monkeypatch):
+    """
+    Test that datetimes and ObjectIds are encoded, with and without orjson.
+    """
+    object_id = ObjectId()
+    content = {"timestamp": datetime(2024, 1, 2, 3, 4, 5), "id": object_id}
+    expected = {"timestamp": "2024-01-02T03:04:05", "id": str(object_id)}
+
+    assert json.loads(dumps(content)) == expected
+    monkeypatch.setattr(fast_json, "orjson", None)
+    assert json.loads(dumps(content)) == expected
+
+
+def test_fast_json_response():
+    """
+    Test that the response renders its content with the fast encoder.
+    """
+    response = FastJSONResponse({"stations": [], "stations_found": 0})
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"stations": [], "stations_found": 0}
+
+
+def test_loads_lines(monkeypatch):
+    """
+    Test that newline-delimited JSON is parsed line by line, with and without orjson.
+    """
+    data = b'{"station_id": "a", "state": "free"}\n\n{broken\n[1, 2]\r\n'
+    expected = [{"station_id": "a", "state": "free"}, None, [1, 2]]
+
+    assert loads_lines(data) == expected
+    monkeypatch.setattr(fast_json, "orjson", None)
+    assert loads_lines(data) == expected
@@ -0,0 +1,88 @@
+import gzip
+import json
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon
+from backend.utilities import geojson_stream
+from backend.utilities.geojson_stream import (
+    encode_features, iter_feature_collection, iter_layer_collections, negotiate_encoding, compress_chunks
+)
+
+
+@pytest.fixture
+def gdf():
+    """Create a GeoDataFrame with two postal code polygons."""
+    return gpd.GeoDataFrame({
+        "Postleitzahl": [10115, 10117],
+        "Number": [3, float("nan")],
+        "geometry": [
+            Polygon([(13.37, 52.53), (13.38, 52.53), (13.38, 52.54)]),
+            Polygon([(13.40, 52.52), (13.41, 52.52), (13.41, 52.53)]),
+        ],
+    }, geometry="geometry")
+
+
+def test_feature_collection_is_valid_geojson(gdf):
+    """
+    Test that streamed chunks join into a valid FeatureCollection with properties.
+    """
+    body = b"".join(iter_feature_collection(encode_features(gdf), chunk_size=16))
+    collection = json.loads(body)
+
+    assert collection["type"] == "FeatureCollection"
+    assert len(collection["features"]) == 2
+    assert collection["features"][0]["geometry"]["type"] == "Polygon"
+    assert collection["features"][0]["properties"] == {"Postleitzahl": 10115, "Number": 3}
+    assert collection["features"][1]["properties"]["Number"] is None
+
+
+def test_empty_feature_collection():
+    """
+    Test that a layer without features still yields a valid collection.
+    """
+    assert json.loads(b"".join(iter_feature_collection([]))) == {"type": "FeatureCollection", "features": []}
+
+
+def test_layer_collections_are_keyed_by_name(gdf):
+    """
+    Test that all layers are streamed as one object keyed by layer name.
+    """
+    features = encode_features(gdf)
+    body = json.loads(b"".join(iter_layer_collections({"lstat": features, "residents": features})))
+
+    assert list(body) == ["lstat", "residents"]
+    assert len(body["residents"]["features"]) == 2
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, "identity"),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0.5, gzip;q=0.9", "gzip"),
+    ("gzip;q=0, identity", "identity"),
+    ("*", "br"),
+])
+def test_negotiate_encoding(header, expected, monkeypatch):
+    """
+    Test Accept-Encoding negotiation including quality values and wildcards.
+    """
+    monkeypatch.setattr(geojson_stream, "brotli", object())
+    assert negotiate_encoding(header) == expected
+
+
+def test_negotiate_encoding_without_brotli(monkeypatch):
+    """
+    Test that gzip is chosen when brotli is not installed.
+    """
+    monkeypatch.setattr(geojson_stream, "brotli", None)
+    assert negotiate_encoding("br, gzip") == "gzip"
+
+
+def test_gzip_compression_roundtrip(gdf):
+    """
+    Test that gzip-compressed chunks decompress to the original document.
+    """
+    chunks = list(iter_feature_collection(encode_features(gdf)))
+    compressed = b"".join(compress_chunks(iter(chunks), "gzip"))
+
+    assert gzip.decompress(compressed) == b"".join(chunks)
@@ -0,0 +1,95 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+import shapely
+from shapely.geometry import Polygon, box
+from backend.utilities.geometry_utils import (
+    SIMPLIFICATION_TOLERANCES, resolve_tolerance, build_simplified_geometries,
+    simplified_geometry_lookup, apply_simplified_geometry, simplify_by_area, overlapping_areas
+)
+
+
+def jagged_square(x0, x1, steps=50):
+    """Build a square whose shared vertical edge has many slightly jittered vertices."""
+    edge = [(x1 + (0.00001 if i % 2 else 0.0), 52.0 + i * 0.01 / steps) for i in range(steps + 1)]
+    return edge, Polygon([(x0, 52.0)] + edge + [(x0, 52.01)])
+
+
+@pytest.fixture
+def areas():
+    """Create two adjacent postal code areas sharing a jagged edge."""
+    edge, left = jagged_square(13.0, 13.01)
+    right = Polygon([(13.02, 52.0)] + edge + [(13.02, 52.01)])
+    return gpd.GeoDataFrame({"PLZ": [10115, 10117], "geometry": [left, right]}, geometry="geometry")
+
+
+@pytest.mark.parametrize("tolerance, zoom, expected", [
+    (None, None, 0.0),
+    (0.0007, None, 0.0005),
+    (0.00001, None, 0.0),
+    (1.0, None, SIMPLIFICATION_TOLERANCES[-1]),
+    (None, 10, 0.001),
+    (None, 16, 0.0),
+])
+def test_resolve_tolerance(tolerance, zoom, expected):
+    """
+    Test that tolerances and zoom levels map to the closest finer precomputed level.
+    """
+    assert resolve_tolerance(tolerance, zoom) == expected
+
+
+def test_simplified_levels_reduce_vertices_without_gaps(areas):
+    """
+    Test that coarser levels have fewer vertices and adjacent areas still do not overlap.
+    """
+    simplified = build_simplified_geometries(areas)
+
+    assert set(simplified["tolerance"]) == set(SIMPLIFICATION_TOLERANCES)
+    counts = []
+    for tolerance in (0.0, 0.0002):
+        lookup = simplified_geometry_lookup(simplified, tolerance)
+        left, right = lookup[10115], lookup[10117]
+        counts.append(shapely.get_num_coordinates(left))
+        assert left.intersection(right).area == pytest.approx(0.0, abs=1e-12)
+        assert left.union(right).area == pytest.approx(areas.union_all().area, rel=1e-3)
+    assert counts[1] < counts[0]
+
+
+def test_apply_simplified_geometry_by_key(areas):
+    """
+    Test that rows are matched to simplified geometries through their area key.
+    """
+    lookup = simplified_geometry_lookup(build_simplified_geometries(areas), 0.0002)
+    layer = gpd.GeoDataFrame(
+        {"Postleitzahl": [10117, 10117], "KW": [11, 22], "geometry": areas["geometry"].iloc[[1, 1]].values},
+        geometry="geometry",
+    )
+
+    result = apply_simplified_geometry(layer, lookup, "Postleitzahl")
+
+    assert all(geom.equals(lookup[10117]) for geom in result["geometry"])
+    assert layer["geometry"].iloc[0].equals(areas["geometry"].iloc[1])
+
+
+def test_simplify_by_area_with_zero_tolerance_is_noop(areas):
+    """
+    Test that a zero tolerance returns the input unchanged.
+    """
+    assert simplify_by_area(areas, 0.0) is areas
+
+
+def test_overlapping_areas():
+    """
+    Test that areas are assigned to every region covering enough of their surface.
+    """
+    areas = pd.DataFrame({
+        "PLZ": [10115, 10117, 10119],
+        "geometry": [box(0, 0, 1, 1).wkt, box(1, 0, 2, 1).wkt, box(0.95, 1, 2, 2).wkt],
+    })
+    regions = pd.DataFrame({
+        "Bezirk": ["West", "East", "Elsewhere"],
+        "geometry": [box(0, 0, 1, 2), box(1, 0, 2, 2), box(5, 5, 6, 6)],
+    })
+
+    assert overlapping_areas(areas, regions) == {"West": [10115], "East": [10117, 10119], "Elsewhere": []}
+    assert overlapping_areas(areas, regions, min_overlap=0.01)["West"] == [10115, 10119]
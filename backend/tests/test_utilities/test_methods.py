@@ -0,0 +1,101 @@
+import pickle
+import folium
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+from backend.utilities.geometry_utils import build_simplified_geometries
+from backend.utilities.methods import ProcessedData, build_folium_map, render_heatmap_html
+
+
+@pytest.fixture
+def layers():
+    """Create station counts per PLZ/KW and residents per PLZ for two areas."""
+    geometries = [box(13.30, 52.50, 13.35, 52.55), box(13.35, 52.50, 13.40, 52.55)]
+    df_lstat = gpd.GeoDataFrame({
+        "PLZ": [10115, 10115, 10117],
+        "KW": [11.0, 22.0, 22.0],
+        "Number": [1, 3, 5],
+        "geometry": [geometries[0], geometries[0], geometries[1]],
+    }, geometry="geometry")
+    df_residents = gpd.GeoDataFrame({
+        "PLZ": [10115, 10117],
+        "Einwohner": [1000, 5000],
+        "geometry": geometries,
+    }, geometry="geometry")
+    return df_lstat, df_residents
+
+
+def geojson_layers(parent):
+    return [child for child in parent._children.values() if isinstance(child, folium.GeoJson)]
+
+
+@pytest.mark.parametrize("layer_selection, expected_features", [
+    ("Residents", 2),
+    ("Charging Stations", 3),
+])
+def test_layer_is_one_feature_collection(layers, layer_selection, expected_features):
+    """
+    Test that all areas of a layer are rendered as one GeoJson FeatureCollection.
+    """
+    m = build_folium_map(*layers, layer_selection)
+
+    [geojson] = geojson_layers(m)
+    assert len(geojson.data["features"]) == expected_features
+    colors = {feature["properties"]["fillColor"] for feature in geojson.data["features"]}
+    assert len(colors) == 2 if layer_selection == "Residents" else 3
+
+
+def test_by_kw_has_one_feature_collection_per_kw(layers):
+    """
+    Test that the KW mode renders one feature group with one FeatureCollection per KW value.
+    """
+    m = build_folium_map(*layers, "Charging Stations by KW", by_kw=True)
+
+    groups = [child for child in m._children.values() if isinstance(child, folium.FeatureGroup)]
+    assert [group.layer_name for group in groups] == ["KW 11.0", "KW 22.0"]
+    assert [len(geojson_layers(group)[0].data["features"]) for group in groups] == [1, 2]
+
+
+def test_tooltip_fields(layers):
+    """
+    Test that tooltips are driven by feature properties.
+    """
+    m = build_folium_map(*layers, "Residents")
+
+    html = m.get_root().render()
+    assert "Einwohner:" in html
+
+
+def test_rendered_heatmap_html_is_cached_per_key(layers, mocker):
+    """
+    Test that the map HTML is built once per data version, layer, KW mode and tolerance.
+    """
+    render_heatmap_html.clear()
+    build = mocker.patch("backend.utilities.methods.build_folium_map", side_effect=build_folium_map)
+
+    first = render_heatmap_html("v1", "Residents", False, 0.0, *layers)
+    second = render_heatmap_html("v1", "Residents", False, 0.0, *layers)
+    render_heatmap_html("v1", "Charging Stations", False, 0.0, *layers)
+    render_heatmap_html("v2", "Residents", False, 0.0, *layers)
+
+    assert first == second
+    assert build.call_count == 3
+
+
+def test_processed_data_builds_levels_on_first_request(layers):
+    """
+    Test that simplification levels are derived once on request and not persisted with the snapshot.
+    """
+    df_lstat, df_residents = layers
+    df_lstat = df_lstat.rename(columns={"PLZ": "Postleitzahl"})
+    simplified = build_simplified_geometries(df_residents, tolerances=(0.0, 0.01))
+    data = ProcessedData({"lstat": df_lstat}, simplified)
+
+    assert data.level(0.0) is data.layers
+    assert data.level(0.01) is data.level(0.01)
+    assert len(data.features(0.01)["lstat"]) == 3
+    assert data.records(0.0)["lstat"][0]["geometry"].startswith("POLYGON")
+
+    restored = pickle.loads(pickle.dumps(data))
+    assert not restored._levels and not restored._records and not restored._features
+    assert len(restored.records(0.01)["lstat"]) == 3
@@ -0,0 +1,114 @@
+import os
+import pytest
+from backend.utilities.snapshot_cache import SnapshotCache, file_stat_key, file_content_hash
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    """Create a small dataset file the snapshot is built from."""
+    path = tmp_path / "source.csv"
+    path.write_text("PLZ;value\n10115;1\n")
+    return str(path)
+
+
+def make_cache(source_file, tmp_path, calls, use_content_hash=False):
+    def builder():
+        calls.append(1)
+        with open(source_file) as file:
+            return {"content": file.read()}
+    return SnapshotCache(
+        name="test",
+        source_paths=[source_file],
+        builder=builder,
+        cache_dir=str(tmp_path / "cache"),
+        use_content_hash=use_content_hash,
+    )
+
+
+def test_payload_is_built_once_and_served_from_memory(source_file, tmp_path):
+    """
+    Test that repeated accesses reuse the payload built on the first access.
+    """
+    calls = []
+    cache = make_cache(source_file, tmp_path, calls)
+
+    first = cache.get()
+    second = cache.get()
+
+    assert first is second
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["build_seconds"] is not None
+
+
+def test_payload_is_rebuilt_when_source_changes(source_file, tmp_path):
+    """
+    Test that modifying a source file produces a new version and a rebuild.
+    """
+    calls = []
+    cache = make_cache(source_file, tmp_path, calls)
+    cache.get()
+    old_version = cache.version
+
+    with open(source_file, "a") as file:
+        file.write("10117;2\n")
+    payload = cache.get()
+
+    assert len(calls) == 2
+    assert cache.version != old_version
+    assert "10117" in payload["content"]
+    snapshots = os.listdir(tmp_path / "cache")
+    assert snapshots == [f"test_{cache.version}.pkl"]
+
+
+def test_payload_is_loaded_from_disk_by_new_instance(source_file, tmp_path):
+    """
+    Test that a second cache instance loads the persisted snapshot instead of rebuilding it.
+    """
+    calls = []
+    make_cache(source_file, tmp_path, calls).get()
+    cache = make_cache(source_file, tmp_path, calls)
+
+    payload = cache.get()
+
+    assert len(calls) == 1
+    assert cache.stats()["disk_loads"] == 1
+    assert payload["content"].startswith("PLZ")
+
+
+def test_content_hash_ignores_touch(source_file, tmp_path):
+    """
+    Test that with content hashing a changed mtime alone does not trigger a rebuild.
+    """
+    calls = []
+    cache = make_cache(source_file, tmp_path, calls, use_content_hash=True)
+    cache.get()
+    stat = os.stat(source_file)
+    os.utime(source_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    cache.get()
+
+    assert len(calls) == 1
+    assert cache.version == f"v1-{file_content_hash([source_file])}"
+
+
+def test_missing_source_raises(tmp_path):
+    """
+    Test that a missing source file surfaces as FileNotFoundError.
+    """
+    cache = SnapshotCache("test", [str(tmp_path / "missing.csv")], dict, str(tmp_path))
+
+    with pytest.raises(FileNotFoundError):
+        cache.get()
+
+
+def test_stat_key_changes_with_size(source_file):
+    """
+    Test that the stat key reflects a change in file size.
+    """
+    before = file_stat_key([source_file])
+    with open(source_file, "a") as file:
+        file.write("x")
+    assert file_stat_key([source_file]) != before
@@ -0,0 +1,114 @@
+import json
+import geopandas as gpd
+import pytest
+from shapely.geometry import box, shape
+from backend.utilities.tiles import (
+    TileCache, build_tile, tile_bounds, lonlat_to_tile, tiles_covering, is_valid_tile, seed_tiles
+)
+
+
+@pytest.fixture
+def layer():
+    """Create a layer with one large area around Berlin-Mitte and one far away."""
+    return gpd.GeoDataFrame({
+        "Postleitzahl": [10115, 99999],
+        "Number": [4, 1],
+        "geometry": [box(13.30, 52.45, 13.50, 52.60), box(0.0, 0.0, 0.1, 0.1)],
+    }, geometry="geometry")
+
+
+def test_tile_math_roundtrip():
+    """
+    Test that a coordinate lies within the bounds of the tile computed for it.
+    """
+    x, y = lonlat_to_tile(13.405, 52.52, 12)
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(12, x, y)
+
+    assert (x, y) == (2200, 1343)
+    assert min_lon <= 13.405 <= max_lon
+    assert min_lat <= 52.52 <= max_lat
+
+
+def test_tiles_covering_berlin():
+    """
+    Test that the covering tiles of an area include its corner tiles.
+    """
+    tiles = set(tiles_covering((13.08, 52.33, 13.77, 52.68), 10))
+
+    assert lonlat_to_tile(13.08, 52.68, 10) in tiles
+    assert lonlat_to_tile(13.77, 52.33, 10) in tiles
+    assert len(tiles) == 6
+
+
+def test_is_valid_tile():
+    """
+    Test validation of tile coordinates.
+    """
+    assert is_valid_tile(0, 0, 0)
+    assert not is_valid_tile(2, 4, 0)
+    assert not is_valid_tile(2, 0, -1)
+
+
+def test_build_tile_clips_to_bounds(layer):
+    """
+    Test that a tile only contains intersecting features, clipped to the tile.
+    """
+    x, y = lonlat_to_tile(13.40, 52.52, 14)
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(14, x, y)
+
+    collection = json.loads(build_tile(layer, 14, x, y))
+
+    assert len(collection["features"]) == 1
+    feature = collection["features"][0]
+    assert feature["properties"] == {"Postleitzahl": 10115, "Number": 4}
+    assert shape(feature["geometry"]).area == pytest.approx((max_lon - min_lon) * (max_lat - min_lat), rel=1e-3)
+
+
+def test_build_empty_tile(layer):
+    """
+    Test that a tile without features is an empty FeatureCollection.
+    """
+    assert json.loads(build_tile(layer, 10, 0, 0))["features"] == []
+
+
+def test_tile_cache_is_lru():
+    """
+    Test that the least recently used tile is evicted first.
+    """
+    cache = TileCache(maxsize=2)
+    cache.get("a", lambda: b"a")
+    cache.get("b", lambda: b"b")
+    cache.get("a", lambda: b"never")
+    cache.get("c", lambda: b"c")
+
+    assert cache.get("a", lambda: b"rebuilt") == b"a"
+    assert cache.get("b", lambda: b"rebuilt") == b"rebuilt"
+    assert cache.stats()["hits"] == 2
+
+
+def test_tile_cache_keeps_compressed_variants(mocker):
+    """
+    Test that a tile is built once and compressed once per encoding.
+    """
+    cache = TileCache()
+    factory = mocker.Mock(return_value=b'{"type":"FeatureCollection","features":[]}')
+    compress = mocker.patch("backend.utilities.tiles.compress_chunks", side_effect=lambda chunks, encoding: [b"gz"])
+
+    assert cache.get("a", factory, "gzip") == b"gz"
+    assert cache.get("a", factory, "gzip") == b"gz"
+    assert cache.get("a", factory) == factory.return_value
+    assert cache.lookup("a", "br") is None
+
+    assert factory.call_count == 1 and compress.call_count == 1
+    assert len(cache) == 2
+
+
+def test_seed_tiles(layer):
+    """
+    Test that seeding fills the cache for every layer and covering tile.
+    """
+    cache = TileCache()
+    count = seed_tiles(cache, lambda z: {"lstat": layer}, "v1", zooms=[9, 10])
+
+    assert count == len(cache) == 4 + 6
+    assert cache.misses == count
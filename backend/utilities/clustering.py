@@ -0,0 +1,117 @@
+import numpy as np
+
+# ------------------------------------------------------------------------------
+# Grid Clustering
+
+def grid_cell_size(bounds, grid):
+    """Returns the (width, height) in degrees of one cell when `bounds` is split into grid x grid cells."""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    return (max_lon - min_lon) / grid, (max_lat - min_lat) / grid
+
+def grid_cluster(latitudes, longitudes, available, bounds, grid):
+    """
+    Aggregates points into the cells of a regular grid over `bounds`.
+
+    Points on the upper edges of the bounds fall into the last row/column, so every
+    point within the bounds belongs to exactly one cell.
+
+    Args:
+        latitudes (array-like): Point latitudes.
+        longitudes (array-like): Point longitudes.
+        available (array-like): Availability flag per point.
+        bounds (tuple): (min_lon, min_lat, max_lon, max_lat) of the grid.
+        grid (int): Number of cells per axis.
+
+    Returns:
+        list[dict]: One cluster per non-empty cell with its cell index, point count,
+                    number of available points and mean position, ordered by row and column.
+    """
+    latitudes, longitudes = np.asarray(latitudes, dtype=float), np.asarray(longitudes, dtype=float)
+    available = np.asarray(available, dtype=bool)
+    if not len(latitudes):
+        return []
+    min_lon, min_lat = bounds[0], bounds[1]
+    cell_width, cell_height = grid_cell_size(bounds, grid)
+    x = np.clip(np.floor((longitudes - min_lon) / cell_width), 0, grid - 1).astype(np.int64)
+    y = np.clip(np.floor((latitudes - min_lat) / cell_height), 0, grid - 1).astype(np.int64)
+
+    cells, inverse, counts = np.unique(y * grid + x, return_inverse=True, return_counts=True)
+    mean_lat = np.bincount(inverse, weights=latitudes) / counts
+    mean_lon = np.bincount(inverse, weights=longitudes) / counts
+    available_counts = np.bincount(inverse, weights=available).astype(np.int64)
+    return [
+        {"cell": [int(cell % grid), int(cell // grid)], "count": int(count), "available": int(free),
+         "latitude": float(lat), "longitude": float(lon)}
+        for cell, count, free, lat, lon in zip(cells, counts, available_counts, mean_lat, mean_lon)
+    ]
+
+# ------------------------------------------------------------------------------
+# Hierarchical Clustering
+
+# Cells per tile axis: with 256 px tiles a cell covers 64 x 64 px at every zoom.
+CELLS_PER_TILE = 4
+
+def mercator_xy(latitudes, longitudes):
+    """Projects WGS84 positions to Web Mercator coordinates in [0, 1], with y growing southwards."""
+    latitudes = np.clip(np.asarray(latitudes, dtype=float), -85.05112878, 85.05112878)
+    x = (np.asarray(longitudes, dtype=float) + 180.0) / 360.0
+    y = 0.5 - np.log(np.tan(np.pi / 4 + np.radians(latitudes) / 2)) / (2 * np.pi)
+    return x, y
+
+def zoom_cells(latitudes, longitudes, zoom, cells_per_tile=CELLS_PER_TILE):
+    """
+    Returns the (x, y) cell indices of positions at a zoom level.
+
+    A cell at zoom z is split into exactly 2 x 2 cells at zoom z + 1, so the cells of all
+    zoom levels form a hierarchy in which every cluster is the union of its children.
+    """
+    size = (2 ** zoom) * cells_per_tile
+    x, y = mercator_xy(latitudes, longitudes)
+    return (np.clip(np.floor(x * size), 0, size - 1).astype(np.int64),
+            np.clip(np.floor(y * size), 0, size - 1).astype(np.int64))
+
+def cell_range(bounds, zoom, cells_per_tile=CELLS_PER_TILE):
+    """Returns the inclusive (min_x, min_y, max_x, max_y) cell range covering `bounds` at a zoom level."""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    x, y = zoom_cells([max_lat, min_lat], [min_lon, max_lon], zoom, cells_per_tile)
+    return int(x[0]), int(y[0]), int(x[1]), int(y[1])
+
+def cluster_deltas(added, removed, min_zoom, max_zoom, cells_per_tile=CELLS_PER_TILE):
+    """
+    Computes the change of every cluster cell when positions are added and removed.
+
+    Args:
+        added (array-like): (latitude, longitude) pairs of added positions.
+        removed (array-like): (latitude, longitude) pairs of removed positions.
+        min_zoom (int): Lowest zoom level to cluster.
+        max_zoom (int): Highest zoom level to cluster.
+        cells_per_tile (int): Cells per tile axis.
+
+    Returns:
+        list[dict]: One entry per affected cell and zoom with the change of its point count
+                    and of its latitude and longitude sums. Non-finite positions are skipped.
+    """
+    added = np.asarray(added, dtype=float).reshape(-1, 2)
+    removed = np.asarray(removed, dtype=float).reshape(-1, 2)
+    positions = np.concatenate([added, removed])
+    signs = np.concatenate([np.ones(len(added)), -np.ones(len(removed))])
+    finite = np.isfinite(positions).all(axis=1)
+    positions, signs = positions[finite], signs[finite]
+    if not len(positions):
+        return []
+
+    deltas = []
+    for zoom in range(min_zoom, max_zoom + 1):
+        x, y = zoom_cells(positions[:, 0], positions[:, 1], zoom, cells_per_tile)
+        cells, inverse = np.unique(np.stack([x, y], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        counts = np.bincount(inverse, weights=signs)
+        lat_sums = np.bincount(inverse, weights=signs * positions[:, 0])
+        lon_sums = np.bincount(inverse, weights=signs * positions[:, 1])
+        deltas.extend(
+            {"zoom": zoom, "x": int(cell[0]), "y": int(cell[1]), "count": int(count),
+             "lat_sum": float(lat_sum), "lon_sum": float(lon_sum)}
+            for cell, count, lat_sum, lon_sum in zip(cells, counts, lat_sums, lon_sums)
+            if count != 0 or lat_sum != 0 or lon_sum != 0
+        )
+    return deltas
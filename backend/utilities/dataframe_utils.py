@@ -1,4 +1,5 @@
 from .timer_utils import timer
+import numpy as np
 import pandas as pd
 
 # ------------------------------------------------------------------------------
@@ -60,16 +61,57 @@ def pop_row_from_dataframe(df, index_value):
     shrunk_df = df.drop(index_value)
     return popped_row, shrunk_df
 
+def _top_k_positions(values, ascending, k):
+    """Returns the positions of the first k values in stable sort order without sorting all values."""
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    keys = values if ascending else -values
+    missing = np.isnan(keys) if np.issubdtype(keys.dtype, np.floating) else np.zeros(len(keys), dtype=bool)
+    valid = np.flatnonzero(~missing)
+    if len(valid) <= k:
+        ordered = valid[np.argsort(keys[valid], kind="stable")]
+        return np.concatenate([ordered, np.flatnonzero(missing)[:k - len(valid)]])
+
+    valid_keys = keys[valid]
+    kth = np.partition(valid_keys, k - 1)[k - 1]
+    below = valid[valid_keys < kth]
+    ties = valid[valid_keys == kth][:k - len(below)]
+    selected = np.sort(np.concatenate([below, ties]))
+    return selected[np.argsort(keys[selected], kind="stable")]
+
 @timer
-def sort_dataframe(df, column, ascending=True):
-    """Sorts a DataFrame based on a specific column."""
-    sorted_df = pd.DataFrame(columns=df.columns)
-    while not df.empty:
-        min_or_max_value = df[column].min() if ascending else df[column].max()
-        index_values = df.index[df[column] == min_or_max_value].tolist()
-        popped_row, df = pop_row_from_dataframe(df, index_values[0])
-        sorted_df = pd.concat([sorted_df, pd.DataFrame([dict(zip(df.columns, popped_row))])], ignore_index=True)
-    return sorted_df
+def sort_dataframe(df, column, ascending=True, top_k=None):
+    """
+    Sorts a DataFrame stably by one or more columns.
+
+    Rows with equal keys keep their original order and missing values are placed last.
+    With `top_k`, only the first k rows of the sorted result are returned; for a single
+    numeric column they are selected with a partial sort instead of sorting all rows.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to sort.
+        column (str | list): Column or columns to sort by.
+        ascending (bool | list): Sort direction, per column if a list is given.
+        top_k (int, optional): Number of leading rows to return.
+
+    Returns:
+        pd.DataFrame: The sorted rows with a fresh RangeIndex.
+    """
+    columns = [column] if isinstance(column, str) else list(column)
+    if (top_k is not None and top_k < len(df) and len(columns) == 1 and isinstance(ascending, bool)
+            and pd.api.types.is_numeric_dtype(df[columns[0]]) and not pd.api.types.is_bool_dtype(df[columns[0]])):
+        series = df[columns[0]]
+        if pd.api.types.is_signed_integer_dtype(series) and not series.hasnans:
+            values = series.to_numpy(dtype=np.int64)
+        else:
+            values = series.to_numpy(dtype=float, na_value=np.nan)
+        positions = _top_k_positions(values, ascending, max(top_k, 0))
+        return df.iloc[positions].reset_index(drop=True)
+
+    sorted_df = df.sort_values(by=columns, ascending=ascending, kind="stable", na_position="last")
+    if top_k is not None:
+        sorted_df = sorted_df.head(top_k)
+    return sorted_df.reset_index(drop=True)
 
 def assign_column_aliases(df, alias_mapping):
     """Renames DataFrame columns based on an alias mapping dictionary."""
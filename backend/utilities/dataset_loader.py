@@ -0,0 +1,146 @@
+import logging
+import os
+import pandas as pd
+from .snapshot_cache import file_stat_key
+from .geometry_utils import build_simplified_geometries
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - the columnar cache is optional
+    pa = None
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_FOLDER = ".columnar"
+
+REGISTER_HEADER_ROW = 10
+REGISTER_COORDINATE_COLUMNS = ['Breitengrad', 'Längengrad']
+REGISTER_FLOAT_COLUMNS = ['Nennleistung Ladeeinrichtung [kW]']
+REGISTER_INTEGER_COLUMNS = ['Postleitzahl', 'Anzahl Ladepunkte']
+
+# ------------------------------------------------------------------------------
+# Source Readers
+
+def fix_decimal_comma(column):
+    """Converts a column with German decimal commas (e.g. '52,52') into floats."""
+    return pd.to_numeric(column.astype(str).str.replace(',', '.'), errors='coerce')
+
+def read_ladesaeulenregister(path):
+    """Reads the Ladesaeulenregister Excel file and converts it into typed columns."""
+    df = pd.read_excel(path, header=REGISTER_HEADER_ROW)
+    df.columns = df.columns.astype(str)
+
+    for col in REGISTER_COORDINATE_COLUMNS:
+        if col in df.columns:
+            df[col] = fix_decimal_comma(df[col])
+    for col in REGISTER_FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in REGISTER_INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').round().astype('Int64')
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].astype('string')
+    return df
+
+def read_geodata_plz(path):
+    """Reads the Berlin postal code geometries (WKT) from geodata_berlin_plz.csv."""
+    return pd.read_csv(path, sep=';')
+
+def read_geodata_districts(path):
+    """Reads the Berlin district (Bezirk) geometries (WKT) from geodata_berlin_dis.csv."""
+    return pd.read_csv(path, sep=';')
+
+def read_residents(path):
+    """Reads the residents per postal code from plz_einwohner.csv."""
+    return pd.read_csv(path)
+
+# ------------------------------------------------------------------------------
+# Columnar Cache
+
+def columnar_cache_path(path, variant=None):
+    """Returns the Arrow IPC file that caches the current version of a source file (or a variant derived from it)."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if variant:
+        stem = f"{stem}-{variant}"
+    return os.path.join(os.path.dirname(path), CACHE_FOLDER, f"{stem}_{file_stat_key([path])}.arrow")
+
+def _remove_stale_caches(cache_path):
+    cache_dir = os.path.dirname(cache_path)
+    prefix = os.path.basename(cache_path).rsplit("_", 1)[0] + "_"
+    for filename in os.listdir(cache_dir):
+        version = filename[len(prefix):-len(".arrow")]
+        if (filename.startswith(prefix) and filename.endswith(".arrow") and "_" not in version
+                and filename != os.path.basename(cache_path)):
+            try:
+                os.remove(os.path.join(cache_dir, filename))
+            except OSError as e:
+                logger.warning(f"Could not remove stale columnar cache {filename}: {e}")
+
+def load_cached_frame(path, reader, variant=None):
+    """
+    Loads a dataset through its columnar cache, converting the source on first use.
+
+    The cache is an uncompressed Arrow IPC file stored in a `.columnar` folder next to
+    the source and keyed on the source's size and modification time, so it is
+    memory-mapped on later loads and rebuilt automatically when the source changes.
+
+    Args:
+        path (str): Path of the source file.
+        reader (callable): Function that reads and types the source file.
+        variant (str, optional): Name of a derived dataset cached alongside the source.
+
+    Returns:
+        pd.DataFrame: The typed dataset.
+    """
+    if feather is None:
+        return reader(path)
+
+    cache_path = columnar_cache_path(path, variant)
+    if os.path.exists(cache_path):
+        try:
+            return feather.read_table(cache_path, memory_map=True).to_pandas()
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Discarding unreadable columnar cache {cache_path}: {e}")
+
+    df = reader(path)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        feather.write_feather(df, cache_path, compression='uncompressed')
+        _remove_stale_caches(cache_path)
+    except (OSError, pa.ArrowException) as e:
+        logger.warning(f"Could not write columnar cache {cache_path}: {e}")
+    return df
+
+# ------------------------------------------------------------------------------
+# Dataset Loaders
+
+def load_ladesaeulenregister(path):
+    """Loads the Ladesaeulenregister with numeric coordinates, parsing the Excel file only once."""
+    return load_cached_frame(path, read_ladesaeulenregister)
+
+def load_geodata_plz(path):
+    """Loads the Berlin postal code geometries through the columnar cache."""
+    return load_cached_frame(path, read_geodata_plz)
+
+def load_simplified_geodata_plz(path):
+    """Loads the precomputed simplified postal code geometries, computing them once per version of the source."""
+    return load_cached_frame(path, lambda source: build_simplified_geometries(read_geodata_plz(source)), "simplified")
+
+def load_geodata_districts(path):
+    """Loads the Berlin district geometries through the columnar cache."""
+    return load_cached_frame(path, read_geodata_districts)
+
+def load_residents(path):
+    """Loads the residents per postal code through the columnar cache."""
+    return load_cached_frame(path, read_residents)
+
+def load_datasets(paths):
+    """Loads the geodata, charging station and residents datasets listed in a DATA_PATHS-style dict."""
+    return (
+        load_geodata_plz(paths['geodata_berlin_plz']),
+        load_ladesaeulenregister(paths['ladesaeulenregister']),
+        load_residents(paths['plz_einwohner']),
+    )
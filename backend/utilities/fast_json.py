@@ -0,0 +1,50 @@
+import json
+from datetime import date, datetime
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional, the standard library encoder is the fallback
+    orjson = None
+
+
+def _default(value):
+    """Encodes the values the standard library encoder does not know (dates, ObjectIds)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+def dumps(content):
+    """Serializes `content` to compact UTF-8 JSON bytes, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data):
+    """Parses JSON bytes or text, with orjson if it is installed; raises ValueError on invalid JSON."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def loads_lines(data):
+    """Parses newline-delimited JSON; blank lines are skipped and invalid lines become None."""
+    values = []
+    for line in data.splitlines():
+        if line.strip():
+            try:
+                values.append(loads(line))
+            except ValueError:
+                values.append(None)
+    return values
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that serializes its content directly with `dumps`.
+
+    Unlike returning a dict from an endpoint, the content is not passed through
+    `jsonable_encoder` first, so it must already consist of JSON-compatible values.
+    """
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -0,0 +1,115 @@
+import json
+import zlib
+import numpy as np
+import shapely
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always available
+    brotli = None
+
+CHUNK_SIZE = 64 * 1024
+
+# ------------------------------------------------------------------------------
+# Feature Encoding
+
+def encode_features(gdf, geometry_column="geometry"):
+    """Encodes every row of a GeoDataFrame as a GeoJSON Feature (bytes), keeping the other columns as properties."""
+    properties = gdf.drop(columns=[geometry_column])
+    properties = properties.astype(object).where(properties.notna(), None).to_dict(orient="records")
+    geometries = shapely.to_geojson(np.asarray(gdf[geometry_column], dtype=object))
+
+    return [
+        b'{"type":"Feature","geometry":'
+        + (geometry.encode() if geometry is not None else b"null")
+        + b',"properties":'
+        + json.dumps(props, ensure_ascii=False, default=str).encode()
+        + b"}"
+        for geometry, props in zip(geometries, properties)
+    ]
+
+def iter_feature_collection(features, chunk_size=CHUNK_SIZE):
+    """Yields a GeoJSON FeatureCollection built from pre-encoded features in chunks of roughly `chunk_size` bytes."""
+    buffer = bytearray(b'{"type":"FeatureCollection","features":[')
+    for index, feature in enumerate(features):
+        if index:
+            buffer += b","
+        buffer += feature
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]}"
+    yield bytes(buffer)
+
+def iter_layer_collections(layers, chunk_size=CHUNK_SIZE):
+    """Yields a JSON object mapping each layer name to its FeatureCollection."""
+    yield b"{"
+    for index, (name, features) in enumerate(layers.items()):
+        yield (b"," if index else b"") + json.dumps(name).encode() + b":"
+        yield from iter_feature_collection(features, chunk_size)
+    yield b"}"
+
+# ------------------------------------------------------------------------------
+# Content Encoding
+
+def supported_encodings():
+    """Returns the content encodings the server can produce, in order of preference."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+def negotiate_encoding(accept_encoding):
+    """
+    Picks the best content encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str | None): The raw header value, e.g. "gzip, br;q=0.8".
+
+    Returns:
+        str: "br", "gzip" or "identity".
+    """
+    if not accept_encoding:
+        return "identity"
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[token.strip().lower()] = quality
+
+    candidates = [
+        (weights.get(encoding, weights.get("*", 0.0)), -rank, encoding)
+        for rank, encoding in enumerate(supported_encodings())
+    ]
+    quality, _, encoding = max(candidates)
+    return encoding if quality > 0 else "identity"
+
+def compress_chunks(chunks, encoding):
+    """Compresses a stream of byte chunks with the given content encoding."""
+    if encoding == "identity":
+        yield from chunks
+        return
+
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+        return
+
+    raise ValueError(f"Unsupported content encoding: {encoding}")
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+# Precomputed simplification tolerances in degrees; 0.0 keeps the full-resolution geometry.
+SIMPLIFICATION_TOLERANCES = (0.0, 0.0002, 0.0005, 0.001, 0.003)
+
+# ------------------------------------------------------------------------------
+# Tolerance Selection
+
+def degrees_per_pixel(zoom):
+    """Returns the width of one 256px web-map tile pixel in degrees of longitude at the given zoom."""
+    return 360.0 / (256 * 2 ** zoom)
+
+def resolve_tolerance(tolerance=None, zoom=None):
+    """
+    Maps a requested tolerance or map zoom onto the closest precomputed tolerance that is not coarser.
+
+    Args:
+        tolerance (float, optional): Maximum acceptable simplification tolerance in degrees.
+        zoom (int, optional): Web-map zoom level; one pixel is used as tolerance.
+
+    Returns:
+        float: One of SIMPLIFICATION_TOLERANCES (0.0 if neither argument is given).
+    """
+    if tolerance is None and zoom is None:
+        return 0.0
+    if tolerance is None:
+        tolerance = degrees_per_pixel(zoom)
+    return max(level for level in SIMPLIFICATION_TOLERANCES if level <= tolerance)
+
+# ------------------------------------------------------------------------------
+# Simplification
+
+def simplify_coverage(geometries, tolerance):
+    """
+    Simplifies a set of adjacent polygons without opening gaps or overlaps between them.
+
+    Uses shapely's coverage simplification (shapely >= 2.1), which simplifies every shared
+    edge once, so neighbouring areas keep a common border.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    if tolerance <= 0:
+        return geometries
+    return shapely.coverage_simplify(geometries, tolerance)
+
+def build_simplified_geometries(df, key="PLZ", tolerances=SIMPLIFICATION_TOLERANCES):
+    """
+    Precomputes simplified geometries for every tolerance level.
+
+    Args:
+        df (pd.DataFrame): Postal code areas with a key column and WKT or shapely geometries.
+        key (str): Column identifying an area.
+        tolerances (tuple): Tolerance levels to compute.
+
+    Returns:
+        pd.DataFrame: Long table with the columns key, tolerance and geometry (WKT).
+    """
+    geometries = df["geometry"]
+    if len(geometries) and isinstance(geometries.iloc[0], str):
+        geometries = gpd.GeoSeries.from_wkt(geometries)
+    frames = []
+    for tolerance in tolerances:
+        simplified = simplify_coverage(geometries.values, tolerance)
+        frames.append(pd.DataFrame({
+            key: df[key].values,
+            "tolerance": tolerance,
+            "geometry": shapely.to_wkt(simplified, rounding_precision=-1),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+def simplified_geometry_lookup(simplified, tolerance, key="PLZ"):
+    """Returns a mapping from area key to shapely geometry for one precomputed tolerance level."""
+    level = simplified[simplified["tolerance"] == tolerance]
+    return dict(zip(level[key], shapely.from_wkt(level["geometry"].values)))
+
+def apply_simplified_geometry(gdf, lookup, key="PLZ"):
+    """Returns a copy of a GeoDataFrame whose geometries are replaced by the simplified ones of its areas."""
+    gdf = gdf.copy()
+    gdf["geometry"] = gpd.GeoSeries(
+        [lookup.get(area, geom) for area, geom in zip(gdf[key], gdf["geometry"])], index=gdf.index
+    )
+    return gpd.GeoDataFrame(gdf, geometry="geometry")
+
+def simplify_by_area(gdf, tolerance, key="PLZ"):
+    """Simplifies the geometries of a GeoDataFrame as one coverage, once per distinct area."""
+    if tolerance <= 0:
+        return gdf
+    areas = gdf.drop_duplicates(subset=key)
+    lookup = dict(zip(areas[key], simplify_coverage(areas["geometry"].values, tolerance)))
+    return apply_simplified_geometry(gdf, lookup, key)
+
+# ------------------------------------------------------------------------------
+# Area Assignment
+
+def _as_geometries(values):
+    values = np.asarray(values, dtype=object)
+    if len(values) and isinstance(values[0], str):
+        return shapely.from_wkt(values)
+    return values
+
+def overlapping_areas(areas, regions, area_key="PLZ", region_key="Bezirk", min_overlap=0.1):
+    """
+    Assigns areas (e.g. postal codes) to the regions (e.g. districts) they overlap.
+
+    Candidate pairs come from a spatial index query; an area belongs to a region if at
+    least `min_overlap` of its surface lies within it, so areas crossing a border can
+    belong to several regions while mere edge contact is ignored.
+
+    Args:
+        areas (pd.DataFrame): Areas with a key column and WKT or shapely geometries.
+        regions (pd.DataFrame): Regions with a key column and WKT or shapely geometries.
+        area_key (str): Column identifying an area.
+        region_key (str): Column identifying a region.
+        min_overlap (float): Minimum share of an area's surface within a region.
+
+    Returns:
+        dict: Mapping of region key to the sorted list of its area keys.
+    """
+    area_geometries = _as_geometries(areas["geometry"].values)
+    region_geometries = _as_geometries(regions["geometry"].values)
+    region_index, area_index = shapely.STRtree(area_geometries).query(region_geometries, predicate="intersects")
+    shares = (shapely.area(shapely.intersection(region_geometries[region_index], area_geometries[area_index]))
+              / shapely.area(area_geometries[area_index]))
+
+    area_keys = np.asarray(areas[area_key].tolist(), dtype=object)
+    assignment = {region: [] for region in regions[region_key]}
+    for region, area, share in zip(regions[region_key].values[region_index], area_keys[area_index], shares):
+        if share >= min_overlap:
+            assignment[region].append(area)
+    return {region: sorted(set(keys)) for region, keys in assignment.items()}
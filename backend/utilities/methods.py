@@ -1,10 +1,14 @@
+import threading
 import pandas as pd
 import geopandas as gpd
 import folium
 import streamlit as st
-from streamlit_folium import folium_static
+import streamlit.components.v1 as components
 from branca.colormap import LinearColormap
 from .timer_utils import timer
+from .dataset_loader import load_datasets, load_simplified_geodata_plz
+from .geojson_stream import encode_features
+from .geometry_utils import simplified_geometry_lookup, apply_simplified_geometry, simplify_by_area
 
 # ------------------------------------------------------------------------------
 # Data Processing Functions
@@ -17,7 +21,7 @@ def sort_by_plz_add_geometry(df, geo_df, config):
     return gpd.GeoDataFrame(merged_df, geometry='geometry')
 
 @timer
-def preprocess_lstat(df, geo_df, config):
+def preprocess_lstat(df, geo_df, config, extra_columns=()):
     """Preprocesses the dataframe from Ladesaeulenregister_SEP.xlsx."""
     df = df.copy()
     df.columns = df.columns.astype(str).str.strip()
@@ -26,7 +30,8 @@ def preprocess_lstat(df, geo_df, config):
         st.warning("Column 'Nennleistung Ladeeinrichtung [kW]' not found.")
         return None
     
-    df = df[['Postleitzahl', 'Bundesland', 'Breitengrad', 'Längengrad', 'Nennleistung Ladeeinrichtung [kW]']]
+    extra_columns = [col for col in extra_columns if col in df.columns]
+    df = df[['Postleitzahl', 'Bundesland', 'Breitengrad', 'Längengrad', 'Nennleistung Ladeeinrichtung [kW]', *extra_columns]]
     df.rename(columns={"Nennleistung Ladeeinrichtung [kW]": "KW", "Postleitzahl": "PLZ"}, inplace=True)
     
     df['Breitengrad'] = df['Breitengrad'].astype(str).str.replace(',', '.').astype(float, errors='ignore')
@@ -51,49 +56,152 @@ def preprocess_resid(df, geo_df, config):
     df = df[df["PLZ"].between(10000, 14200)]
     return sort_by_plz_add_geometry(df, geo_df, config)
 
+DATA_LAYERS = ("geodat_plz", "lstat", "residents")
+DATA_LAYER_KEYS = {"geodat_plz": "PLZ", "lstat": "Postleitzahl", "residents": "Postleitzahl"}
+
+def build_processed_layers(paths, config):
+    """Builds the postal code, charging station and resident GeoDataFrames served by the /data endpoint."""
+    df_geodat_plz, df_lstat, df_residents = load_datasets(paths)
+
+    gdf_lstat = preprocess_lstat(df_lstat, df_geodat_plz, config)
+    gdf_lstat3 = gpd.GeoDataFrame(count_plz_occurrences(gdf_lstat), geometry='geometry')
+    gdf_residents2 = preprocess_resid(df_residents, df_geodat_plz, config)
+
+    gdf_lstat3.rename(columns={"PLZ": "Postleitzahl"}, inplace=True)
+    gdf_residents2.rename(columns={"PLZ": "Postleitzahl"}, inplace=True)
+
+    gdf_geodat_plz = gpd.GeoDataFrame(
+        df_geodat_plz.assign(geometry=gpd.GeoSeries.from_wkt(df_geodat_plz['geometry'])), geometry='geometry'
+    )
+    return {"geodat_plz": gdf_geodat_plz, "lstat": gdf_lstat3, "residents": gdf_residents2}
+
+def layers_to_records(layers):
+    """Converts processed layers into JSON records with WKT geometries."""
+    records = {}
+    for name, gdf in layers.items():
+        df = pd.DataFrame(gdf)
+        df["geometry"] = df["geometry"].apply(lambda geom: geom.wkt if geom else None)
+        records[name] = df.to_dict(orient="records")
+    return records
+
+class ProcessedData:
+    """
+    The /data snapshot: processed layers at full resolution and the simplified PLZ geometries.
+
+    Only these are built and persisted. The layers, JSON records and GeoJSON features of a
+    simplification level are derived on first request and kept in memory per level, so
+    levels that are never requested cost neither memory nor disk.
+    """
+    def __init__(self, layers, simplified):
+        self.layers = layers
+        self.simplified = simplified
+        self._init_memo()
+
+    def _init_memo(self):
+        self._lock = threading.RLock()
+        self._levels, self._records, self._features = {}, {}, {}
+
+    def __getstate__(self):
+        return {"layers": self.layers, "simplified": self.simplified}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_memo()
+
+    def _memoised(self, memo, tolerance, build):
+        if tolerance not in memo:
+            with self._lock:
+                if tolerance not in memo:
+                    memo[tolerance] = build()
+        return memo[tolerance]
+
+    def level(self, tolerance):
+        """Returns the layers with the PLZ geometries of one precomputed tolerance level."""
+        def build():
+            if not tolerance:
+                return self.layers
+            lookup = simplified_geometry_lookup(self.simplified, tolerance)
+            return {name: apply_simplified_geometry(gdf, lookup, DATA_LAYER_KEYS[name]) for name, gdf in self.layers.items()}
+        return self._memoised(self._levels, tolerance, build)
+
+    def records(self, tolerance):
+        """Returns the JSON records of the layers at one tolerance level."""
+        return self._memoised(self._records, tolerance, lambda: layers_to_records(self.level(tolerance)))
+
+    def features(self, tolerance):
+        """Returns the encoded GeoJSON features of the layers at one tolerance level."""
+        return self._memoised(self._features, tolerance, lambda: {
+            name: encode_features(gdf) for name, gdf in self.level(tolerance).items()
+        })
+
+def build_processed_data(paths, config):
+    """Builds the /data snapshot: the processed layers and the simplified PLZ geometries of every level."""
+    return ProcessedData(build_processed_layers(paths, config), load_simplified_geodata_plz(paths['geodata_berlin_plz']))
+
 # ------------------------------------------------------------------------------
 # Streamlit Application
 
-def create_streamlit_map(df1, df2, by_kw=False):
-    """Creates a Streamlit map visualization for electric charging stations and residents."""
-    st.title('Heatmaps: Electric Charging Stations and Residents')
-    layer_selection = st.radio("Select Layer", ("Residents", "Charging Stations" if not by_kw else "Charging Stations by KW"))
+HEATMAP_STYLE = {'color': 'black', 'weight': 1, 'fillOpacity': 0.7}
+
+def choropleth_layer(df, value_column, tooltip_fields, color_map, name=None):
+    """Builds one GeoJson FeatureCollection layer whose fill colors and tooltips are driven by feature properties."""
+    columns = list(dict.fromkeys([*tooltip_fields, value_column]))
+    gdf = gpd.GeoDataFrame(df[columns + ['geometry']], geometry='geometry', crs='EPSG:4326')
+    gdf['fillColor'] = gdf[value_column].map(color_map)
+    return folium.GeoJson(
+        gdf,
+        name=name,
+        style_function=lambda feature: {'fillColor': feature['properties']['fillColor'], **HEATMAP_STYLE},
+        tooltip=folium.GeoJsonTooltip(fields=tooltip_fields, aliases=[f"{field}:" for field in tooltip_fields]),
+    )
+
+def build_folium_map(df1, df2, layer_selection, by_kw=False, tolerance=0.0):
+    """Builds the folium map for the selected heatmap layer, optionally with simplified postal code geometries."""
     m = folium.Map(location=[52.52, 13.40], zoom_start=10)
 
     if layer_selection == "Residents":
-        if 'Einwohner' in df2.columns:
-            color_map = LinearColormap(['yellow', 'red'], vmin=df2['Einwohner'].min(), vmax=df2['Einwohner'].max())
-            for _, row in df2.iterrows():
-                folium.GeoJson(row['geometry'],
-                               style_function=lambda x, color=color_map(row['Einwohner']): {
-                                   'fillColor': color, 'color': 'black', 'weight': 1, 'fillOpacity': 0.7
-                               },
-                               tooltip=f"PLZ: {row['PLZ']}, Einwohner: {row['Einwohner']}").add_to(m)
-        else:
-            st.warning("Residents data is not available.")
+        df2 = simplify_by_area(df2, tolerance)
+        color_map = LinearColormap(['yellow', 'red'], vmin=df2['Einwohner'].min(), vmax=df2['Einwohner'].max())
+        choropleth_layer(df2, 'Einwohner', ['PLZ', 'Einwohner'], color_map, name='Residents').add_to(m)
     else:
+        df1 = simplify_by_area(df1, tolerance)
         if by_kw:
-            for kw in df1['KW'].unique():
-                kw_data = df1[df1['KW'] == kw]
-                if not kw_data.empty:
-                    feature_group = folium.FeatureGroup(name=f'KW {kw}')
-                    color_map = LinearColormap(['yellow', 'red'], vmin=kw_data['Number'].min(), vmax=kw_data['Number'].max())
-                    for _, row in kw_data.iterrows():
-                        folium.GeoJson(row['geometry'],
-                                       style_function=lambda x, color=color_map(row['Number']): {
-                                           'fillColor': color, 'color': 'black', 'weight': 1, 'fillOpacity': 0.7
-                                       },
-                                       tooltip=f"PLZ: {row['PLZ']}, KW: {kw}, Number: {row['Number']}").add_to(feature_group)
-                    feature_group.add_to(m)
+            for kw, kw_data in df1.groupby('KW', sort=False):
+                feature_group = folium.FeatureGroup(name=f'KW {kw}')
+                color_map = LinearColormap(['yellow', 'red'], vmin=kw_data['Number'].min(), vmax=kw_data['Number'].max())
+                choropleth_layer(kw_data, 'Number', ['PLZ', 'KW', 'Number'], color_map).add_to(feature_group)
+                feature_group.add_to(m)
         else:
             color_map = LinearColormap(['yellow', 'red'], vmin=df1['Number'].min(), vmax=df1['Number'].max())
-            for _, row in df1.iterrows():
-                folium.GeoJson(row['geometry'],
-                               style_function=lambda x, color=color_map(row['Number']): {
-                                   'fillColor': color, 'color': 'black', 'weight': 1, 'fillOpacity': 0.7
-                               },
-                               tooltip=f"PLZ: {row['PLZ']}, Number: {row['Number']}").add_to(m)
+            choropleth_layer(df1, 'Number', ['PLZ', 'Number'], color_map, name='Charging Stations').add_to(m)
 
     folium.LayerControl().add_to(m)
     color_map.add_to(m)
-    folium_static(m, width=800, height=600)
+    return m
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def cached_heatmap_layers(data_version, _df_lstat, _df_geodat_plz, _df_residents, config):
+    """Preprocesses the station and resident layers once per dataset version (shared across sessions)."""
+    gdf_lstat = preprocess_lstat(_df_lstat, _df_geodat_plz, config)
+    return count_plz_occurrences(gdf_lstat), preprocess_resid(_df_residents, _df_geodat_plz, config)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def render_heatmap_html(data_version, layer_selection, by_kw, tolerance, _df1, _df2):
+    """Renders the heatmap to HTML once per dataset version, layer selection, KW mode and tolerance (LRU-bounded)."""
+    m = build_folium_map(_df1, _df2, layer_selection, by_kw, tolerance)
+    return folium.Figure().add_child(m).render()
+
+def create_streamlit_map(df1, df2, by_kw=False, tolerance=0.0, data_version=None):
+    """Creates a Streamlit map visualization for electric charging stations and residents."""
+    st.title('Heatmaps: Electric Charging Stations and Residents')
+    layer_selection = st.radio("Select Layer", ("Residents", "Charging Stations" if not by_kw else "Charging Stations by KW"))
+
+    if layer_selection == "Residents" and 'Einwohner' not in df2.columns:
+        st.warning("Residents data is not available.")
+        return
+
+    if data_version is None:
+        html = folium.Figure().add_child(build_folium_map(df1, df2, layer_selection, by_kw, tolerance)).render()
+    else:
+        html = render_heatmap_html(data_version, layer_selection, by_kw, tolerance, df1, df2)
+    components.html(html, width=800, height=610)
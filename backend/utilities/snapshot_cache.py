@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from .serialization import serialize_object, deserialize_object
+
+logger = logging.getLogger(__name__)
+
+# ------------------------------------------------------------------------------
+# Source Versioning
+
+def file_stat_key(paths):
+    """Builds a cheap version key from the size and modification time of the given files."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+def file_content_hash(paths, chunk_size=1 << 20):
+    """Builds a version key from the content of the given files."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+# ------------------------------------------------------------------------------
+# Snapshot Cache
+
+class SnapshotCache:
+    """
+    Builds a payload once per version of its source files and serves it from memory or disk.
+
+    The version of the sources is checked on every access with a stat call per file.
+    When sizes or modification times change, the version is recomputed (optionally from
+    the file contents) and the payload is loaded from disk or rebuilt.
+
+    Attributes:
+        name (str): Name used for the snapshot files on disk.
+        source_paths (list): Paths of the files the payload is built from.
+        builder (callable): Function without arguments that builds the payload.
+        cache_dir (str): Folder in which snapshots are persisted.
+        use_content_hash (bool): Whether the version is derived from the file contents.
+        schema_version (int): Layout version of the payload; bump it when the builder's output changes.
+    """
+    def __init__(self, name, source_paths, builder, cache_dir, use_content_hash=False, schema_version=1):
+        self.name = name
+        self.source_paths = list(source_paths)
+        self.builder = builder
+        self.cache_dir = cache_dir
+        self.use_content_hash = use_content_hash
+        self.schema_version = schema_version
+
+        self._lock = threading.Lock()
+        self._stat_key = None
+        self._version = None
+        self._payload = None
+        self.hits = 0
+        self.misses = 0
+        self.disk_loads = 0
+        self.build_seconds = None
+        self.built_at = None
+
+    @property
+    def version(self):
+        """Returns the version of the payload currently held in memory."""
+        return self._version
+
+    def _snapshot_path(self, version):
+        return os.path.join(self.cache_dir, f"{self.name}_{version}.pkl")
+
+    def _current_version(self, stat_key):
+        if stat_key == self._stat_key and self._version is not None:
+            return self._version
+        if self.use_content_hash:
+            return f"v{self.schema_version}-{file_content_hash(self.source_paths)}"
+        return f"v{self.schema_version}-{stat_key}"
+
+    def _remove_stale_snapshots(self, version):
+        prefix, current = f"{self.name}_", os.path.basename(self._snapshot_path(version))
+        for filename in os.listdir(self.cache_dir):
+            if filename.startswith(prefix) and filename.endswith(".pkl") and filename != current:
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except OSError as e:
+                    logger.warning(f"Could not remove stale snapshot {filename}: {e}")
+
+    def _load_or_build(self, version):
+        path = self._snapshot_path(version)
+        if os.path.exists(path):
+            try:
+                payload = deserialize_object(path)
+                self.disk_loads += 1
+                return payload
+            except Exception as e:
+                logger.warning(f"Discarding unreadable snapshot {path}: {e}")
+
+        start_time = time.perf_counter()
+        payload = self.builder()
+        self.build_seconds = time.perf_counter() - start_time
+        self.built_at = time.time()
+        self.misses += 1
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            serialize_object(payload, path)
+            self._remove_stale_snapshots(version)
+        except OSError as e:
+            logger.warning(f"Could not persist snapshot {path}: {e}")
+        return payload
+
+    def get(self):
+        """
+        Returns the payload for the current version of the source files.
+
+        Returns:
+            any: The payload produced by the builder.
+
+        Raises:
+            FileNotFoundError: If one of the source files does not exist.
+        """
+        stat_key = file_stat_key(self.source_paths)
+        if stat_key == self._stat_key and self._payload is not None:
+            self.hits += 1
+            return self._payload
+
+        with self._lock:
+            if stat_key == self._stat_key and self._payload is not None:
+                self.hits += 1
+                return self._payload
+
+            version = self._current_version(stat_key)
+            if version == self._version and self._payload is not None:
+                self.hits += 1
+            else:
+                self._payload = self._load_or_build(version)
+                self._version = version
+            self._stat_key = stat_key
+            return self._payload
+
+    def invalidate(self):
+        """Drops the in-memory payload so the next access reloads it from disk or rebuilds it."""
+        with self._lock:
+            self._stat_key = None
+            self._version = None
+            self._payload = None
+
+    def stats(self):
+        """Returns the version, build time and hit/miss counters of the snapshot."""
+        return {
+            "name": self.name,
+            "version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_loads": self.disk_loads,
+            "build_seconds": self.build_seconds,
+            "built_at": self.built_at,
+        }
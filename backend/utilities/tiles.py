@@ -0,0 +1,179 @@
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+import shapely
+from .geojson_stream import compress_chunks, encode_features, iter_feature_collection
+
+# Bounding box of Berlin (min_lon, min_lat, max_lon, max_lat) used to pre-seed tiles.
+BERLIN_BOUNDS = (13.08, 52.33, 13.77, 52.68)
+SEED_ZOOMS = range(9, 15)
+
+# Coordinates are snapped to a grid of TILE_EXTENT x TILE_EXTENT cells per tile, as in vector tiles.
+TILE_EXTENT = 4096
+
+# ------------------------------------------------------------------------------
+# Tile Math
+
+def tile_bounds(z, x, y):
+    """Returns the (min_lon, min_lat, max_lon, max_lat) bounds of a slippy-map (XYZ) tile."""
+    n = 2 ** z
+    min_lon = x / n * 360.0 - 180.0
+    max_lon = (x + 1) / n * 360.0 - 180.0
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return min_lon, min_lat, max_lon, max_lat
+
+def lonlat_to_tile(lon, lat, z):
+    """Returns the (x, y) tile containing a coordinate at zoom z."""
+    n = 2 ** z
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+def tiles_covering(bounds, z):
+    """Yields the (x, y) coordinates of all tiles at zoom z that intersect the given bounds."""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    min_x, min_y = lonlat_to_tile(min_lon, max_lat, z)
+    max_x, max_y = lonlat_to_tile(max_lon, min_lat, z)
+    for x in range(min_x, max_x + 1):
+        for y in range(min_y, max_y + 1):
+            yield x, y
+
+def is_valid_tile(z, x, y):
+    """Checks that tile coordinates exist at the given zoom."""
+    return z >= 0 and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+# ------------------------------------------------------------------------------
+# Tile Generation
+
+def build_tile(gdf, z, x, y, extent=TILE_EXTENT):
+    """
+    Builds a compact GeoJSON tile from a processed GeoDataFrame.
+
+    Candidate rows are found through the GeoDataFrame's spatial index, clipped to the
+    tile bounds and snapped to a grid of `extent` cells per tile side.
+
+    Args:
+        gdf (gpd.GeoDataFrame): The layer to cut the tile from.
+        z (int): Zoom level.
+        x (int): Tile column.
+        y (int): Tile row.
+        extent (int): Grid resolution per tile side.
+
+    Returns:
+        bytes: A GeoJSON FeatureCollection.
+    """
+    min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+    candidates = gdf.sindex.query(shapely.box(min_lon, min_lat, max_lon, max_lat), predicate="intersects")
+    if len(candidates) == 0:
+        return b"".join(iter_feature_collection([]))
+
+    subset = gdf.iloc[np.sort(candidates)].copy()
+    clipped = shapely.clip_by_rect(np.asarray(subset.geometry, dtype=object), min_lon, min_lat, max_lon, max_lat)
+    clipped = shapely.set_precision(clipped, (max_lon - min_lon) / extent)
+    subset["geometry"] = clipped
+    subset = subset[~shapely.is_empty(clipped)]
+    return b"".join(iter_feature_collection(encode_features(subset)))
+
+# ------------------------------------------------------------------------------
+# Tile Cache
+
+class TileCache:
+    """
+    Thread-safe LRU cache for generated tiles and their compressed variants.
+
+    Every content encoding of a tile is an entry of its own, so a hit in any encoding is a
+    lookup without compression; the variants share the `maxsize` budget.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept in memory.
+        hits (int): Number of tiles served from the cache.
+        misses (int): Number of tiles that had to be generated.
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def lookup(self, key, encoding="identity"):
+        """Returns the cached tile for a key in the given encoding, or None on a miss."""
+        with self._lock:
+            tile = self._tiles.get((key, encoding))
+            if tile is not None:
+                self._tiles.move_to_end((key, encoding))
+                self.hits += 1
+            return tile
+
+    def _store(self, key, encoding, tile):
+        with self._lock:
+            self._tiles[(key, encoding)] = tile
+            self._tiles.move_to_end((key, encoding))
+            while len(self._tiles) > self.maxsize:
+                self._tiles.popitem(last=False)
+
+    def get(self, key, factory, encoding="identity"):
+        """
+        Returns the cached tile for a key, generating and storing it on a miss.
+
+        A compressed variant is made from the uncompressed tile, which is generated first if
+        it is not cached either.
+
+        Args:
+            key (tuple): Cache key, e.g. (version, layer, z, x, y).
+            factory (callable): Function without arguments that builds the tile.
+            encoding (str): "identity", "gzip" or "br".
+
+        Returns:
+            bytes: The tile content in the given encoding.
+        """
+        tile = self.lookup(key, encoding)
+        if tile is not None:
+            return tile
+
+        if encoding == "identity":
+            tile = factory()
+            with self._lock:
+                self.misses += 1
+        else:
+            tile = b"".join(compress_chunks([self.get(key, factory)], encoding))
+        self._store(key, encoding, tile)
+        return tile
+
+    def clear(self):
+        """Removes all cached tiles."""
+        with self._lock:
+            self._tiles.clear()
+
+    def stats(self):
+        """Returns the size and hit/miss counters of the cache."""
+        return {"size": len(self._tiles), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+def seed_tiles(cache, layers_for_zoom, version, zooms=SEED_ZOOMS, bounds=BERLIN_BOUNDS):
+    """
+    Pre-generates all tiles of the given layers over an area for a range of zoom levels.
+
+    Args:
+        cache (TileCache): The cache to fill.
+        layers_for_zoom (callable): Returns the {layer name: GeoDataFrame} dict to use at a zoom level.
+        version (str): Data version that is part of the cache key.
+        zooms (iterable): Zoom levels to seed.
+        bounds (tuple): Area to cover as (min_lon, min_lat, max_lon, max_lat).
+
+    Returns:
+        int: Number of tiles seeded.
+    """
+    count = 0
+    for z in zooms:
+        layers = layers_for_zoom(z)
+        for x, y in tiles_covering(bounds, z):
+            for name, gdf in layers.items():
+                cache.get((version, name, z, x, y), lambda: build_tile(gdf, z, x, y))
+                count += 1
+    return count
@@ -1,17 +1,15 @@
 import pandas as pd
 import streamlit as st
-from utils import DataLoader, SessionStateManager  
-import folium
-from streamlit_folium import st_folium
+from postal_code import fetch_station_facets, fetch_stations_by_postal_code
 
 def display_details(*args, **kwargs):
     # """
     # Displays detailed statistics and interactive filters for electric vehicle (EV) charging stations in Berlin.
 
     # This function:
-    # - Loads and processes charging station data if not already present in session state.
-    # - Filters data for Berlin and allows users to select charging types and ZIP codes.
-    # - Dynamically calculates statistics such as total stations, availability, and total charging points.
+    # - Fetches the station counts per charging type and ZIP code from the backend, which filters them in MongoDB.
+    # - Allows users to select charging types and ZIP codes.
+    # - Displays statistics such as total stations, availability, and total charging points.
     # - Displays data using interactive charts and tables in Streamlit.
 
     # Features:
@@ -19,42 +17,29 @@ def display_details(*args, **kwargs):
     # - **Total Charging Points**: Displays the total number of charging points.
     # - **Recent Achievements**: Highlights recent improvements in Berlin's charging network.
     # - **ZIP Code Filter**: Allows users to view stations in specific Berlin ZIP codes.
-    # - **Detailed Data Table**: Option to display raw data for selected ZIP codes.
+    # - **Detailed Data Table**: Option to display the stations of the selected ZIP code and charging type.
     # """
     st.subheader("Charging Station Details")
 
-    
-    SessionStateManager.initialize_state()
-
-    
-    if 'df_lstat' not in st.session_state or st.session_state.df_lstat.empty:
-        data_loader = DataLoader(
-            geodata_path='../datasets/geodata_berlin_plz.csv',
-            ladesaeulen_path='../datasets/Ladesaeulenregister_SEP.xlsx',
-            residents_path='../datasets/plz_einwohner.csv'
-        )
-        _, df_lstat, _ = data_loader.load_data()
-        st.session_state.df_lstat = df_lstat
-    else:
-        df_lstat = st.session_state.df_lstat
-
-    
-    berlin_df = df_lstat[df_lstat['Ort'] == 'Berlin']
-
-    
-    charging_types = berlin_df['Art der Ladeeinrichung'].unique()
+
+    facets = fetch_station_facets()
+    if not facets or not facets["charging_types"]:
+        st.warning("No charging stations found.")
+        return
+
+
+    charging_types = [facet["value"] for facet in facets["charging_types"] if facet["value"]]
     selected_type = st.selectbox("Select Charging Type", options=charging_types)
+    filters = {"type": selected_type}
 
-    
-    filtered_df = berlin_df[berlin_df['Art der Ladeeinrichung'] == selected_type]
 
-    
-    total_stations = filtered_df.shape[0]
-    available_stations = filtered_df[filtered_df['Art der Ladeeinrichung'] != "Out of Service"].shape[0]
+    filtered = fetch_station_facets(filters=filters) or facets
+    total_stations = filtered["totals"]["stations"]
+    available_stations = filtered["totals"]["available"]
     out_of_service_stations = total_stations - available_stations
-    total_points = filtered_df['Anzahl Ladepunkte'].sum()
+    total_points = filtered["totals"]["charge_points"]
+
 
-    
     recent_achievements = [
         f"Expanded Network in Berlin",
         f"Added {available_stations} Available Stations of type {selected_type}",
@@ -77,17 +62,24 @@ def display_details(*args, **kwargs):
         for achievement in recent_achievements:
             st.write(f"- {achievement}")
 
-    
-    berlin_zip_codes = berlin_df['Postleitzahl'].unique()
-    selected_zip = st.selectbox("Select a ZIP Code (Berlin)", options=berlin_zip_codes)
 
-    filtered_by_zip = berlin_df[berlin_df['Postleitzahl'] == selected_zip]
-    st.write(f"Total Stations in ZIP Code {selected_zip}: {filtered_by_zip.shape[0]}")
+    zip_counts = {facet["value"]: facet["stations"] for facet in facets["postal_codes"]}
+    selected_zip = st.selectbox("Select a ZIP Code (Berlin)", options=list(zip_counts))
+    st.write(f"Total Stations in ZIP Code {selected_zip}: {zip_counts.get(selected_zip, 0)}")
+
 
-    
     if st.checkbox("Show Detailed Data"):
-        st.write(filtered_by_zip[[
-            'Postleitzahl', 'Straße', 'Hausnummer', 
-            'Breitengrad', 'Längengrad', 
-            'Art der Ladeeinrichung', 'Anzahl Ladepunkte'
-        ]])
+        stations = fetch_stations_by_postal_code(selected_zip, filters=filters)
+        st.write(pd.DataFrame([
+            {
+                "Postleitzahl": station["postal_code"],
+                "Name": station["name"],
+                "Breitengrad": station["location"]["latitude"],
+                "Längengrad": station["location"]["longitude"],
+                "Art der Ladeeinrichung": station["charging_type"],
+                "Anzahl Ladepunkte": station["charge_points"],
+                "Steckertypen": ", ".join(station["connectors"] or []),
+                "Nennleistung (kW)": station["power_kw"],
+            }
+            for station in stations
+        ]))
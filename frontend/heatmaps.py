@@ -7,8 +7,9 @@ from backend.utilities import methods as m1
 print(sys.path)
 
 from backend.config import pdict
+from backend.utilities.geometry_utils import SIMPLIFICATION_TOLERANCES
 
-def display_heatmaps(df_lstat, df_geodat_plz, df_residents):
+def display_heatmaps(df_lstat, df_geodat_plz, df_residents, data_version=None):
     # """
     # Displays interactive heatmaps for electric charging stations in Berlin.
 
@@ -28,6 +29,8 @@ def display_heatmaps(df_lstat, df_geodat_plz, df_residents):
     #     df_lstat (pd.DataFrame): The dataset containing electric charging station data.
     #     df_geodat_plz (pd.DataFrame): Geospatial dataset mapping Berlin postal codes.
     #     df_residents (pd.DataFrame): Dataset containing Berlin's population by ZIP code.
+    #     data_version (str, optional): Version of the loaded datasets. When given, the processed
+    #         layers and the rendered map HTML are cached across reruns and sessions.
     # """
     st.subheader("Electric Charging Station Heatmaps")
     function_selection = st.radio(
@@ -38,11 +41,18 @@ def display_heatmaps(df_lstat, df_geodat_plz, df_residents):
         ]
     )
 
-    gdf_lstat = m1.preprocess_lstat(df_lstat, df_geodat_plz, pdict)
-    gdf_lstat3 = m1.count_plz_occurrences(gdf_lstat)
-    gdf_residents2 = m1.preprocess_resid(df_residents, df_geodat_plz, pdict)
+    tolerance = st.select_slider(
+        "Geometry detail (simplification tolerance in degrees)",
+        options=SIMPLIFICATION_TOLERANCES,
+        value=SIMPLIFICATION_TOLERANCES[2],
+    )
 
-    if function_selection == "Heatmap: Electric Charging Stations and Residents":
-        m1.create_streamlit_map(gdf_lstat3, gdf_residents2)
+    if data_version is None:
+        gdf_lstat = m1.preprocess_lstat(df_lstat, df_geodat_plz, pdict)
+        gdf_lstat3 = m1.count_plz_occurrences(gdf_lstat)
+        gdf_residents2 = m1.preprocess_resid(df_residents, df_geodat_plz, pdict)
     else:
-        m1.create_streamlit_map(gdf_lstat3, gdf_residents2, True)
+        gdf_lstat3, gdf_residents2 = m1.cached_heatmap_layers(data_version, df_lstat, df_geodat_plz, df_residents, pdict)
+
+    by_kw = function_selection != "Heatmap: Electric Charging Stations and Residents"
+    m1.create_streamlit_map(gdf_lstat3, gdf_residents2, by_kw, tolerance=tolerance, data_version=data_version)
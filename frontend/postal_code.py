@@ -3,24 +3,101 @@ import requests
 
 
 # Fetch Charging Stations by Postal Code
-def fetch_stations_by_postal_code(postal_code):
+def fetch_stations_by_postal_code(postal_code, filters=None):
     # """
     # Fetch a list of charging stations by postal code from the backend API.
 
     # Args:
     #     postal_code (str): The postal code to search for charging stations.
+    #     filters (dict): Optional `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
 
     # Returns:
-    #     list: A list of charging station dictionaries if the request is successful, otherwise an empty list.
+    #     list: A list of charging station dictionaries (all pages) if the requests are successful, otherwise an empty list.
     # """
     try:
-        response = requests.get(f"http://localhost:8000/stations/search/{postal_code}")
+        stations, cursor = [], None
+        while True:
+            params = {**(filters or {}), **({"cursor": cursor} if cursor else {})}
+            response = requests.get(f"http://localhost:8000/stations/search/{postal_code}", params=params)
+            if response.status_code != 200:
+                st.error(f"Failed to fetch charging stations: {response.status_code}")
+                return []
+            page = response.json()
+            stations.extend(page.get("stations", []))
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return stations
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error: {e}")
+        return []
+
+# Fetch Station Counts per Charging Type, Plug Type and Postal Code
+def fetch_station_facets(postal_code=None, filters=None):
+    # """
+    # Fetch the number of charging stations per charging type, plug type and postal code from the backend API.
+
+    # Args:
+    #     postal_code (str): Only count stations with this postal code.
+    #     filters (dict): Optional `min_kw`, `max_kw`, `type`, `connector` and `min_points` filters.
+
+    # Returns:
+    #     dict: The `totals` and the `charging_types`, `connectors` and `postal_codes` counts if the request is successful, otherwise None.
+    # """
+    try:
+        params = {**(filters or {}), **({"postal_code": postal_code} if postal_code else {})}
+        response = requests.get("http://localhost:8000/stations/facets", params=params)
         if response.status_code == 200:
-            stations = response.json().get("stations", [])
-            return stations
-        else:
-            st.error(f"Failed to fetch charging stations: {response.status_code}")
-            return []
+            return response.json()
+        st.error(f"Failed to fetch station counts: {response.status_code}")
+        return None
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error: {e}")
+        return None
+
+# Fetch Charging Stations within a Map Viewport
+def fetch_stations_in_bbox(min_lat, min_lon, max_lat, max_lon, limit=500, cluster=True):
+    # """
+    # Fetch the charging stations within a map viewport from the backend API.
+
+    # Args:
+    #     min_lat, min_lon, max_lat, max_lon (float): The corners of the viewport.
+    #     limit (int): The maximum number of stations to fetch.
+    #     cluster (bool): Fetch per-cell counts instead if the viewport holds more than `limit` stations.
+
+    # Returns:
+    #     dict: The response with `mode` "stations" or "clusters" if the request is successful, otherwise None.
+    # """
+    try:
+        params = {"min_lat": min_lat, "min_lon": min_lon, "max_lat": max_lat, "max_lon": max_lon,
+                  "limit": limit, "cluster": cluster}
+        response = requests.get("http://localhost:8000/stations/bbox", params=params)
+        if response.status_code == 200:
+            return response.json()
+        st.error(f"Failed to fetch charging stations: {response.status_code}")
+        return None
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error: {e}")
+        return None
+
+# Fetch Marker Clusters within a Map Viewport
+def fetch_station_clusters(zoom, min_lat, min_lon, max_lat, max_lon):
+    # """
+    # Fetch the precomputed marker clusters within a map viewport from the backend API.
+
+    # Args:
+    #     zoom (int): The map zoom level.
+    #     min_lat, min_lon, max_lat, max_lon (float): The corners of the viewport.
+
+    # Returns:
+    #     list: The clusters with their station count and mean position if the request is successful, otherwise an empty list.
+    # """
+    try:
+        params = {"zoom": zoom, "min_lat": min_lat, "min_lon": min_lon, "max_lat": max_lat, "max_lon": max_lon}
+        response = requests.get("http://localhost:8000/stations/clusters", params=params)
+        if response.status_code == 200:
+            return response.json().get("clusters", [])
+        st.error(f"Failed to fetch station clusters: {response.status_code}")
+        return []
     except requests.exceptions.RequestException as e:
         st.error(f"Error: {e}")
         return []
@@ -63,7 +140,7 @@ def submit_rating(station_id, rating_value, comment, token, user_id):
         st.error(f"Error: {e}")
         
 # Change availability of the Charging Station
-def change_availability_status(station_id, token, user_id):
+def change_availability_status(station_id, token, user_id, state=None):
     # """
     # Change the availability status of a charging station.
 
@@ -71,6 +148,7 @@ def change_availability_status(station_id, token, user_id):
     #     station_id (str): The ID of the charging station.
     #     token (str): The authentication token for the user.
     #     user_id (str): The ID of the user changing the status.
+    #     state (str): The reported state, "occupied" or "free"; without it the status is toggled.
     # """
     if not token:
         st.error("You must be logged in to rate a station.")
@@ -82,7 +160,8 @@ def change_availability_status(station_id, token, user_id):
     try:
         response = requests.post(
             url,
-            headers=headers
+            headers=headers,
+            params={"state": state} if state else None
         )
 
         if response.status_code == 200:
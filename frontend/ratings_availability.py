@@ -1,10 +1,15 @@
 import streamlit as st
-from postal_code import fetch_station_ratings, submit_rating, change_availability_status, update_station_rating, delete_station_rating, fetch_stations_by_postal_code
+import sys
+import os
+from postal_code import fetch_station_ratings, submit_rating, change_availability_status, update_station_rating, delete_station_rating, fetch_stations_by_postal_code, fetch_stations_in_bbox, fetch_station_clusters
 import folium
 from streamlit_folium import st_folium
 import time
 from streamlit_star_rating import st_star_rating
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from backend.config import CLUSTER_MAX_ZOOM
+
 # Display Charging Station Map and Details
 def display_postal_code(df_lstat):
     # """
@@ -18,7 +23,8 @@ def display_postal_code(df_lstat):
 
     # Features:
     # - **Search Charging Stations**: Users enter a postal code to fetch stations.
-    # - **Interactive Map**: Clickable markers allow users to select a station.
+    # - **Interactive Map**: Clickable markers allow users to select a station; panning or zooming
+    #   the map loads the stations within the visible area.
     # - **User Ratings & Comments**: Users can submit, update, and delete ratings.
     # - **Change Availability**: Users can toggle the station's availability.
     # """
@@ -43,7 +49,13 @@ def display_postal_code(df_lstat):
 
         # Display Map
         if st.session_state.get("map"):
-            output = st_folium(st.session_state.map, width=800, height=500)
+            output = st_folium(st.session_state.map, width=800, height=500, key="station_map",
+                               feature_group_to_add=st.session_state.markers,
+                               returned_objects=["last_object_clicked", "bounds", "zoom"])
+
+            # Load the Stations within a Panned or Zoomed Viewport
+            if output and update_viewport(output.get("bounds"), output.get("zoom")):
+                st.rerun()
 
             # Marker Click Interaction
             if output and output.get("last_object_clicked"):
@@ -52,7 +64,7 @@ def display_postal_code(df_lstat):
                 # Find the selected station based on click coordinates
                 selected_station = next(
                     (station for station in st.session_state.filtered_stations
-                    if tuple(map(float, station['location'].split(", "))) == (lat_lng['lat'], lat_lng['lng'])),
+                    if station_position(station) == (lat_lng['lat'], lat_lng['lng'])),
                     None
                 )
 
@@ -65,13 +77,15 @@ def display_postal_code(df_lstat):
                         st.session_state.view = "details"
                         st.rerun()
 
+                elif st.session_state.get("clusters"):
+                    st.info("Zoom in to select a station within a cluster.")
                 else:
                     st.warning("Could not identify the selected station.")
 
         # Display Station Summary
         if "filtered_stations" in st.session_state:
             stations = st.session_state.filtered_stations
-            st.markdown(f"**Total Charging Stations Found:** {len(stations)}")
+            st.markdown(f"**Total Charging Stations Found:** {st.session_state.get('stations_found', len(stations))}")
 
             st.markdown("### Station Details")
             for station in stations:
@@ -87,10 +101,10 @@ def display_postal_code(df_lstat):
         # """
         station = st.session_state.selected_station
         st.subheader(f"🚗 {station['name']}")
-        st.write(f"**Location:** {station['location']}")
+        st.write(f"**Location:** {format_location(station)}")
         st.write(f"**Availability:** {'Available' if station['availability_status'] else 'Not Available'}")
         
-        st.markdown(f"### **User Reviews for {station['location']}**")
+        st.markdown(f"### **User Reviews for {format_location(station)}**")
         ratings = fetch_station_ratings(station['id'])
         if ratings:
             for r in ratings:
@@ -151,7 +165,8 @@ def display_postal_code(df_lstat):
             if 'user_info' in st.session_state and st.session_state.user_info:
                 token = st.session_state.user_info.get("token")
                 user_id = st.session_state.user_info.get("user_id")
-                change_availability_status(station['id'], token, user_id)
+                state = "occupied" if station['availability_status'] else "free"
+                change_availability_status(station['id'], token, user_id, state)
                 stations = fetch_stations_by_postal_code(st.session_state.postal_code)
                 time.sleep(0.5)
                 update_map(stations)
@@ -164,6 +179,64 @@ def display_postal_code(df_lstat):
             st.rerun()
 
 
+def station_position(station):
+    # """
+    # Returns the (latitude, longitude) of a station from the API's numeric location.
+    # """
+    location = station['location']
+    return location['latitude'], location['longitude']
+
+
+def format_location(station):
+    # """
+    # Formats the location of a station for display.
+    # """
+    return "{}, {}".format(*station_position(station))
+
+
+def station_markers(stations):
+    # """
+    # Builds the map layer with one marker per charging station.
+
+    # Args:
+    #     stations (list): A list of charging station dictionaries.
+    # """
+    layer = folium.FeatureGroup(name="Charging Stations")
+    for station in stations:
+        lat, lon = station_position(station)
+        name = station.get('name', 'Unknown Name')
+        status = 'Available' if station['availability_status'] else 'Not Available'
+
+        folium.Marker(
+            location=[lat, lon],
+            tooltip=f"Name: {name}",
+            popup=f"<b>{name}</b><br>Status: {status}<br>Lat: {lat}, Lon: {lon}",
+            icon=folium.Icon(color='green' if station['availability_status'] else 'red')
+        ).add_to(layer)
+    return layer
+
+
+def cluster_markers(clusters):
+    # """
+    # Builds the map layer with one circle per cluster of charging stations, sized by its station count.
+
+    # Args:
+    #     clusters (list): A list of cluster dictionaries with `count`, `latitude` and `longitude`.
+    # """
+    layer = folium.FeatureGroup(name="Charging Stations")
+    for cluster in clusters:
+        count = cluster['count']
+        folium.CircleMarker(
+            location=[cluster['latitude'], cluster['longitude']],
+            radius=min(8 + count ** 0.5, 30),
+            color='#1f77b4',
+            fill=True,
+            fill_opacity=0.6,
+            tooltip=f"{count} charging stations, zoom in to show them"
+        ).add_to(layer)
+    return layer
+
+
 def update_map(stations):
     # """
     # Updates the interactive map with charging station locations.
@@ -173,26 +246,66 @@ def update_map(stations):
     # """
     if stations:
         try:
-            # Parse the location string of the first station
-            center_lat, center_lon = map(float, stations[0]['location'].split(", "))
-            map_obj = folium.Map(location=[center_lat, center_lon], zoom_start=13)
+            center_lat, center_lon = station_position(stations[0])
+            markers = station_markers(stations)
 
-            for station in stations:
-                # Parse the location field
-                lat, lon = map(float, station['location'].split(", "))
-                name = station.get('name', 'Unknown Name')
-                status = 'Available' if station['availability_status'] else 'Not Available'
-
-                folium.Marker(
-                    location=[lat, lon],
-                    tooltip=f"Name: {name}",
-                    popup=f"<b>{name}</b><br>Status: {status}<br>Lat: {lat}, Lon: {lon}",
-                    icon=folium.Icon(color='green' if station['availability_status'] else 'red')
-                ).add_to(map_obj)
-            
             st.session_state.filtered_stations = stations
-            st.session_state.map = map_obj
+            st.session_state.stations_found = len(stations)
+            st.session_state.clusters = []
+            st.session_state.markers = markers
+            st.session_state.map = folium.Map(location=[center_lat, center_lon], zoom_start=13)
+            st.session_state.viewport = None
         except (KeyError, TypeError, ValueError) as e:
             st.error(f"Error processing station data: {e}")
     else:
-        st.warning("No charging stations found for the given postal code.")
\ No newline at end of file
+        st.warning("No charging stations found for the given postal code.")
+
+
+def update_viewport(bounds, zoom):
+    # """
+    # Replaces the markers with the stations within the map viewport after the user panned or zoomed.
+
+    # The viewport the map is first shown with keeps the stations of the searched postal code;
+    # viewports holding more stations than can be shown as markers are shown as clusters, the
+    # precomputed ones up to CLUSTER_MAX_ZOOM and per-cell counts beyond it.
+
+    # Args:
+    #     bounds (dict): The `_southWest` and `_northEast` corners returned by `st_folium`.
+    #     zoom (int): The zoom level returned by `st_folium`.
+
+    # Returns:
+    #     bool: True if the markers changed and the map has to be rendered again.
+    # """
+    try:
+        south_west, north_east = bounds['_southWest'], bounds['_northEast']
+        viewport = (zoom, *(round(float(corner[axis]), 5) for corner in (south_west, north_east)
+                            for axis in ('lat', 'lng')))
+    except (KeyError, TypeError, ValueError):
+        return False
+    previous = st.session_state.get("viewport")
+    st.session_state.viewport = viewport
+    if previous is None or viewport == previous:
+        return False
+
+    result = fetch_stations_in_bbox(*viewport[1:], cluster=zoom > CLUSTER_MAX_ZOOM)
+    if result is None:
+        return False
+    if result['truncated'] and zoom <= CLUSTER_MAX_ZOOM:
+        clusters = fetch_station_clusters(zoom, *viewport[1:])
+        if clusters:
+            result = {"mode": "clusters", "stations": [], "clusters": clusters,
+                      "stations_found": sum(cluster['count'] for cluster in clusters), "truncated": True}
+    try:
+        if result['mode'] == "clusters":
+            markers = cluster_markers(result['clusters'])
+        else:
+            markers = station_markers(result['stations'])
+    except (KeyError, TypeError, ValueError) as e:
+        st.error(f"Error processing station data: {e}")
+        return False
+
+    st.session_state.filtered_stations = result['stations']
+    st.session_state.stations_found = result['stations_found']
+    st.session_state.clusters = result['clusters']
+    st.session_state.markers = markers
+    return True
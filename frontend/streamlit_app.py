@@ -64,6 +64,7 @@ if not st.session_state["data_loaded"]:
         st.session_state.df_geodat_plz = df_geodat_plz
         st.session_state.df_lstat = df_lstat
         st.session_state.df_residents = df_residents
+        st.session_state.data_version = data_loader.data_version()
 
         st.session_state["data_loaded"] = True
         st.write("✅ Data loaded successfully!")
@@ -99,7 +100,8 @@ try:
             display_heatmaps(
                 st.session_state.df_lstat, 
                 st.session_state.df_geodat_plz, 
-                st.session_state.df_residents
+                st.session_state.df_residents,
+                st.session_state.data_version
             )
         else:
             st.error("❌ Heatmap data is not available. Please check the dataset.")
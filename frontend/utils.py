@@ -1,9 +1,15 @@
 import pandas as pd
 import streamlit as st
 import requests
+import sys
+import os
 from collections import defaultdict
 from typing import Tuple
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from backend.utilities.dataset_loader import load_datasets
+from backend.utilities.snapshot_cache import file_stat_key
+
 API_BASE_URL = "http://localhost:8000"
 
 class DataLoader:
@@ -32,23 +38,24 @@ class DataLoader:
         #         - DataFrame for resident data.
         # """
         try:
-            df_geodat_plz = pd.read_csv(self.geodata_path, sep=';')
-            df_lstat = pd.read_excel(self.ladesaeulen_path, header=10)
-            df_residents = pd.read_csv(self.residents_path)
-            
-            
-            df_lstat['Breitengrad'] = pd.to_numeric(
-                df_lstat['Breitengrad'].astype(str).str.replace(',', '.'), errors='coerce'
-            )
-            df_lstat['Längengrad'] = pd.to_numeric(
-                df_lstat['Längengrad'].astype(str).str.replace(',', '.'), errors='coerce'
-            )
-            
-            return df_geodat_plz, df_lstat, df_residents
+            return load_datasets({
+                'geodata_berlin_plz': self.geodata_path,
+                'ladesaeulenregister': self.ladesaeulen_path,
+                'plz_einwohner': self.residents_path,
+            })
         except Exception as e:
             st.error(f"Error loading data: {e}")
             return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
+    def data_version(self) -> str:
+        # """
+        # Returns a version key of the dataset files (size and modification time), used as cache key.
+        # """
+        try:
+            return file_stat_key([self.geodata_path, self.ladesaeulen_path, self.residents_path])
+        except OSError:
+            return None
+
 
 class SessionStateManager:
     # """Manages Streamlit's session state initialization."""
@@ -67,7 +74,8 @@ class SessionStateManager:
             "users": [],
             "df_geodat_plz": pd.DataFrame(),
             "df_lstat": pd.DataFrame(),
-            "df_residents": pd.DataFrame()
+            "df_residents": pd.DataFrame(),
+            "data_version": None
         }
         for key, value in default_states.items():
             if key not in st.session_state: